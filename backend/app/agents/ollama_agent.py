@@ -1,35 +1,220 @@
-from typing import List, Dict, Any
+import asyncio
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from uuid import uuid4
 from .base_agent import BaseAgent
-from ..utils.ollama_utils import generate_ollama_response, stream_ollama_response
+from ..config.config_loader import config
+from ..telemetry.log_config import SAMPLED
+from ..telemetry.metrics import AGENT_RUNS, AGENT_STEPS, AGENT_TOOL_CALLS, record_ollama_generation
+from ..telemetry.tracing import tracer
+from ..utils.ollama_utils import stream_ollama_response
+from .tool_cache import tool_cache
+from .tools.github_tool import GitHubReadTool
 from .tools.search_tool import SearchTool
-from langchain.agents import initialize_agent, AgentType
+from .tools.slack_tool import SlackReadTool
+from .tracing_callbacks import AgentTracingCallbackHandler
 from langchain_community.chat_models import ChatOllama
-from langchain.memory import ConversationBufferMemory
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import LLMResult
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = """You answer questions using the tools below.
+
+Tools:
+{tools}
+
+Reply with one JSON object and nothing else, in one of these forms:
+{{"tool_calls": [{{"tool": "<tool name>", "input": <tool input>}}]}}
+{{"answer": "<your final answer>"}}
+
+Request all the tool calls you need in one reply when they do not depend on each other's results; they run in parallel and their results come back in the next message. Answer as soon as you have enough information."""
+
+FINAL_ANSWER_PROMPT = 'No more tool calls are allowed. Reply with {"answer": "..."} using the information gathered so far.'
+
+@dataclass
+class AgentBudget:
+    """Limits on a single agent run."""
+    max_steps: int = config["AGENT_MAX_STEPS"]
+    max_seconds: float = config["AGENT_MAX_SECONDS"]
+    max_tokens: int = config["AGENT_MAX_TOKENS"]
+
+def _parse_reply(text: str) -> Dict[str, Any]:
+    """
+    Parse the model's JSON reply. Anything that is not a tool call request
+    is taken as the final answer.
+    """
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match:
+        try:
+            reply = json.loads(match.group(0))
+        except ValueError:
+            reply = None
+        if isinstance(reply, dict) and (reply.get("tool_calls") or "answer" in reply):
+            return reply
+    return {"answer": text.strip()}
 
 class OllamaAgent(BaseAgent):
-    def __init__(self, model: str = "llama2"):
-        self.model = model
-        self.llm = ChatOllama(model=model)
-        self.tools = [SearchTool()]
-        self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-        self.agent = initialize_agent(
-            self.tools,
-            self.llm,
-            agent=AgentType.CHAT_CONVERSATIONAL_REACT_DESCRIPTION,
-            verbose=True,
-            memory=self.memory
+    """
+    Tool-using agent that runs independent tool calls concurrently.
+
+    Each step is one LLM round trip; the model may request several tool calls
+    at once, which are awaited together. Runs stop at the budget's step,
+    time or token limit, and tool results are cached per session.
+    """
+
+    def __init__(self, model: Optional[str] = None, collection: Optional[str] = None, session_id: Optional[str] = None, budget: Optional[AgentBudget] = None):
+        self.model = model or config["DEFAULT_MODEL"]
+        self.session_id = session_id
+        self.budget = budget or AgentBudget()
+        self.llm = ChatOllama(model=self.model, base_url=config["OLLAMA_HOST"], format="json")
+        self.tools = {tool.name: tool for tool in (SearchTool(collection=collection), GitHubReadTool(), SlackReadTool())}
+
+    def _system_prompt(self) -> str:
+        tools = "\n".join(f"- {tool.name}: {tool.description}" for tool in self.tools.values())
+        return SYSTEM_PROMPT.format(tools=tools)
+
+    async def _call_llm(self, messages: List[BaseMessage], handler: AgentTracingCallbackHandler) -> Tuple[str, int]:
+        """One LLM round trip; returns the reply text and the tokens it used."""
+        start = time.perf_counter()
+        result = await self.llm.agenerate([messages], callbacks=[handler])
+        generation = result.generations[0][0]
+        info = generation.generation_info or {}
+        prompt_tokens, completion_tokens = info.get("prompt_eval_count", 0), info.get("eval_count", 0)
+        record_ollama_generation(
+            self.model,
+            time.perf_counter() - start,
+            eval_count=completion_tokens,
+            prompt_eval_count=prompt_tokens,
+            eval_duration_ns=info.get("eval_duration", 0)
         )
+        return generation.text, prompt_tokens + completion_tokens
+
+    async def _call_tool(self, call: Dict[str, Any], results: Dict[str, str], handler: AgentTracingCallbackHandler) -> str:
+        """Run one requested tool call, reusing earlier results of the same call."""
+        name, tool_input = call.get("tool"), call.get("input", "")
+        tool = self.tools.get(name)
+        if tool is None:
+            return f"Error: unknown tool '{name}'. Available tools: {', '.join(self.tools)}"
+
+        key = json.dumps([name, tool_input], sort_keys=True, default=str)
+        cached = results.get(key)
+        if cached is None and self.session_id:
+            cached = await tool_cache.get(self.session_id, name, tool_input)
+        if cached is not None:
+            AGENT_TOOL_CALLS.labels(tool=name, result="cached").inc()
+            results[key] = cached
+            return cached
 
-    async def run(self, query: str) -> Dict[str, Any]:
         try:
-            response = await self.agent.arun(query)
-            return {"response": response}
+            output = await asyncio.wait_for(tool.arun(tool_input, callbacks=[handler]), config["AGENT_TOOL_TIMEOUT"])
         except Exception as e:
-            return {"error": str(e)}
+            AGENT_TOOL_CALLS.labels(tool=name, result="error").inc()
+            logger.warning("Agent tool %s failed: %r", name, e)
+            return f"Error: {str(e) or type(e).__name__}"
+
+        AGENT_TOOL_CALLS.labels(tool=name, result="ok").inc()
+        results[key] = output
+        if self.session_id:
+            await tool_cache.set(self.session_id, name, tool_input, output)
+        return output
+
+    async def run(self, query: str) -> Dict[str, Any]:
+        handler = AgentTracingCallbackHandler()
+        messages: List[BaseMessage] = [SystemMessage(content=self._system_prompt()), HumanMessage(content=query)]
+        results: Dict[str, str] = {}
+        deadline = time.monotonic() + self.budget.max_seconds
+        steps = tokens = tool_calls = 0
+        answer, stop_reason = None, None
+
+        with tracer.start_as_current_span("agent.run") as span:
+            try:
+                while answer is None:
+                    if steps >= self.budget.max_steps:
+                        stop_reason = "max_steps"
+                    elif tokens >= self.budget.max_tokens:
+                        stop_reason = "max_tokens"
+                    elif time.monotonic() >= deadline:
+                        stop_reason = "max_time"
+                    if stop_reason:
+                        break
+
+                    text, used = await asyncio.wait_for(self._call_llm(messages, handler), deadline - time.monotonic())
+                    steps += 1
+                    tokens += used
+                    reply = _parse_reply(text)
+                    if "answer" in reply and not reply.get("tool_calls"):
+                        answer = str(reply["answer"])
+                        break
+
+                    calls = reply["tool_calls"]
+                    calls = [call for call in (calls if isinstance(calls, list) else [calls]) if isinstance(call, dict)]
+                    tool_calls += len(calls)
+                    outputs = await asyncio.wait_for(
+                        asyncio.gather(*(self._call_tool(call, results, handler) for call in calls)),
+                        max(deadline - time.monotonic(), 0)
+                    )
+                    observations = [{"tool": call.get("tool"), "input": call.get("input"), "result": output} for call, output in zip(calls, outputs)]
+                    messages.append(AIMessage(content=text))
+                    messages.append(HumanMessage(content=json.dumps({"tool_results": observations})))
+                    logger.info("Agent step %d ran %d tool calls", steps, len(calls), extra=SAMPLED)
+            except asyncio.TimeoutError:
+                stop_reason = "max_time"
+            except Exception as e:
+                AGENT_RUNS.labels(stop_reason="error").inc()
+                span.record_exception(e)
+                return {"error": str(e)}
+
+            if answer is None and stop_reason == "max_steps" and tokens < self.budget.max_tokens and time.monotonic() < deadline:
+                # Out of steps but not time: one last round trip to answer with what was gathered.
+                messages.append(HumanMessage(content=FINAL_ANSWER_PROMPT))
+                try:
+                    text, used = await asyncio.wait_for(self._call_llm(messages, handler), deadline - time.monotonic())
+                    tokens += used
+                    reply = _parse_reply(text)
+                    if "answer" in reply and not reply.get("tool_calls"):
+                        answer = str(reply["answer"])
+                        stop_reason = "final_answer"
+                except asyncio.TimeoutError:
+                    stop_reason = "max_time"
+
+            stop_reason = stop_reason or "answer"
+            AGENT_STEPS.observe(steps)
+            AGENT_RUNS.labels(stop_reason=stop_reason).inc()
+            span.set_attribute("agent.steps", steps)
+            span.set_attribute("agent.tool_calls", tool_calls)
+            span.set_attribute("agent.tokens", tokens)
+            span.set_attribute("agent.stop_reason", stop_reason)
+
+        if answer is None:
+            answer = f"Stopped before reaching an answer ({stop_reason} budget exhausted)."
+        return {
+            "response": answer,
+            "steps": steps,
+            "tool_calls": tool_calls,
+            "tokens": tokens,
+            "stop_reason": stop_reason,
+        }
 
     async def stream(self, query: str):
+        # The stream bypasses LangChain, so report it to the tracing handler
+        # as one LLM call, like each round trip of a run.
+        handler = AgentTracingCallbackHandler()
+        run_id = uuid4()
+        await handler.on_llm_start({"name": self.model}, [query], run_id=run_id)
+        error: Optional[BaseException] = None
         try:
             async for chunk in stream_ollama_response(query, self.model):
                 yield chunk
         except Exception as e:
+            error = e
             yield f"Error: {str(e)}"
+        finally:
+            if error is None:
+                await handler.on_llm_end(LLMResult(generations=[]), run_id=run_id)
+            else:
+                await handler.on_llm_error(error, run_id=run_id)
@@ -1,26 +1,56 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from .ollama_agent import OllamaAgent
+from pydantic import BaseModel, confloat, conint
+from typing import Optional
 from fastapi.responses import StreamingResponse
+from ..config.config_loader import config
+from ..utils.model_router import model_router
+from .tool_cache import tool_cache
 
 router = APIRouter()
 
 class AgentRequest(BaseModel):
     query: str
-    model: str = "llama2"
+    # A model name, "auto" to route by prompt and load, or None for DEFAULT_MODEL.
+    model: Optional[str] = None
+    collection: Optional[str] = None
+    session_id: Optional[str] = None
+    max_steps: Optional[conint(gt=0)] = None
+    max_seconds: Optional[confloat(gt=0)] = None
+    max_tokens: Optional[conint(gt=0)] = None
+
+async def create_agent(request: AgentRequest):
+    # Imported here: LangChain's agent modules are the slowest import in the app.
+    from .ollama_agent import AgentBudget, OllamaAgent
+    model = await model_router.resolve(request.model, "agent", request.query, request.session_id)
+    # Requests may tighten the configured budgets, not raise them.
+    budget = AgentBudget(
+        max_steps=min(request.max_steps or config["AGENT_MAX_STEPS"], config["AGENT_MAX_STEPS"]),
+        max_seconds=min(request.max_seconds or config["AGENT_MAX_SECONDS"], config["AGENT_MAX_SECONDS"]),
+        max_tokens=min(request.max_tokens or config["AGENT_MAX_TOKENS"], config["AGENT_MAX_TOKENS"]),
+    )
+    return OllamaAgent(model=model, collection=request.collection, session_id=request.session_id, budget=budget)
 
 @router.post("/run")
 async def run_agent(request: AgentRequest):
-    agent = OllamaAgent(model=request.model)
+    agent = await create_agent(request)
     try:
         return await agent.run(request.query)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Agent error: {str(e)}")
 
 @router.post("/stream")
 async def stream_agent(request: AgentRequest):
-    agent = OllamaAgent(model=request.model)
+    agent = await create_agent(request)
     try:
         return StreamingResponse(agent.stream(request.query), media_type="text/event-stream")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Agent streaming error: {str(e)}")
+
+@router.get("/tools/cache/stats")
+async def tool_cache_stats_route():
+    """Get hit-rate statistics of the per-session tool result cache."""
+    return tool_cache.stats()
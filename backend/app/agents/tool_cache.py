@@ -0,0 +1,51 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+from ..backends import get_shared_backend
+from ..config.config_loader import config
+
+class ToolResultCache:
+    """
+    Tool results of an agent session.
+
+    Follow-up questions in a session tend to repeat the same searches and
+    file reads; results are kept in the shared backend under the session ID
+    and tool input, so any worker serving the next turn can reuse them until
+    they expire after `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(session_id: str, tool: str, tool_input: Any) -> str:
+        digest = hashlib.sha256(json.dumps([tool, tool_input], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return f"agent_tool:{session_id}:{digest}"
+
+    async def get(self, session_id: str, tool: str, tool_input: Any) -> Optional[str]:
+        """Return the cached result of a tool call, if any."""
+        result = await get_shared_backend().get(self._key(session_id, tool, tool_input))
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    async def set(self, session_id: str, tool: str, tool_input: Any, result: str):
+        """Store the result of a successful tool call."""
+        await get_shared_backend().set(self._key(session_id, tool, tool_input), result, ttl=self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache lookups served by this worker."""
+        total = self.hits + self.misses
+        return {
+            "backend": get_shared_backend().name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+# Create a single instance
+tool_cache = ToolResultCache(ttl=config["AGENT_TOOL_CACHE_TTL"])
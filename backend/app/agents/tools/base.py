@@ -0,0 +1,19 @@
+import asyncio
+from typing import Any
+from langchain.tools import BaseTool
+
+class AsyncTool(BaseTool):
+    """
+    Base class for tools implemented as coroutines.
+
+    The clients these tools use belong to the app's event loop, so the tools
+    are meant to be awaited through `arun`. The synchronous path only works
+    where no loop is running (scripts, a REPL).
+    """
+
+    def _run(self, *args: Any, **kwargs: Any) -> str:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._arun(*args, **kwargs))
+        raise RuntimeError(f"Tool '{self.name}' is asynchronous; use arun() inside a running event loop")
@@ -0,0 +1,24 @@
+from typing import Optional
+from langchain_core.pydantic_v1 import BaseModel, Field
+from .base import AsyncTool
+from ...integrations.github_integration import get_github_integration
+
+# Longer files are cut so one tool result cannot fill the model's context.
+MAX_FILE_CHARS = 8000
+
+class GitHubReadInput(BaseModel):
+    repo: str = Field(description="Repository in 'owner/repo' format")
+    path: str = Field(description="File path within the repository")
+    ref: Optional[str] = Field(default=None, description="Branch or commit SHA")
+
+class GitHubReadTool(AsyncTool):
+    name = "GitHubRead"
+    description = "Read a file from a GitHub repository. Input: {\"repo\": \"owner/repo\", \"path\": \"file path\", \"ref\": optional branch}."
+    args_schema = GitHubReadInput
+
+    async def _arun(self, repo: str, path: str, ref: Optional[str] = None) -> str:
+        result = await get_github_integration().read_file(repo, path, ref=ref)
+        content = result["content"]
+        if len(content) > MAX_FILE_CHARS:
+            content = content[:MAX_FILE_CHARS] + f"\n... [truncated, {len(result['content'])} characters total]"
+        return content
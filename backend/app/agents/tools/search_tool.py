@@ -1,17 +1,14 @@
-from langchain.tools import BaseTool
-from ...utils.elasticsearch_utils import search_documents
+from typing import Optional
+from .base import AsyncTool
+from ...utils.collection_router import search_collection
 
-class SearchTool(BaseTool):
+class SearchTool(AsyncTool):
     name = "Search"
-    description = "Useful for searching information in the knowledge base."
+    description = "Useful for searching information in the knowledge base. Input: the search query."
+    collection: Optional[str] = None
 
     async def _arun(self, query: str) -> str:
-        results = await search_documents("context", query)
+        results = await search_collection(self.collection, query, size=3)
         if results:
             return "\n".join([hit["_source"]["content"] for hit in results[:3]])
         return "No relevant information found."
-
-    def _run(self, query: str) -> str:
-        # Synchronous version if needed
-        import asyncio
-        return asyncio.run(self._arun(query))
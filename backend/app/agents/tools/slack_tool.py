@@ -0,0 +1,14 @@
+from .base import AsyncTool
+from ...integrations.slack_integration import get_slack_integration
+
+# Most recent messages returned to the model.
+MAX_MESSAGES = 20
+
+class SlackReadTool(AsyncTool):
+    name = "SlackRead"
+    description = "Read recent messages from a Slack channel. Input: the channel ID."
+
+    async def _arun(self, channel_id: str) -> str:
+        messages = await get_slack_integration().read_channel_messages(channel_id)
+        lines = [f"{message.get('user', 'unknown')}: {message.get('text', '')}" for message in messages[:MAX_MESSAGES]]
+        return "\n".join(lines) or "No messages found."
@@ -0,0 +1,79 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+from langchain.callbacks.base import AsyncCallbackHandler
+from opentelemetry import context as otel_context, trace
+from opentelemetry.trace import Status, StatusCode
+from ..telemetry.tracing import tracer
+
+class AgentTracingCallbackHandler(AsyncCallbackHandler):
+    """
+    LangChain callback handler that turns agent runs into spans.
+
+    Every chain, LLM call and tool invocation gets its own span, nested under
+    its parent run, so a slow agent request shows which step dominated.
+    """
+
+    def __init__(self):
+        self._spans: Dict[UUID, Any] = {}
+
+    def _start(self, name: str, run_id: UUID, parent_run_id: Optional[UUID], **attributes):
+        parent = self._spans.get(parent_run_id) if parent_run_id else None
+        ctx = trace.set_span_in_context(parent) if parent else otel_context.get_current()
+        span = tracer.start_span(name, context=ctx)
+        for key, value in attributes.items():
+            if value is not None:
+                span.set_attribute(key, value)
+        self._spans[run_id] = span
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, **attributes):
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        for key, value in attributes.items():
+            if value is not None:
+                span.set_attribute(key, value)
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, str(error)))
+        span.end()
+
+    async def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        name = (serialized or {}).get("name") or "chain"
+        self._start(f"agent.chain {name}", run_id, parent_run_id)
+
+    async def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    async def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._start("agent.llm", run_id, parent_run_id, **{"llm.messages": sum(len(m) for m in messages)})
+
+    async def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start("agent.llm", run_id, parent_run_id, **{"llm.prompts": len(prompts)})
+
+    async def on_llm_end(self, response, *, run_id, **kwargs):
+        info = {}
+        if response.generations and response.generations[0]:
+            info = response.generations[0][0].generation_info or {}
+        self._end(
+            run_id,
+            **{
+                "llm.prompt_tokens": info.get("prompt_eval_count"),
+                "llm.completion_tokens": info.get("eval_count"),
+            }
+        )
+
+    async def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    async def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        name = (serialized or {}).get("name") or "tool"
+        self._start(f"agent.tool {name}", run_id, parent_run_id, **{"tool.name": name, "tool.input_length": len(input_str)})
+
+    async def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id, **{"tool.output_length": len(str(output))})
+
+    async def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import os
+from typing import Optional, Set
+from ..config.config_loader import config
+from ..utils.cache import index_generations
+from .base import SharedBackend
+
+logger = logging.getLogger(__name__)
+
+INDEX_GENERATIONS_CHANNEL = "index_generations"
+
+_backend: Optional[SharedBackend] = None
+# Publishes in flight; referenced so they are not garbage collected mid-run.
+_publish_tasks: Set[asyncio.Task] = set()
+
+def get_shared_backend() -> SharedBackend:
+    """
+    Return the configured shared backend.
+
+    SHARED_BACKEND selects "memory" (single process) or "postgres" (state
+    shared by every worker through DATABASE_URL).
+    """
+    global _backend
+    if _backend is None:
+        if config["SHARED_BACKEND"] == "postgres":
+            from .postgres import PostgresBackend
+            _backend = PostgresBackend(config["DATABASE_URL"], config["SHARED_BACKEND_POOL_SIZE"])
+        else:
+            from .memory import MemoryBackend
+            _backend = MemoryBackend(config["SHARED_CACHE_SIZE"])
+    return _backend
+
+async def share_index_generations(backend: SharedBackend):
+    """
+    Propagate index writes between workers.
+
+    Local writes are published; writes published by other workers bump the
+    local generation, so every worker's retrieval cache drops stale results.
+    """
+    worker = str(os.getpid())
+
+    def on_local_bump(index_name: str):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(backend.publish(INDEX_GENERATIONS_CHANNEL, f"{worker}:{index_name}"))
+        _publish_tasks.add(task)
+        task.add_done_callback(on_published)
+
+    def on_published(task: asyncio.Task):
+        _publish_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Could not publish index generation bump: {task.exception()!r}")
+
+    def on_remote_bump(message: str):
+        sender, _, index_name = message.partition(":")
+        if sender != worker:
+            index_generations.bump(index_name, notify=False)
+
+    await backend.subscribe(INDEX_GENERATIONS_CHANNEL, on_remote_bump)
+    index_generations.add_listener(on_local_bump)
@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncContextManager, Callable, Optional, Tuple
+
+class SharedBackend(ABC):
+    """
+    State shared by every worker process of the API.
+
+    Provides a key/value cache with TTLs, token buckets for rate limiting and
+    a publish/subscribe channel for cross-worker notifications (e.g. cache
+    invalidation) and named locks for work that must not run concurrently
+    in several workers. Values must be JSON-serializable.
+    """
+
+    name = "base"
+
+    async def start(self):
+        """Open connections; called from the application startup hook."""
+
+    async def stop(self):
+        """Close connections; called from the application shutdown hook."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under `key`, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store `value` under `key`, expiring after `ttl` seconds if given."""
+
+    @abstractmethod
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Store `value` under `key` unless it already holds an unexpired value.
+
+        Atomic across workers, so exactly one caller claims a given key.
+
+        Returns:
+            bool: Whether the value was stored.
+        """
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Remove `key` if present."""
+
+    @abstractmethod
+    async def consume_tokens(self, key: str, capacity: float, refill_rate: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Take `cost` tokens from the bucket `key`.
+
+        Buckets start full at `capacity` and refill at `refill_rate` tokens per
+        second. Nothing is taken if the bucket holds fewer than `cost` tokens.
+
+        Returns:
+            Tuple[bool, float]: Whether the tokens were taken, and the tokens left.
+        """
+
+    @abstractmethod
+    def lock(self, key: str) -> AsyncContextManager[None]:
+        """Hold the lock `key`, excluding every other holder in all workers."""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str):
+        """Send `message` to every subscriber of `channel`, in all workers."""
+
+    @abstractmethod
+    async def subscribe(self, channel: str, callback: Callable[[str], None]):
+        """Call `callback(message)` for each message published on `channel`."""
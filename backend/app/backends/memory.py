@@ -0,0 +1,59 @@
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from threading import Lock
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from ..utils.cache import LRUCache
+from .base import SharedBackend
+
+class MemoryBackend(SharedBackend):
+    """In-process backend for single-worker deployments and development."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int):
+        self._cache = LRUCache(maxsize=maxsize)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._subscribers: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
+        self._lock = Lock()
+        self._named_locks: Dict[str, asyncio.Lock] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._cache.set(key, value, ttl=ttl)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._cache.get(key) is not None:
+                return False
+            self._cache.set(key, value, ttl=ttl)
+        return True
+
+    async def delete(self, key: str):
+        self._cache.delete(key)
+
+    async def consume_tokens(self, key: str, capacity: float, refill_rate: float, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+        return allowed, tokens
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        async with self._named_locks.setdefault(key, asyncio.Lock()):
+            yield
+
+    async def publish(self, channel: str, message: str):
+        for callback in list(self._subscribers[channel]):
+            callback(message)
+
+    async def subscribe(self, channel: str, callback: Callable[[str], None]):
+        self._subscribers[channel].append(callback)
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional, Tuple
+from .base import SharedBackend
+
+logger = logging.getLogger(__name__)
+
+# Seconds between deletions of expired shared_cache rows.
+PURGE_INTERVAL = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_cache (
+    key TEXT PRIMARY KEY,
+    value JSONB NOT NULL,
+    expires_at TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS shared_cache_expires_at ON shared_cache (expires_at);
+CREATE TABLE IF NOT EXISTS shared_token_buckets (
+    key TEXT PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    allowed BOOLEAN NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL
+);
+"""
+
+# Refill and take in one statement; the SET expressions all see the old row.
+CONSUME_TOKENS = """
+INSERT INTO shared_token_buckets AS b (key, tokens, allowed, updated_at)
+VALUES ($1, CASE WHEN $2::float8 >= $4::float8 THEN $2::float8 - $4::float8 ELSE $2::float8 END, $2::float8 >= $4::float8, clock_timestamp())
+ON CONFLICT (key) DO UPDATE SET
+    allowed = LEAST($2::float8, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * $3::float8) >= $4::float8,
+    tokens = LEAST($2::float8, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * $3::float8)
+        - CASE WHEN LEAST($2::float8, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * $3::float8) >= $4::float8 THEN $4::float8 ELSE 0 END,
+    updated_at = clock_timestamp()
+RETURNING allowed, tokens
+"""
+
+class PostgresBackend(SharedBackend):
+    """
+    Backend storing shared state in the application's Postgres database.
+
+    Uses the existing database, so running several workers needs no extra
+    service. Notifications use LISTEN/NOTIFY on a dedicated connection, and
+    expired entries are deleted every PURGE_INTERVAL seconds.
+    """
+
+    name = "postgres"
+
+    def __init__(self, dsn: str, pool_size: int):
+        self.dsn = dsn
+        self.pool_size = pool_size
+        self._pool = None
+        self._listener = None
+        self._purge_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        import asyncpg
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.pool_size)
+        async with self._pool.acquire() as conn:
+            # Serialize schema creation between workers starting at once.
+            async with conn.transaction():
+                await conn.execute("SELECT pg_advisory_xact_lock(hashtext('shared_backend_schema'))")
+                await conn.execute(SCHEMA)
+        self._listener = await asyncpg.connect(self.dsn)
+        self._purge_task = asyncio.create_task(self._purge_expired())
+        logger.info("Postgres shared backend started")
+
+    async def _purge_expired(self):
+        while True:
+            try:
+                await self._pool.execute("DELETE FROM shared_cache WHERE expires_at < now()")
+            except Exception as e:
+                logger.warning(f"Could not purge expired shared cache entries: {str(e)}")
+            await asyncio.sleep(PURGE_INTERVAL)
+
+    async def stop(self):
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+            await asyncio.gather(self._purge_task, return_exceptions=True)
+            self._purge_task = None
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self._pool.fetchval(
+            "SELECT value FROM shared_cache WHERE key = $1 AND (expires_at IS NULL OR expires_at > now())", key
+        )
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        await self._pool.execute(
+            """
+            INSERT INTO shared_cache (key, value, expires_at)
+            VALUES ($1, $2::jsonb, CASE WHEN $3::float8 IS NULL THEN NULL ELSE now() + make_interval(secs => $3::float8) END)
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at
+            """,
+            key, json.dumps(value), ttl
+        )
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        # Expired rows linger until purged, so they are overwritten as if absent.
+        stored = await self._pool.fetchval(
+            """
+            INSERT INTO shared_cache (key, value, expires_at)
+            VALUES ($1, $2::jsonb, CASE WHEN $3::float8 IS NULL THEN NULL ELSE now() + make_interval(secs => $3::float8) END)
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at
+            WHERE shared_cache.expires_at IS NOT NULL AND shared_cache.expires_at <= now()
+            RETURNING key
+            """,
+            key, json.dumps(value), ttl
+        )
+        return stored is not None
+
+    async def delete(self, key: str):
+        await self._pool.execute("DELETE FROM shared_cache WHERE key = $1", key)
+
+    async def consume_tokens(self, key: str, capacity: float, refill_rate: float, cost: float = 1.0) -> Tuple[bool, float]:
+        row = await self._pool.fetchrow(CONSUME_TOKENS, key, float(capacity), float(refill_rate), float(cost))
+        return row["allowed"], row["tokens"]
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        # A session-level advisory lock on a connection of its own: holders
+        # and waiters may take a while and must not use up the pool.
+        import asyncpg
+        conn = await asyncpg.connect(self.dsn)
+        try:
+            await conn.execute("SELECT pg_advisory_lock(hashtext($1))", key)
+            yield
+        finally:
+            # Closing the session releases the lock.
+            await conn.close()
+
+    async def publish(self, channel: str, message: str):
+        await self._pool.execute("SELECT pg_notify($1, $2)", channel, message)
+
+    async def subscribe(self, channel: str, callback: Callable[[str], None]):
+        def listener(connection, pid, channel_name, payload):
+            callback(payload)
+        await self._listener.add_listener(channel, listener)
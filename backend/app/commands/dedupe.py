@@ -0,0 +1,29 @@
+"""
+Collapse documents with identical content in a context index.
+
+Usage:
+    python -m app.commands.dedupe [--collection NAME] [--dry-run]
+"""
+import argparse
+import asyncio
+import logging
+from app.utils.collection_router import resolve_collection
+from app.utils.elasticsearch_utils import collapse_duplicates, es_client
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def main(collection: str, dry_run: bool):
+    try:
+        target = resolve_collection(collection)
+        summary = await collapse_duplicates(target.index, routing=target.routing, dry_run=dry_run)
+        logger.info(f"Deduplication {'preview' if dry_run else 'complete'}: {summary}")
+    finally:
+        await es_client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collapse duplicate context documents into one content-addressed copy.")
+    parser.add_argument("--collection", default=None, help="Collection to clean up (default: the shared collection)")
+    parser.add_argument("--dry-run", action="store_true", help="Report duplicates without changing anything")
+    args = parser.parse_args()
+    asyncio.run(main(args.collection, args.dry_run))
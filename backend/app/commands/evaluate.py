@@ -0,0 +1,152 @@
+"""
+Measure retrieval quality against latency and prompt size for RAG settings.
+
+Runs a labeled query set through the same retrieval path as the RAG
+endpoints for every combination of the given settings and reports
+recall@k, MRR, retrieval latency and the size of the resulting prompt.
+
+The query set is JSON Lines, one query per line:
+    {"query": "Who invented AI?", "relevant": ["Introduction to AI"]}
+where `relevant` lists the IDs or titles of the documents that answer it.
+
+Usage:
+    python -m app.commands.evaluate QUERIES.jsonl [--top-k 1,3,5] [--rerank off,on]
+        [--summaries off,on] [--collection NAME ...] [--repeat 3] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import statistics
+import time
+from itertools import product
+from typing import Any, Dict, List, Optional
+from app.rag.reranker import reranker
+from app.rag.retrieval_cache import retrieval_cache
+from app.rag.service import build_prompt, retrieve_context
+from app.retrieval import get_retrieval_backend
+
+logging.basicConfig(level=logging.WARNING)
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token for English)."""
+    return math.ceil(len(text) / 4)
+
+def load_queries(path: str) -> List[Dict[str, Any]]:
+    """Read the labeled query set, skipping blank lines."""
+    queries = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if not item.get("query") or not item.get("relevant"):
+                raise ValueError(f"{path}:{number}: each line needs 'query' and a non-empty 'relevant' list")
+            queries.append(item)
+    return queries
+
+def _is_relevant(hit: Dict[str, Any], relevant: set) -> bool:
+    return hit["_id"] in relevant or hit["_source"].get("title") in relevant
+
+def _matched_labels(hits: List[Dict[str, Any]], relevant: set) -> set:
+    """The labels in `relevant` that at least one hit matches by ID or title."""
+    return {label for label in relevant if any(label in (hit["_id"], hit["_source"].get("title")) for hit in hits)}
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of `values` (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+async def evaluate(queries: List[Dict[str, Any]], top_k: int, rerank: bool, use_summaries: bool, collections: Optional[List[str]], repeat: int) -> Dict[str, Any]:
+    """
+    Score one retrieval setting over the query set.
+
+    Each query is retrieved `repeat` times with the re-ranker's score cache
+    cleared before every run, so each run does the full work of the setting,
+    and the median run is kept so one-off stalls do not distort the
+    comparison between settings.
+    """
+    details = []
+    for item in queries:
+        relevant = set(item["relevant"])
+        latencies = []
+        for _ in range(repeat):
+            reranker.cache.clear()
+            start = time.perf_counter()
+            hits = await retrieve_context(item["query"], top_k, rerank, collections)
+            latencies.append(time.perf_counter() - start)
+
+        ranks = [rank for rank, hit in enumerate(hits, 1) if _is_relevant(hit, relevant)]
+        details.append({
+            "query": item["query"],
+            "recall": len(_matched_labels(hits, relevant)) / len(relevant),
+            "reciprocal_rank": 1 / ranks[0] if ranks else 0.0,
+            "latency_seconds": statistics.median(latencies),
+            "prompt_tokens": estimate_tokens(build_prompt(item["query"], hits, use_summaries)),
+            "hits": [hit["_id"] for hit in hits],
+        })
+
+    latencies = [d["latency_seconds"] for d in details]
+    return {
+        "top_k": top_k,
+        "rerank": rerank,
+        "summaries": use_summaries,
+        "recall_at_k": sum(d["recall"] for d in details) / len(details),
+        "mrr": sum(d["reciprocal_rank"] for d in details) / len(details),
+        "latency_p50_seconds": _percentile(latencies, 50),
+        "latency_p95_seconds": _percentile(latencies, 95),
+        "avg_prompt_tokens": sum(d["prompt_tokens"] for d in details) / len(details),
+        "queries": details,
+    }
+
+def print_report(results: List[Dict[str, Any]]):
+    print(f"{'top_k':>5} {'rerank':>6} {'summ':>4} {'recall':>7} {'mrr':>6} {'p50 ms':>8} {'p95 ms':>8} {'tokens':>7}")
+    for result in results:
+        print(
+            f"{result['top_k']:>5} {'on' if result['rerank'] else 'off':>6} {'on' if result['summaries'] else 'off':>4} "
+            f"{result['recall_at_k']:>7.3f} "
+            f"{result['mrr']:>6.3f} {result['latency_p50_seconds'] * 1000:>8.2f} "
+            f"{result['latency_p95_seconds'] * 1000:>8.2f} {result['avg_prompt_tokens']:>7.0f}"
+        )
+
+async def main(path: str, top_ks: List[int], reranks: List[bool], summaries: List[bool], collections: Optional[List[str]], repeat: int, output: Optional[str]):
+    # Cached results would make every setting after the first look free.
+    retrieval_cache.enabled = False
+    try:
+        queries = load_queries(path)
+        results = [
+            await evaluate(queries, top_k, rerank, use_summaries, collections, repeat)
+            for rerank, use_summaries, top_k in product(reranks, summaries, top_ks)
+        ]
+        print_report(results)
+        if output:
+            with open(output, "w") as f:
+                json.dump({"queries_file": path, "collections": collections, "results": results}, f, indent=2)
+            print(f"Results written to {output}")
+    finally:
+        await get_retrieval_backend().stop()
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+def _switch_list(value: str) -> List[bool]:
+    switches = {"off": False, "on": True}
+    try:
+        return [switches[part.strip()] for part in value.split(",") if part.strip()]
+    except KeyError:
+        raise argparse.ArgumentTypeError("expected a comma-separated list of 'off' and 'on'")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate retrieval quality, latency and prompt size for RAG settings.")
+    parser.add_argument("queries", help="JSON Lines file of {'query': ..., 'relevant': [...]} items")
+    parser.add_argument("--top-k", type=_int_list, default=[1, 3, 5], help="Comma-separated top-k values to compare (default: 1,3,5)")
+    parser.add_argument("--rerank", type=_switch_list, default=[False], help="Re-ranking settings to compare, e.g. off,on (default: off)")
+    parser.add_argument("--summaries", type=_switch_list, default=[False], help="Summary settings to compare, e.g. off,on; affects only prompt size (default: off)")
+    parser.add_argument("--collection", action="append", dest="collections", help="Collection to search; repeat for several (default: the shared collection)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per query; the median is reported (default: 3)")
+    parser.add_argument("--output", help="Also write per-query results to this JSON file")
+    args = parser.parse_args()
+    asyncio.run(main(args.queries, args.top_k, args.rerank, args.summaries, args.collections, args.repeat, args.output))
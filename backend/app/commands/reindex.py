@@ -0,0 +1,34 @@
+"""
+Migrate an index alias to the current index template version.
+
+Usage:
+    python -m app.commands.reindex [--alias context] [--delete-old]
+
+Writes made while documents are copied are picked up by a second pass after
+the switch, but deletions are not: pause ingestion (or re-run the deletes)
+if documents may be deleted during the migration.
+"""
+import argparse
+import asyncio
+import logging
+from app.utils.elasticsearch_utils import es_client, reindex_to_current_version
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def main(alias: str, delete_old: bool):
+    try:
+        summary = await reindex_to_current_version(alias, delete_old=delete_old)
+        logger.info(f"Reindex complete: {summary}")
+    finally:
+        await es_client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Zero-downtime reindex into the current template version.",
+        epilog="Documents deleted during the migration may reappear; pause ingestion if that matters.",
+    )
+    parser.add_argument("--alias", default="context", help="Alias (or legacy index) to migrate")
+    parser.add_argument("--delete-old", action="store_true", help="Delete the previous indices after the switch")
+    args = parser.parse_args()
+    asyncio.run(main(args.alias, args.delete_old))
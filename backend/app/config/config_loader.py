@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 import os
+import tempfile
 from typing import Dict, Any
 import logging
 from pathlib import Path
@@ -31,24 +32,127 @@ class ConfigLoader:
             "PORT": int(os.getenv("PORT", 8000)),
             "DEBUG": os.getenv("DEBUG", "False").lower() == "true",
             
+            # Logging Configuration
+            "LOG_LEVEL": os.getenv("LOG_LEVEL", "INFO").upper(),
+            "LOG_FORMAT": os.getenv("LOG_FORMAT", "text").lower(),
+            "LOG_SAMPLE_RATE": float(os.getenv("LOG_SAMPLE_RATE", 0.01)),
+            
             # Database Configuration
             "DATABASE_URL": os.getenv("DATABASE_URL", "postgresql://ai_agent_user:secure_password@db:5432/ai_agent_db"),
             "ELASTICSEARCH_URL": os.getenv("ELASTICSEARCH_URL", "http://elasticsearch:9200"),
+            "ELASTICSEARCH_REPLICAS": int(os.getenv("ELASTICSEARCH_REPLICAS", 0)),
             
             # Slack Configuration
             "SLACK_BOT_TOKEN": os.getenv("SLACK_BOT_TOKEN"),
             "SLACK_SIGNING_SECRET": os.getenv("SLACK_SIGNING_SECRET"),
+            "SLACK_API_URL": os.getenv("SLACK_API_URL", "https://slack.com/api/"),
             
             # Ollama Configuration
             "OLLAMA_HOST": os.getenv("OLLAMA_HOST", "http://localhost:11434"),
             "DEFAULT_MODEL": os.getenv("DEFAULT_MODEL", "llama2"),
+            "OLLAMA_ECHO_TOKENS": os.getenv("OLLAMA_ECHO_TOKENS", "False").lower() == "true",
+            "AGENT_VERBOSE": os.getenv("AGENT_VERBOSE", "False").lower() == "true",
+            "AGENT_MAX_STEPS": int(os.getenv("AGENT_MAX_STEPS", 5)),
+            "AGENT_MAX_SECONDS": float(os.getenv("AGENT_MAX_SECONDS", 120)),
+            "AGENT_MAX_TOKENS": int(os.getenv("AGENT_MAX_TOKENS", 16000)),
+            "AGENT_TOOL_TIMEOUT": float(os.getenv("AGENT_TOOL_TIMEOUT", 30)),
+            "AGENT_TOOL_CACHE_TTL": float(os.getenv("AGENT_TOOL_CACHE_TTL", 1800)),
+            # Models for model="auto", smallest first
+            "MODEL_TIERS": [m.strip() for m in os.getenv("MODEL_TIERS", "llama3.2,llama2").split(",") if m.strip()],
+            "MODEL_ROUTER_SLO_SECONDS": float(os.getenv("MODEL_ROUTER_SLO_SECONDS", 20)),
+            "MODEL_ROUTER_SHORT_PROMPT_CHARS": int(os.getenv("MODEL_ROUTER_SHORT_PROMPT_CHARS", 200)),
+            "MODEL_ROUTER_LONG_PROMPT_CHARS": int(os.getenv("MODEL_ROUTER_LONG_PROMPT_CHARS", 2000)),
+            "OLLAMA_KEEP_ALIVE": os.getenv("OLLAMA_KEEP_ALIVE", "30m"),
+            "OLLAMA_PRELOAD_MODELS": [m.strip() for m in os.getenv("OLLAMA_PRELOAD_MODELS", "llama2").split(",") if m.strip()],
+            "OLLAMA_SESSION_TTL": float(os.getenv("OLLAMA_SESSION_TTL", 1800)),
+            "OLLAMA_SESSION_MAX_TOKENS": int(os.getenv("OLLAMA_SESSION_MAX_TOKENS", 4096)),
+            "RAG_SPECULATIVE_WARMUP": os.getenv("RAG_SPECULATIVE_WARMUP", "True").lower() == "true",
             
             # Security Configuration
             "SECRET_KEY": os.getenv("SECRET_KEY", "your-secret-key"),
             "CORS_ORIGINS": os.getenv("CORS_ORIGINS", "http://localhost:3000").split(","),
             
+            # Response Configuration
+            "COMPRESSION_ENABLED": os.getenv("COMPRESSION_ENABLED", "True").lower() == "true",
+            "COMPRESSION_MINIMUM_SIZE": int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024)),
+            "COMPRESSION_GZIP_LEVEL": int(os.getenv("COMPRESSION_GZIP_LEVEL", 6)),
+            "COMPRESSION_BROTLI_QUALITY": int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4)),
+            
+            # Routers Configuration (empty means all)
+            "ENABLED_ROUTERS": [r.strip() for r in os.getenv("ENABLED_ROUTERS", "").split(",") if r.strip()],
+            
             # GitHub Configuration
             "GITHUB_ACCESS_TOKEN": os.getenv("GITHUB_ACCESS_TOKEN"),
+            "GITHUB_API_URL": os.getenv("GITHUB_API_URL", "https://api.github.com"),
+            "GITHUB_WEBHOOK_SECRET": os.getenv("GITHUB_WEBHOOK_SECRET"),
+            "GITHUB_SYNC_COLLECTION": os.getenv("GITHUB_SYNC_COLLECTION") or None,
+            "GITHUB_SYNC_MAX_FILE_BYTES": int(os.getenv("GITHUB_SYNC_MAX_FILE_BYTES", 512 * 1024)),
+            "GITHUB_SYNC_QUEUE_SIZE": int(os.getenv("GITHUB_SYNC_QUEUE_SIZE", 1000)),
+            
+            # Quota Configuration
+            "QUOTAS_ENABLED": os.getenv("QUOTAS_ENABLED", "False").lower() == "true",
+            "API_KEYS": [k.strip() for k in os.getenv("API_KEYS", "").split(",") if k.strip()],
+            "QUOTA_PATHS": [p.strip() for p in os.getenv("QUOTA_PATHS", "/api/generate,/api/rag,/api/agent").split(",") if p.strip()],
+            "QUOTA_REQUESTS_PER_MINUTE": float(os.getenv("QUOTA_REQUESTS_PER_MINUTE", 60)),
+            "QUOTA_REQUEST_BURST": float(os.getenv("QUOTA_REQUEST_BURST", 10)),
+            "QUOTA_TOKENS_PER_MINUTE": float(os.getenv("QUOTA_TOKENS_PER_MINUTE", 20000)),
+            "QUOTA_TOKEN_BURST": float(os.getenv("QUOTA_TOKEN_BURST", 40000)),
+            "TOKEN_ACCOUNTING_PERSIST": os.getenv("TOKEN_ACCOUNTING_PERSIST", "False").lower() == "true",
+            "TOKEN_ACCOUNTING_FLUSH_INTERVAL": float(os.getenv("TOKEN_ACCOUNTING_FLUSH_INTERVAL", 5)),
+            
+            # Server Configuration for multi-worker deployments
+            # One worker per CPU only when they can share state; see app/server.py.
+            "WORKERS": int(os.getenv("WORKERS", (os.cpu_count() or 1) if os.getenv("SHARED_BACKEND", "memory").lower() == "postgres" else 1)),
+            "SHARED_BACKEND": os.getenv("SHARED_BACKEND", "memory").lower(),
+            "SHARED_BACKEND_POOL_SIZE": int(os.getenv("SHARED_BACKEND_POOL_SIZE", 5)),
+            "SHARED_CACHE_SIZE": int(os.getenv("SHARED_CACHE_SIZE", 10000)),
+            
+            # Request Coalescing Configuration
+            "SINGLE_FLIGHT_ENABLED": os.getenv("SINGLE_FLIGHT_ENABLED", "True").lower() == "true",
+            
+            # Ingestion Configuration
+            "INGEST_WORKERS": int(os.getenv("INGEST_WORKERS", 2)),
+            "INGEST_BATCH_SIZE": int(os.getenv("INGEST_BATCH_SIZE", 200)),
+            "INGEST_FLUSH_INTERVAL": float(os.getenv("INGEST_FLUSH_INTERVAL", 0.05)),
+            "INGEST_QUEUE_SIZE": int(os.getenv("INGEST_QUEUE_SIZE", 10000)),
+            "INGEST_JOB_RETENTION": int(os.getenv("INGEST_JOB_RETENTION", 10000)),
+            "INGEST_JOB_TTL": float(os.getenv("INGEST_JOB_TTL", 3600)),
+            "INGEST_WAIT_TIMEOUT": float(os.getenv("INGEST_WAIT_TIMEOUT", 30)),
+            "UPLOAD_SPOOL_DIR": os.getenv("UPLOAD_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "context-uploads")),
+            "UPLOAD_MAX_FILE_BYTES": int(os.getenv("UPLOAD_MAX_FILE_BYTES", 50 * 1024 * 1024)),
+            "UPLOAD_MAX_FILES": int(os.getenv("UPLOAD_MAX_FILES", 100)),
+            "UPLOAD_MAX_REQUEST_BYTES": int(os.getenv("UPLOAD_MAX_REQUEST_BYTES", 200 * 1024 * 1024)),
+            "UPLOAD_PARSE_WORKERS": int(os.getenv("UPLOAD_PARSE_WORKERS", 2)),
+            "UPLOAD_CHUNK_CHARS": int(os.getenv("UPLOAD_CHUNK_CHARS", 4000)),
+            "SUMMARIES_ENABLED": os.getenv("SUMMARIES_ENABLED", "False").lower() == "true",
+            "SUMMARY_MODEL": os.getenv("SUMMARY_MODEL") or None,
+            "SUMMARY_WORKERS": int(os.getenv("SUMMARY_WORKERS", 1)),
+            "SUMMARY_QUEUE_SIZE": int(os.getenv("SUMMARY_QUEUE_SIZE", 10000)),
+            "SUMMARY_MIN_CHARS": int(os.getenv("SUMMARY_MIN_CHARS", 600)),
+            "SUMMARY_CHUNK_CHARS": int(os.getenv("SUMMARY_CHUNK_CHARS", 4000)),
+            "SUMMARY_MAX_WORDS": int(os.getenv("SUMMARY_MAX_WORDS", 80)),
+            
+            # Observability Configuration
+            "OTEL_TRACES_EXPORTER": os.getenv("OTEL_TRACES_EXPORTER", "none").lower(),
+            "OTEL_EXPORTER_OTLP_ENDPOINT": os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318/v1/traces"),
+            "OTEL_TRACES_FILE": os.getenv("OTEL_TRACES_FILE", "traces.jsonl"),
+            "OTEL_SERVICE_NAME": os.getenv("OTEL_SERVICE_NAME", "ai-agent-platform-backend"),
+            
+            # Retrieval Configuration
+            "RETRIEVAL_BACKEND": os.getenv("RETRIEVAL_BACKEND", "elasticsearch").lower(),
+            "RETRIEVAL_SQLITE_PATH": os.getenv("RETRIEVAL_SQLITE_PATH", "retrieval.db"),
+            "RETRIEVAL_SQLITE_MMAP_SIZE": int(os.getenv("RETRIEVAL_SQLITE_MMAP_SIZE", 268435456)),
+            "COLLECTION_MODE": os.getenv("COLLECTION_MODE", "index"),
+            "RAG_TOP_K": int(os.getenv("RAG_TOP_K", 3)),
+            "RAG_USE_SUMMARIES": os.getenv("RAG_USE_SUMMARIES", "False").lower() == "true",
+            "RERANK_ENABLED": os.getenv("RERANK_ENABLED", "False").lower() == "true",
+            "RERANK_MODEL": os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+            "RERANK_CANDIDATES": int(os.getenv("RERANK_CANDIDATES", 50)),
+            "RERANK_BATCH_SIZE": int(os.getenv("RERANK_BATCH_SIZE", 16)),
+            "RERANK_CACHE_SIZE": int(os.getenv("RERANK_CACHE_SIZE", 10000)),
+            "RETRIEVAL_CACHE_ENABLED": os.getenv("RETRIEVAL_CACHE_ENABLED", "True").lower() == "true",
+            "RETRIEVAL_CACHE_SIZE": int(os.getenv("RETRIEVAL_CACHE_SIZE", 2048)),
+            "RETRIEVAL_CACHE_TTL": float(os.getenv("RETRIEVAL_CACHE_TTL", 300)),
         }
         
         # Validate required configuration
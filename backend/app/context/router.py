@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, File, HTTPException, Response, UploadFile
 from pydantic import BaseModel
-from .service import add_context, get_all_contexts, delete_context, update_context, create_mock_context_data
+from typing import List, Optional
+from .service import add_context, get_all_contexts, delete_context, update_context, create_mock_context_data, get_ingestion_job, upload_contexts, get_upload
 
 router = APIRouter()
 
@@ -9,21 +10,55 @@ class ContextDocument(BaseModel):
     content: str
 
 @router.post("/")
-async def add_context_route(document: ContextDocument):
-    return await add_context(document)
+async def add_context_route(document: ContextDocument, response: Response, collection: Optional[str] = None, wait_for: Optional[str] = None):
+    """
+    Queue a context document for indexing.
+
+    Returns 202 with a job ID immediately; pass `wait_for=refresh` to wait
+    until the document is searchable.
+    """
+    result = await add_context(document, collection, wait_for)
+    response.status_code = 200 if wait_for else 202
+    return result
 
 @router.get("/")
-async def get_all_contexts_route():
-    return await get_all_contexts()
+async def get_all_contexts_route(collection: Optional[str] = None):
+    return await get_all_contexts(collection)
+
+@router.post("/upload", status_code=202)
+async def upload_contexts_route(files: List[UploadFile] = File(...), collection: Optional[str] = None):
+    """
+    Upload PDF, Markdown, HTML or plain text files as context.
+
+    Files are parsed in the background and long texts split into several
+    documents; poll `/uploads/{upload_id}` for progress.
+    """
+    return await upload_contexts(files, collection)
+
+@router.get("/uploads/{upload_id}")
+async def get_upload_route(upload_id: str):
+    return await get_upload(upload_id)
+
+@router.get("/jobs/{job_id}")
+async def get_ingestion_job_route(job_id: str):
+    return await get_ingestion_job(job_id)
 
 @router.delete("/{doc_id}")
-async def delete_context_route(doc_id: str):
-    return await delete_context(doc_id)
+async def delete_context_route(doc_id: str, collection: Optional[str] = None):
+    return await delete_context(doc_id, collection)
 
 @router.put("/{doc_id}")
-async def update_context_route(doc_id: str, document: ContextDocument):
-    return await update_context(doc_id, document)
+async def update_context_route(doc_id: str, document: ContextDocument, response: Response, collection: Optional[str] = None, wait_for: Optional[str] = None):
+    """
+    Queue an update of a context document; see `add_context_route` for `wait_for`.
+
+    Document IDs are derived from content, so changed content moves the
+    document to a new ID, returned as `id` (the old one as `previous_id`).
+    """
+    result = await update_context(doc_id, document, collection, wait_for)
+    response.status_code = 200 if wait_for else 202
+    return result
 
 @router.post("/create_mock_data")
-async def create_mock_context_data_route():
-    return await create_mock_context_data()
+async def create_mock_context_data_route(collection: Optional[str] = None):
+    return await create_mock_context_data(collection)
@@ -1,37 +1,150 @@
-from app.utils.elasticsearch_utils import index_document, get_all_documents, delete_document, update_document, create_mock_data
+import asyncio
+from app.config.config_loader import config
+from app.retrieval import DocumentNotFoundError, get_retrieval_backend
+from app.utils.collection_router import resolve_collection
+from app.utils.content_hash import content_document_id, content_hash
+from app.utils.responses import RawJSONResponse
+from app.ingestion.queue import ingestion_queue, QueueFullError
+from app.ingestion.uploads import upload_processor, UploadTooLargeError
 from fastapi import HTTPException
 
-async def add_context(document):
+def _resolve(collection):
     try:
-        result = await index_document("context", document.dict())
-        return {"message": "Context added successfully", "id": result["_id"]}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error adding context: {str(e)}")
+        return resolve_collection(collection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _validate_wait_for(wait_for):
+    if wait_for not in (None, "refresh"):
+        raise HTTPException(status_code=400, detail="wait_for must be 'refresh' if given")
 
-async def get_all_contexts():
+async def _submit(operations, wait_for):
+    """Queue writes and, for wait_for=refresh, wait until they are searchable."""
     try:
-        results = await get_all_documents("context")
-        return {"contexts": results}
+        job = await ingestion_queue.submit(operations, refresh=wait_for == "refresh")
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    if wait_for == "refresh":
+        try:
+            await job.wait(timeout=config["INGEST_WAIT_TIMEOUT"])
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail=f"Timed out waiting for job {job.id}")
+        if job.failed:
+            raise HTTPException(status_code=500, detail=f"Error indexing context: {'; '.join(job.errors)}")
+    return job
+
+async def add_context(document, collection=None, wait_for=None):
+    target = _resolve(collection)
+    _validate_wait_for(wait_for)
+    source = document.dict()
+    # Content-derived IDs make re-adding identical content a skipped no-op.
+    doc_id = content_document_id(source, target.routing)
+    job = await _submit([{
+        "action": "create",
+        "index": target.index,
+        "routing": target.routing,
+        "id": doc_id,
+        "document": {**source, "content_hash": content_hash(source)},
+    }], wait_for)
+    if job.skipped:
+        message = "Context already exists"
+    elif job.completed_at:
+        message = "Context added successfully"
+    else:
+        message = "Context accepted for indexing"
+    return {"message": message, "id": doc_id, "job_id": job.id, "status": job.status}
+
+async def get_all_contexts(collection=None):
+    target = _resolve(collection)
+    try:
+        # Hits are passed through as the backend encoded them.
+        hits = await get_retrieval_backend().get_all_documents_raw(target.index, routing=target.routing)
+        return RawJSONResponse(b'{"contexts":' + hits + b'}')
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving contexts: {str(e)}")
 
-async def delete_context(doc_id: str):
+async def delete_context(doc_id: str, collection=None):
+    target = _resolve(collection)
     try:
-        result = await delete_document("context", doc_id)
+        await get_retrieval_backend().delete_document(target.index, doc_id, routing=target.routing)
         return {"message": f"Context {doc_id} deleted successfully"}
+    except DocumentNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting context: {str(e)}")
 
-async def update_context(doc_id: str, document):
+def update_operations(index_name, routing, doc_id, source):
+    """
+    Ingestion operations that replace document `doc_id` with `source`.
+
+    IDs are derived from content, so changed content moves the document to
+    its new ID (create it, delete the old one); keeping the old ID would let
+    the original content be added again alongside it. Unchanged content is a
+    plain update, which the backend skips as a no-op.
+
+    Returns:
+        tuple: The new document ID and the operations.
+    """
+    new_id = content_document_id(source, routing)
+    document = {**source, "content_hash": content_hash(source)}
+    if new_id == doc_id:
+        return new_id, [{"action": "update", "index": index_name, "routing": routing, "id": doc_id, "document": document}]
+    return new_id, [
+        {"action": "create", "index": index_name, "routing": routing, "id": new_id, "document": document},
+        {"action": "delete", "index": index_name, "routing": routing, "id": doc_id},
+    ]
+
+async def update_context(doc_id: str, document, collection=None, wait_for=None):
+    target = _resolve(collection)
+    _validate_wait_for(wait_for)
+    new_id, operations = update_operations(target.index, target.routing, doc_id, document.dict())
+    if new_id != doc_id and not await get_retrieval_backend().document_exists(target.index, doc_id, routing=target.routing):
+        raise HTTPException(status_code=404, detail=f"Document {doc_id} not found")
+    job = await _submit(operations, wait_for)
+    message = f"Context {doc_id} updated successfully" if job.completed_at else f"Context {doc_id} update accepted"
+    return {"message": message, "id": new_id, "previous_id": doc_id, "job_id": job.id, "status": job.status}
+
+async def get_ingestion_job(job_id: str):
+    job = await ingestion_queue.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+async def upload_contexts(files, collection=None):
+    target = _resolve(collection)
+    if not files:
+        raise HTTPException(status_code=400, detail="No files uploaded")
+    if len(files) > config["UPLOAD_MAX_FILES"]:
+        raise HTTPException(status_code=400, detail=f"At most {config['UPLOAD_MAX_FILES']} files per upload")
     try:
-        result = await update_document("context", doc_id, document.dict())
-        return {"message": f"Context {doc_id} updated successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error updating context: {str(e)}")
+        job = await upload_processor.submit(
+            [(upload.filename, upload.content_type, upload.file) for upload in files],
+            target.index, target.routing, target.collection
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    finally:
+        for upload in files:
+            await upload.close()
+    return {"message": f"{len(files)} files accepted for processing", "upload_id": job.id, "status": job.status}
+
+async def get_upload(upload_id: str):
+    upload = await upload_processor.get_job(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail=f"Upload {upload_id} not found")
+    return upload
 
-async def create_mock_context_data():
+async def create_mock_context_data(collection=None):
+    target = _resolve(collection)
     try:
-        await create_mock_data("context")
+        await get_retrieval_backend().create_mock_data(target.index, routing=target.routing)
         return {"message": "Mock context data created successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating mock data: {str(e)}")
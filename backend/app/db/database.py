@@ -10,15 +10,25 @@ load_dotenv()
 # Get database URL from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://ai_agent_user:secure_password@db:5432/ai_agent_db")
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
-
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 # Create Base class
 Base = declarative_base()
 
+_engine = None
+_session_factory = None
+
+def get_engine():
+    """Create the SQLAlchemy engine on first use."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(DATABASE_URL)
+    return _engine
+
+def SessionLocal():
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+    return _session_factory()
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -8,8 +8,11 @@ load_dotenv()
 # Get Elasticsearch URL from environment variable
 ELASTICSEARCH_URL = os.getenv("ELASTICSEARCH_URL", "http://elasticsearch:9200")
 
-# Create Elasticsearch client
-es_client = Elasticsearch([ELASTICSEARCH_URL])
+es_client = None
 
 def get_es_client():
+    # Created on first use; only the health check needs the synchronous client.
+    global es_client
+    if es_client is None:
+        es_client = Elasticsearch([ELASTICSEARCH_URL])
     return es_client
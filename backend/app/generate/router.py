@@ -1,13 +1,19 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from typing import Optional
 from fastapi.responses import StreamingResponse
+from app.utils.model_router import model_router
+from app.utils.ollama_sessions import session_store
 from .service import generate_text, generate_text_stream
 
 router = APIRouter()
 
 class GenerateRequest(BaseModel):
     prompt: str
-    model: str = "llama2"
+    # A model name, "auto" to route by prompt and load, or None for DEFAULT_MODEL.
+    model: Optional[str] = None
+    # Continue a multi-turn session: send only the new turn as the prompt.
+    session_id: Optional[str] = None
 
 @router.post("/")
 async def generate_text_route(request: GenerateRequest):
@@ -22,3 +28,19 @@ async def generate_text_stream_route(request: GenerateRequest):
         return StreamingResponse(generate_text_stream(request), media_type="text/event-stream")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating streaming response: {str(e)}")
+
+@router.get("/sessions/stats")
+async def session_stats_route():
+    """Get this worker's session context hit and miss statistics."""
+    return session_store.stats()
+
+@router.delete("/sessions/{session_id}")
+async def end_session_route(session_id: str):
+    """Forget a session's stored context."""
+    await session_store.delete(session_id)
+    return {"message": "Session ended"}
+
+@router.get("/routing/stats")
+async def routing_stats_route():
+    """Get the model tiers used for model="auto" with their observed latency and queue depth."""
+    return model_router.stats()
@@ -1,16 +1,19 @@
+from app.utils.model_router import model_router
 from app.utils.ollama_utils import generate_ollama_response, stream_ollama_response
 from fastapi import HTTPException
 
 async def generate_text(request):
     try:
-        response = await generate_ollama_response(request.prompt, request.model)
-        return {"generated_text": response["response"]}
+        model = await model_router.resolve(request.model, "generate", request.prompt, request.session_id)
+        response = await generate_ollama_response(request.prompt, model, request.session_id)
+        return {"generated_text": response["response"], "model": model}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating response: {str(e)}")
 
 async def generate_text_stream(request):
     try:
-        async for chunk in stream_ollama_response(request.prompt, request.model):
+        model = await model_router.resolve(request.model, "generate", request.prompt, request.session_id)
+        async for chunk in stream_ollama_response(request.prompt, model, request.session_id):
             yield chunk
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating streaming response: {str(e)}")
@@ -0,0 +1,166 @@
+"""
+Text extraction for uploaded files.
+
+These functions run in worker processes (see `uploads.py`), so they only
+take and return plain picklable values and never touch application state.
+"""
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+class UnsupportedFormatError(ValueError):
+    """Raised for files whose format cannot be converted to text."""
+
+_MARKDOWN_EXTENSIONS = {".md", ".markdown"}
+_HTML_EXTENSIONS = {".html", ".htm"}
+_TEXT_EXTENSIONS = {".txt", ".text", ".rst", ".csv", ".log"}
+
+def detect_format(filename: str, content_type: Optional[str] = None) -> str:
+    """Classify an upload as "pdf", "markdown", "html" or "text"."""
+    extension = Path(filename or "").suffix.lower()
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if extension == ".pdf" or content_type == "application/pdf":
+        return "pdf"
+    if extension in _MARKDOWN_EXTENSIONS or content_type == "text/markdown":
+        return "markdown"
+    if extension in _HTML_EXTENSIONS or content_type in ("text/html", "application/xhtml+xml"):
+        return "html"
+    if extension in _TEXT_EXTENSIONS or content_type.startswith("text/"):
+        return "text"
+    raise UnsupportedFormatError(f"Unsupported file type: {filename} ({content_type or 'unknown type'})")
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collect the title and visible text of an HTML document."""
+
+    _SKIPPED = {"script", "style", "noscript", "template", "svg"}
+    _BLOCKS = {"p", "div", "br", "li", "tr", "section", "article", "header", "footer", "pre", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.parts: List[str] = []
+        self._skipping = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIPPED:
+            self._skipping += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in self._BLOCKS:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIPPED:
+            self._skipping = max(self._skipping - 1, 0)
+        elif tag == "title":
+            self._in_title = False
+        elif tag in self._BLOCKS:
+            self.parts.append("\n\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skipping:
+            self.parts.append(data)
+
+def _extract_html(raw: str) -> Tuple[str, str]:
+    parser = _HTMLTextExtractor()
+    parser.feed(raw)
+    parser.close()
+    return parser.title.strip(), "".join(parser.parts)
+
+_MARKDOWN_HEADING = re.compile(r"^\s{0,3}#\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_MARKDOWN_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_MARKDOWN_LINK = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_MARKDOWN_MARKERS = re.compile(r"^\s{0,3}(?:#{1,6}\s+|>\s?|[-*+]\s+)", re.MULTILINE)
+
+def _extract_markdown(raw: str) -> Tuple[str, str]:
+    heading = _MARKDOWN_HEADING.search(raw)
+    text = _MARKDOWN_IMAGE.sub(r"\1", raw)
+    text = _MARKDOWN_LINK.sub(r"\1", text)
+    text = _MARKDOWN_MARKERS.sub("", text)
+    return (heading.group(1) if heading else ""), text
+
+def _extract_pdf(path: str) -> Tuple[str, str]:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise UnsupportedFormatError("PDF support requires the pypdf package")
+    reader = PdfReader(path)
+    title = (reader.metadata.title if reader.metadata and reader.metadata.title else "") or ""
+    pages = [page.extract_text() or "" for page in reader.pages]
+    return title.strip(), "\n\n".join(pages)
+
+def _normalize(text: str) -> str:
+    """Collapse runs of spaces and blank lines, keeping paragraph breaks."""
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    text = re.sub(r" ?\n ?", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+def chunk_text(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most `max_chars`, breaking between
+    paragraphs where possible. `max_chars` <= 0 keeps the text whole.
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return [text] if text else []
+    chunks: List[str] = []
+    current = ""
+    for paragraph in text.split("\n\n"):
+        while len(paragraph) > max_chars:
+            # A single oversized paragraph: cut at the last space that fits.
+            cut = paragraph.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        if current and len(current) + 2 + len(paragraph) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+def parse_file(path: str, filename: str, content_type: Optional[str], chunk_chars: int) -> List[Dict[str, str]]:
+    """
+    Extract context documents from an uploaded file.
+
+    Args:
+        path (str): Where the upload was spooled.
+        filename (str): The client's file name, used for the format and as
+            the fallback title.
+        content_type (Optional[str]): The part's declared content type.
+        chunk_chars (int): Split longer texts into several documents of at
+            most this many characters (0 keeps one document per file).
+
+    Returns:
+        List[Dict[str, str]]: Documents with `title`, `content` and `source`.
+
+    Raises:
+        UnsupportedFormatError: If the format is not supported.
+    """
+    file_format = detect_format(filename, content_type)
+    if file_format == "pdf":
+        title, text = _extract_pdf(path)
+    else:
+        raw = Path(path).read_text(encoding="utf-8", errors="replace")
+        if file_format == "html":
+            title, text = _extract_html(raw)
+        elif file_format == "markdown":
+            title, text = _extract_markdown(raw)
+        else:
+            title, text = "", raw
+
+    title = title or Path(filename).stem or "Untitled"
+    chunks = chunk_text(_normalize(text), chunk_chars)
+    if len(chunks) == 1:
+        return [{"title": title, "content": chunks[0], "source": filename}]
+    return [
+        {"title": f"{title} (part {number}/{len(chunks)})", "content": chunk, "source": filename}
+        for number, chunk in enumerate(chunks, 1)
+    ]
@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import time
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional
+from ..backends import get_shared_backend
+from ..config.config_loader import config
+from ..retrieval import get_retrieval_backend
+from ..telemetry.log_config import request_id_var
+from ..telemetry.metrics import INGEST_BATCH_SIZE, INGEST_OPERATIONS, INGEST_QUEUE_DEPTH
+from ..utils.cache import LRUCache
+from .summaries import document_summarizer
+
+logger = logging.getLogger(__name__)
+
+class QueueFullError(Exception):
+    """Raised when the write-behind queue cannot accept more work."""
+
+class IngestionJob:
+    """Status of one acknowledged write (one or more document operations)."""
+
+    def __init__(self, operations: int, refresh: bool = False):
+        self.id = uuid.uuid4().hex
+        self.status = "queued"
+        self.refresh = refresh
+        self.total = operations
+        self.succeeded = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors: List[str] = []
+        self.doc_ids: List[str] = []
+        # Outcome ("ok", "skipped" or "error") of each applied operation, by document ID.
+        self.outcomes: Dict[str, str] = {}
+        # Request that submitted the job, for correlating worker logs.
+        self.request_id = request_id_var.get()
+        self.created_at = time.time()
+        self.completed_at: Optional[float] = None
+        self._done = asyncio.Event()
+
+    def record(self, doc_id: str, status: str, error: Optional[str] = None):
+        """Record the outcome of one operation, completing the job after the last one."""
+        self.outcomes[doc_id] = status
+        if status == "ok":
+            self.succeeded += 1
+        elif status == "skipped":
+            self.skipped += 1
+        else:
+            self.failed += 1
+            self.errors.append(f"{doc_id}: {error}")
+        if self.status == "queued":
+            self.status = "indexing"
+        if self.succeeded + self.skipped + self.failed >= self.total:
+            self.status = "failed" if self.failed else "done"
+            self.completed_at = time.time()
+            self._done.set()
+
+    async def wait(self, timeout: Optional[float] = None):
+        """Wait until every operation of the job has been applied."""
+        await asyncio.wait_for(self._done.wait(), timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "errors": self.errors[:20],
+            "doc_ids": self.doc_ids,
+            "request_id": self.request_id,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+        }
+
+class IngestionQueue:
+    """
+    Write-behind queue for context documents.
+
+    Writes are acknowledged as soon as they are queued. A pool of workers
+    drains the queue, groups operations into batches and applies each batch
+    with a single bulk request. Each worker has its own partition of the
+    queue and every operation on a document ID goes to the same partition,
+    so writes to one document are applied in the order they were submitted. Jobs that asked for read-your-writes make their
+    batch use refresh=wait_for.
+
+    Job status is also written to the shared backend when a job is queued
+    and when it completes, so any worker process can report it.
+    """
+
+    def __init__(self, workers: int, batch_size: int, flush_interval: float, max_queue: int, job_retention: int, job_ttl: float):
+        self.worker_count = workers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.job_ttl = job_ttl
+        self.jobs = LRUCache(maxsize=job_retention)
+        self._queues: Optional[List[asyncio.Queue]] = None
+        self._workers: List[asyncio.Task] = []
+        # Queue slots promised to submissions that are still sharing their job.
+        self._reserved = 0
+
+    async def start(self):
+        """Start the worker pool; called from the application startup hook."""
+        if self._workers:
+            return
+        # Unbounded: submit() keeps the total within max_queue.
+        self._queues = [asyncio.Queue() for _ in range(max(self.worker_count, 1))]
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.worker_count)]
+        logger.info(f"Ingestion queue started with {self.worker_count} workers")
+
+    async def stop(self):
+        """Flush outstanding writes and stop the workers."""
+        if not self._workers:
+            return
+        for queue in self._queues:
+            await queue.join()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Ingestion queue stopped")
+
+    async def submit(self, operations: List[Dict[str, Any]], refresh: bool = False) -> IngestionJob:
+        """
+        Queue operations for indexing and return their job.
+
+        Args:
+            operations (List[Dict[str, Any]]): Operations as accepted by the retrieval backend's `bulk_write`.
+            refresh (bool): Make the writes searchable before the job completes.
+
+        Returns:
+            IngestionJob: The job tracking these operations.
+
+        Raises:
+            QueueFullError: If the queue is not running or has no room.
+        """
+        if self._queues is None:
+            raise QueueFullError("Ingestion queue is not running")
+        if self._depth() + self._reserved + len(operations) > self.max_queue:
+            raise QueueFullError("Ingestion queue is full, retry later")
+
+        job = IngestionJob(len(operations), refresh=refresh)
+        job.doc_ids = [op["id"] for op in operations]
+        self.jobs.set(job.id, job)
+        # Reserved so concurrent submissions cannot exceed max_queue meanwhile.
+        self._reserved += len(operations)
+        try:
+            # Shared before queueing so this snapshot can never overwrite the final status.
+            await self._share(job)
+        finally:
+            self._reserved -= len(operations)
+        for op in operations:
+            self._partition(op["id"]).put_nowait((job, op))
+        INGEST_QUEUE_DEPTH.set(self._depth())
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job's status by ID, including jobs queued by other workers."""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return await get_shared_backend().get(f"ingest_job:{job_id}")
+
+    async def _share(self, job: IngestionJob):
+        try:
+            await get_shared_backend().set(f"ingest_job:{job.id}", job.to_dict(), ttl=self.job_ttl)
+        except Exception as e:
+            logger.warning(f"Could not share status of ingestion job {job.id}: {str(e)}")
+
+    def _depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    def _partition(self, doc_id: str) -> asyncio.Queue:
+        return self._queues[zlib.crc32(doc_id.encode("utf-8")) % len(self._queues)]
+
+    async def _next_batch(self, queue: asyncio.Queue) -> List[tuple]:
+        """Wait for one operation, then gather more for up to `flush_interval`."""
+        batch = [await queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _worker(self, worker_id: int):
+        queue = self._queues[worker_id]
+        while True:
+            batch = await self._next_batch(queue)
+            INGEST_QUEUE_DEPTH.set(self._depth())
+            INGEST_BATCH_SIZE.observe(len(batch))
+            refresh = "wait_for" if any(job.refresh for job, _ in batch) else None
+            try:
+                results = await get_retrieval_backend().bulk_write([op for _, op in batch], refresh=refresh)
+                for (job, op), result in zip(batch, results):
+                    if result["result"] == "noop" or (op["action"] == "delete" and result["result"] == "not_found"):
+                        # Unchanged content, or a document that is already gone.
+                        status = "skipped"
+                    elif result["error"]:
+                        status = "error"
+                    else:
+                        status = "ok"
+                    INGEST_OPERATIONS.labels(status=status).inc()
+                    job.record(op["id"], status, str(result["error"]) if result["error"] else None)
+                    if status == "ok" and op["action"] != "delete":
+                        document_summarizer.schedule(op)
+            except Exception as e:
+                logger.error(
+                    f"Ingestion worker {worker_id} failed to apply batch of {len(batch)}: {str(e)}",
+                    extra={"request_ids": sorted({job.request_id for job, _ in batch if job.request_id})}
+                )
+                for job, op in batch:
+                    INGEST_OPERATIONS.labels(status="error").inc()
+                    job.record(op["id"], "error", str(e))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+            for job in {job for job, _ in batch if job.completed_at}:
+                await self._share(job)
+
+# Create a single instance
+ingestion_queue = IngestionQueue(
+    workers=config["INGEST_WORKERS"],
+    batch_size=config["INGEST_BATCH_SIZE"],
+    flush_interval=config["INGEST_FLUSH_INTERVAL"],
+    max_queue=config["INGEST_QUEUE_SIZE"],
+    job_retention=config["INGEST_JOB_RETENTION"],
+    job_ttl=config["INGEST_JOB_TTL"]
+)
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from ..config.config_loader import config
+from ..retrieval import DocumentNotFoundError, get_retrieval_backend
+from ..telemetry.metrics import DOCUMENT_SUMMARIES
+from ..utils.content_hash import content_hash
+from ..utils.ollama_utils import generate_background
+from .parsers import chunk_text
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = (
+    "Summarize the following text in at most {max_words} words. Keep the names, numbers and "
+    "identifiers a reader would need to answer questions about it. Reply with the summary only.\n\n"
+    "{text}\n\nSummary:"
+)
+
+def summary_is_current(source: Dict[str, Any]) -> bool:
+    """Whether a stored document has a summary made from its current content."""
+    if not source.get("summary"):
+        return False
+    return source.get("summary_hash") == (source.get("content_hash") or content_hash(source))
+
+class DocumentSummarizer:
+    """
+    Summarize context documents in the background for compact RAG prompts.
+
+    The ingestion workers schedule every document they add or change.
+    Documents of at least `min_chars` are summarized by Ollama one chunk of
+    `chunk_chars` at a time, and the chunk summaries are combined into the
+    document summary. Summaries are stored on the document together with the
+    hash of the content they describe, so a summary of an earlier version is
+    never used. Writing a summary does not invalidate cached retrieval
+    results, so cached hits pick up summaries as they expire (within
+    RETRIEVAL_CACHE_TTL). Scheduling never waits: with the queue full a document simply
+    stays unsummarized and RAG uses its full text.
+    """
+
+    def __init__(self, enabled: bool, model: Optional[str], workers: int, max_queue: int, min_chars: int, chunk_chars: int, max_words: int):
+        self.enabled = enabled
+        self.model = model
+        self.worker_count = workers
+        self.max_queue = max_queue
+        self.min_chars = min_chars
+        self.chunk_chars = chunk_chars
+        self.max_words = max_words
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        """Start the workers; called from the application startup hook."""
+        if not self.enabled or self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+        logger.info(f"Document summarizer started with {self.worker_count} workers")
+
+    async def stop(self):
+        """Stop the workers; documents still queued stay unsummarized."""
+        if not self._workers:
+            return
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def schedule(self, operation: Dict[str, Any]) -> bool:
+        """
+        Queue a written document for summarization.
+
+        Args:
+            operation (Dict[str, Any]): The applied ingestion operation.
+
+        Returns:
+            bool: False if the summarizer is off, the document is too short
+                to be worth summarizing or the queue is full.
+        """
+        document = operation["document"]
+        if self._queue is None or len(document.get("content") or "") < self.min_chars:
+            return False
+        try:
+            self._queue.put_nowait((operation["index"], operation.get("routing"), operation["id"], document))
+        except asyncio.QueueFull:
+            DOCUMENT_SUMMARIES.labels(outcome="dropped").inc()
+            return False
+        return True
+
+    async def _summarize(self, text: str) -> str:
+        prompt = SUMMARY_PROMPT.format(max_words=self.max_words, text=text)
+        response = await generate_background(prompt, self.model)
+        return response["response"].strip()
+
+    async def summarize(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Summarize a text of any length.
+
+        Returns:
+            Tuple[str, List[str]]: The summary and, for texts longer than one
+                chunk, the summary of each chunk.
+        """
+        # One chunk at a time: summaries are background work and should not crowd out requests.
+        chunk_summaries = [await self._summarize(chunk) for chunk in chunk_text(text, self.chunk_chars)]
+        summaries = chunk_summaries
+        while len(summaries) > 1:
+            combined = [await self._summarize(part) for part in chunk_text("\n\n".join(summaries), self.chunk_chars)]
+            if len(combined) >= len(summaries):
+                # The model is not shortening its input; keep what we have.
+                break
+            summaries = combined
+        summary = "\n\n".join(summaries)
+        return summary, chunk_summaries if len(chunk_summaries) > 1 else []
+
+    async def _summarize_document(self, index_name: str, routing: Optional[str], doc_id: str, document: Dict[str, Any]):
+        summary, chunk_summaries = await self.summarize(document["content"])
+        fields = {
+            "summary": summary,
+            "chunk_summaries": chunk_summaries,
+            "summary_hash": document.get("content_hash") or content_hash(document),
+        }
+        try:
+            # Written directly rather than through the ingestion queue, which would schedule it again.
+            await get_retrieval_backend().update_document(index_name, doc_id, fields, routing=routing)
+        except DocumentNotFoundError:
+            DOCUMENT_SUMMARIES.labels(outcome="skipped").inc()
+            return
+        DOCUMENT_SUMMARIES.labels(outcome="summarized").inc()
+
+    async def _worker(self):
+        while True:
+            index_name, routing, doc_id, document = await self._queue.get()
+            try:
+                await self._summarize_document(index_name, routing, doc_id, document)
+            except Exception as e:
+                DOCUMENT_SUMMARIES.labels(outcome="failed").inc()
+                logger.warning(f"Could not summarize document {doc_id} in {index_name}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+# Create a single instance
+document_summarizer = DocumentSummarizer(
+    enabled=config["SUMMARIES_ENABLED"],
+    model=config["SUMMARY_MODEL"],
+    workers=config["SUMMARY_WORKERS"],
+    max_queue=config["SUMMARY_QUEUE_SIZE"],
+    min_chars=config["SUMMARY_MIN_CHARS"],
+    chunk_chars=config["SUMMARY_CHUNK_CHARS"],
+    max_words=config["SUMMARY_MAX_WORDS"]
+)
@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from ..backends import get_shared_backend
+from ..config.config_loader import config
+from ..telemetry.log_config import request_id_var
+from ..telemetry.metrics import UPLOAD_FILES
+from ..utils.cache import LRUCache
+from ..utils.content_hash import content_document_id, content_hash
+from .parsers import parse_file
+from .queue import IngestionJob, QueueFullError, ingestion_queue
+
+logger = logging.getLogger(__name__)
+
+_COPY_CHUNK = 1024 * 1024
+
+class UploadTooLargeError(Exception):
+    """Raised when an uploaded file exceeds the configured size limit."""
+
+class UploadJob:
+    """Progress of one upload: parsing of each file, then indexing of its documents."""
+
+    def __init__(self, files: List[Tuple[str, Optional[str]]], collection: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.collection = collection
+        self.files = [{"filename": name, "status": "queued", "documents": 0, "error": None} for name, _ in files]
+        self.ingestion_jobs: List[IngestionJob] = []
+        self.errors: List[str] = []
+        self.parsing_done = False
+        self.request_id = request_id_var.get()
+        self.created_at = time.time()
+        self.completed_at: Optional[float] = None
+
+    def file_parsed(self, index: int, documents: int):
+        self.files[index].update(status="parsed", documents=documents)
+        UPLOAD_FILES.labels(status="parsed").inc()
+
+    def file_failed(self, index: int, error: str):
+        self.files[index].update(status="failed", error=error)
+        self.errors.append(f"{self.files[index]['filename']}: {error}")
+        UPLOAD_FILES.labels(status="failed").inc()
+
+    @property
+    def status(self) -> str:
+        if not self.parsing_done:
+            return "parsing"
+        if self.completed_at is None:
+            return "indexing"
+        failed = self.errors or any(job.failed for job in self.ingestion_jobs)
+        return "failed" if failed else "done"
+
+    def to_dict(self) -> Dict[str, Any]:
+        documents = sum(f["documents"] for f in self.files)
+        parsed = sum(1 for f in self.files if f["status"] != "queued")
+        succeeded = sum(job.succeeded for job in self.ingestion_jobs)
+        skipped = sum(job.skipped for job in self.ingestion_jobs)
+        failed = sum(job.failed for job in self.ingestion_jobs)
+        # Every file is one unit of parsing work and every document one unit of indexing work.
+        work = len(self.files) + documents
+        return {
+            "upload_id": self.id,
+            "status": self.status,
+            "progress": round((parsed + succeeded + skipped + failed) / work, 4) if work else 1.0,
+            "collection": self.collection,
+            "files": self.files,
+            "documents": {"total": documents, "succeeded": succeeded, "skipped": skipped, "failed": failed},
+            "job_ids": [job.id for job in self.ingestion_jobs],
+            "errors": (self.errors + [error for job in self.ingestion_jobs for error in job.errors])[:20],
+            "request_id": self.request_id,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+        }
+
+class UploadProcessor:
+    """
+    Turn uploaded files into context documents.
+
+    Uploads are spooled to `spool_dir` and acknowledged right away. Text
+    extraction runs in a process pool, keeping PDF and HTML parsing off the
+    event loop, and the resulting documents are handed to the ingestion
+    queue in batches as files finish parsing. Job status is shared through
+    the shared backend like ingestion jobs.
+    """
+
+    def __init__(self, spool_dir: str, max_file_bytes: int, parse_workers: int, chunk_chars: int, batch_size: int, job_retention: int, job_ttl: float):
+        self.spool_dir = spool_dir
+        self.max_file_bytes = max_file_bytes
+        self.parse_workers = parse_workers
+        self.chunk_chars = chunk_chars
+        self.batch_size = batch_size
+        self.job_ttl = job_ttl
+        self.jobs = LRUCache(maxsize=job_retention)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks = set()
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned, not forked: the parent has running threads and open connections.
+            self._pool = ProcessPoolExecutor(self.parse_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _reset_pool(self, pool: Optional[ProcessPoolExecutor] = None):
+        """Shut the parser pool down; with `pool`, only if it is still the current one."""
+        if self._pool is None or (pool is not None and pool is not self._pool):
+            return
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+    async def stop(self):
+        """Abandon unfinished uploads and shut the parser processes down."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._reset_pool()
+
+    def _spool(self, source: BinaryIO, filename: str) -> str:
+        """Copy an upload to the spool directory, enforcing the size limit."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=self.spool_dir, suffix=Path(filename).suffix)
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as target:
+                while True:
+                    chunk = source.read(_COPY_CHUNK)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_file_bytes:
+                        raise UploadTooLargeError(f"{filename} exceeds the {self.max_file_bytes} byte upload limit")
+                    target.write(chunk)
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(path)
+            raise
+        return path
+
+    async def submit(self, files: List[Tuple[str, Optional[str], BinaryIO]], index_name: str, routing: Optional[str], collection: Optional[str]) -> UploadJob:
+        """
+        Spool files and start processing them in the background.
+
+        Args:
+            files (List[Tuple[str, Optional[str], BinaryIO]]): Filename,
+                content type and readable file object of each upload.
+            index_name (str): Index the documents are written to.
+            routing (Optional[str]): Routing key of the target collection.
+            collection (Optional[str]): Collection name, for reporting.
+
+        Returns:
+            UploadJob: The job tracking the upload.
+
+        Raises:
+            UploadTooLargeError: If a file exceeds the size limit; nothing is
+                kept in that case.
+        """
+        paths: List[str] = []
+        try:
+            for filename, _, source in files:
+                paths.append(await asyncio.to_thread(self._spool, source, filename))
+        except BaseException:
+            for path in paths:
+                with suppress(OSError):
+                    os.unlink(path)
+            raise
+
+        job = UploadJob([(filename, content_type) for filename, content_type, _ in files], collection)
+        self.jobs.set(job.id, job)
+        await self._share(job)
+        spooled = [(path, filename, content_type) for path, (filename, content_type, _) in zip(paths, files)]
+        task = asyncio.create_task(self._process(job, spooled, index_name, routing))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def get_job(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """Look up an upload's progress by ID, including uploads handled by other workers."""
+        job = self.jobs.get(upload_id)
+        if job is not None:
+            return job.to_dict()
+        return await get_shared_backend().get(f"upload_job:{upload_id}")
+
+    async def _share(self, job: UploadJob):
+        try:
+            await get_shared_backend().set(f"upload_job:{job.id}", job.to_dict(), ttl=self.job_ttl)
+        except Exception as e:
+            logger.warning(f"Could not share status of upload {job.id}: {str(e)}")
+
+    async def _parse(self, job: UploadJob, index: int, path: str, filename: str, content_type: Optional[str]) -> List[Dict[str, str]]:
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        try:
+            documents = await loop.run_in_executor(pool, parse_file, path, filename, content_type, self.chunk_chars)
+        except BrokenProcessPool:
+            # A parser process died (e.g. killed for memory); the pool is
+            # unusable from now on, so start a fresh one for later files.
+            self._reset_pool(pool)
+            job.file_failed(index, "Parser process terminated unexpectedly")
+            return []
+        except Exception as e:
+            job.file_failed(index, str(e) or type(e).__name__)
+            return []
+        finally:
+            with suppress(OSError):
+                os.unlink(path)
+        job.file_parsed(index, len(documents))
+        return documents
+
+    async def _enqueue(self, job: UploadJob, operations: List[Dict[str, Any]]):
+        """Hand a batch to the ingestion queue, waiting while it is full."""
+        deadline = time.monotonic() + config["INGEST_WAIT_TIMEOUT"]
+        while True:
+            try:
+                job.ingestion_jobs.append(await ingestion_queue.submit(operations))
+                return
+            except QueueFullError as e:
+                if time.monotonic() >= deadline:
+                    job.errors.append(f"{len(operations)} documents not indexed: {str(e)}")
+                    return
+                await asyncio.sleep(0.5)
+
+    async def _process(self, job: UploadJob, spooled: List[Tuple[str, str, Optional[str]]], index_name: str, routing: Optional[str]):
+        operations: List[Dict[str, Any]] = []
+        try:
+            parses = [self._parse(job, i, path, filename, content_type) for i, (path, filename, content_type) in enumerate(spooled)]
+            for parsed in asyncio.as_completed(parses):
+                for document in await parsed:
+                    # Content-derived IDs make re-uploading a file a no-op.
+                    operations.append({
+                        "action": "create",
+                        "index": index_name,
+                        "routing": routing,
+                        "id": content_document_id(document, routing),
+                        "document": {**document, "content_hash": content_hash(document)},
+                    })
+                while len(operations) >= self.batch_size:
+                    await self._enqueue(job, operations[:self.batch_size])
+                    operations = operations[self.batch_size:]
+            if operations:
+                await self._enqueue(job, operations)
+            job.parsing_done = True
+            await asyncio.gather(*(ingestion_job.wait() for ingestion_job in job.ingestion_jobs))
+        except asyncio.CancelledError:
+            job.errors.append("Upload processing was interrupted")
+            raise
+        except Exception as e:
+            logger.error(f"Upload {job.id} failed: {str(e)}", extra={"request_id": job.request_id})
+            job.errors.append(str(e))
+        finally:
+            for path, _, _ in spooled:
+                with suppress(OSError):
+                    os.unlink(path)
+            job.parsing_done = True
+            job.completed_at = time.time()
+            await self._share(job)
+        logger.info(f"Upload {job.id} finished: {len(spooled)} files, status {job.status}")
+
+# Create a single instance
+upload_processor = UploadProcessor(
+    spool_dir=config["UPLOAD_SPOOL_DIR"],
+    max_file_bytes=config["UPLOAD_MAX_FILE_BYTES"],
+    parse_workers=config["UPLOAD_PARSE_WORKERS"],
+    chunk_chars=config["UPLOAD_CHUNK_CHARS"],
+    batch_size=config["INGEST_BATCH_SIZE"],
+    job_retention=config["INGEST_JOB_RETENTION"],
+    job_ttl=config["INGEST_JOB_TTL"]
+)
@@ -1,15 +1,24 @@
 from github import Github, GithubException, Repository
 from ..config.config_loader import config
+from ..telemetry.metrics import track_integration
+from ..telemetry.startup import startup_report
+from ..telemetry.tracing import traced
+from ..utils.single_flight import SingleFlight, coalesced
+import asyncio
 import logging
 import base64
+from threading import Lock
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Dashboards polling the same repository share one in-flight fetch.
+_github_flights = SingleFlight("github")
+
 class GitHubIntegration:
     def __init__(self):
-        self.client = Github(config["GITHUB_ACCESS_TOKEN"])
+        self.client = Github(config["GITHUB_ACCESS_TOKEN"], base_url=config["GITHUB_API_URL"])
         logger.info("GitHub client initialized")
 
     def _format_repository_details(self, repo: Repository.Repository) -> Dict[str, Any]:
@@ -75,6 +84,9 @@ class GitHubIntegration:
             }
         }
 
+    @coalesced(_github_flights)
+    @traced("github.get_repository", record_args=("repo_name",))
+    @track_integration("github", "get_repository")
     async def get_repository(self, repo_name: str) -> Dict[str, Any]:
         """
         Get comprehensive repository information.
@@ -89,6 +101,10 @@ class GitHubIntegration:
         Raises:
             GithubException: If repository access fails or not found
         """
+        # PyGithub is synchronous; run it off the event loop.
+        return await asyncio.to_thread(self._get_repository, repo_name)
+
+    def _get_repository(self, repo_name: str) -> Dict[str, Any]:
         try:
             repo = self.client.get_repo(repo_name)
             response = self._format_repository_details(repo)
@@ -113,6 +129,9 @@ class GitHubIntegration:
             logger.error(f"Error fetching repository {repo_name}: {str(e)}")
             raise
 
+    @coalesced(_github_flights)
+    @traced("github.list_files", record_args=("repo_name", "path"))
+    @track_integration("github", "list_files")
     async def list_files(self, repo_name: str, path: str = "", ref: str = None) -> Dict[str, Any]:
         """
         List files and directories in a repository path with enhanced metadata.
@@ -125,6 +144,10 @@ class GitHubIntegration:
         Returns:
             Dict[str, Any]: Directory contents with metadata and structure information
         """
+        # PyGithub is synchronous; run it off the event loop.
+        return await asyncio.to_thread(self._list_files, repo_name, path, ref)
+
+    def _list_files(self, repo_name: str, path: str = "", ref: str = None) -> Dict[str, Any]:
         try:
             repo = self.client.get_repo(repo_name)
             contents = repo.get_contents(path, ref=ref)
@@ -166,6 +189,9 @@ class GitHubIntegration:
             logger.error(f"Error listing files for {repo_name}: {str(e)}")
             raise
 
+    @coalesced(_github_flights)
+    @traced("github.read_file", record_args=("repo_name", "file_path"))
+    @track_integration("github", "read_file")
     async def read_file(self, repo_name: str, file_path: str, ref: str = None) -> Dict[str, Any]:
         """
         Read file contents with enhanced metadata and content analysis.
@@ -178,6 +204,10 @@ class GitHubIntegration:
         Returns:
             Dict[str, Any]: File contents and metadata
         """
+        # PyGithub is synchronous; run it off the event loop.
+        return await asyncio.to_thread(self._read_file, repo_name, file_path, ref)
+
+    def _read_file(self, repo_name: str, file_path: str, ref: str = None) -> Dict[str, Any]:
         try:
             repo = self.client.get_repo(repo_name)
             content = repo.get_contents(file_path, ref=ref)
@@ -229,6 +259,9 @@ class GitHubIntegration:
             logger.error(f"Error reading file {file_path} from {repo_name}: {str(e)}")
             raise
 
+    @coalesced(_github_flights)
+    @traced("github.search_code", record_args=("repo_name",))
+    @track_integration("github", "search_code")
     async def search_code(self, query: str, repo_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Enhanced code search with detailed results and metadata.
@@ -240,6 +273,10 @@ class GitHubIntegration:
         Returns:
             Dict[str, Any]: Search results with metadata and statistics
         """
+        # PyGithub is synchronous; run it off the event loop.
+        return await asyncio.to_thread(self._search_code, query, repo_name)
+
+    def _search_code(self, query: str, repo_name: Optional[str] = None) -> Dict[str, Any]:
         try:
             if repo_name:
                 query = f"{query} repo:{repo_name}"
@@ -296,5 +333,75 @@ class GitHubIntegration:
             logger.error(f"Error searching code: {str(e)}")
             raise
 
-# Create a single instance
-github_integration = GitHubIntegration()
\ No newline at end of file
+    @traced("github.compare", record_args=("repo_name",))
+    @track_integration("github", "compare")
+    async def compare_commits(self, repo_name: str, base: str, head: str) -> Dict[str, Any]:
+        """
+        Compare two commits.
+
+        Args:
+            repo_name (str): Repository name in format 'owner/repo'
+            base (str): Commit SHA before the change
+            head (str): Commit SHA after the change
+
+        Returns:
+            Dict[str, Any]: `status` of head relative to base ("ahead",
+                "behind", "identical" or "diverged") and `files`, with the
+                `path`, `status` ("added", "modified", "removed", "renamed",
+                ...) and `previous_path` of each changed file.
+        """
+        # PyGithub is synchronous; run it off the event loop.
+        return await asyncio.to_thread(self._compare_commits, repo_name, base, head)
+
+    def _compare_commits(self, repo_name: str, base: str, head: str) -> Dict[str, Any]:
+        try:
+            comparison = self.client.get_repo(repo_name, lazy=True).compare(base, head)
+            return {
+                "status": comparison.status,
+                "files": [
+                    {"path": f.filename, "status": f.status, "previous_path": f.previous_filename}
+                    for f in comparison.files
+                ],
+            }
+        except GithubException as e:
+            logger.error(f"Error comparing {base}...{head} in {repo_name}: {str(e)}")
+            raise
+
+    @traced("github.read_text", record_args=("repo_name", "file_path"))
+    @track_integration("github", "read_text")
+    async def read_text(self, repo_name: str, file_path: str, ref: str, max_bytes: int) -> Optional[str]:
+        """
+        Read a file as text in a single API call.
+
+        Unlike `read_file` no metadata or history is fetched. Returns None for
+        files that are missing, larger than `max_bytes` or not UTF-8 text.
+        """
+        # PyGithub is synchronous; run it off the event loop.
+        return await asyncio.to_thread(self._read_text, repo_name, file_path, ref, max_bytes)
+
+    def _read_text(self, repo_name: str, file_path: str, ref: str, max_bytes: int) -> Optional[str]:
+        try:
+            content = self.client.get_repo(repo_name, lazy=True).get_contents(file_path, ref=ref)
+        except GithubException as e:
+            if e.status == 404:
+                return None
+            logger.error(f"Error reading {file_path} from {repo_name}: {str(e)}")
+            raise
+        if isinstance(content, list) or content.size > max_bytes:
+            return None
+        try:
+            return content.decoded_content.decode("utf-8")
+        except (UnicodeDecodeError, AssertionError):
+            return None
+
+_github_integration: Optional[GitHubIntegration] = None
+_github_lock = Lock()
+
+def get_github_integration() -> GitHubIntegration:
+    """Return the shared GitHubIntegration, creating it on first use."""
+    global _github_integration
+    with _github_lock:
+        if _github_integration is None:
+            with startup_report.measure("integrations.github", "lazy_init"):
+                _github_integration = GitHubIntegration()
+    return _github_integration
@@ -0,0 +1,224 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from ..backends import get_shared_backend
+from ..config.config_loader import config
+from ..ingestion.queue import QueueFullError, ingestion_queue
+from ..telemetry.metrics import GITHUB_SYNC_FILES
+from ..utils.collection_router import resolve_collection
+from ..utils.content_hash import GITHUB_SOURCE_PREFIX, content_hash
+from .github_integration import get_github_integration
+
+logger = logging.getLogger(__name__)
+
+# `before` of a push that created the branch.
+_NULL_SHA = "0" * 40
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check a webhook's X-Hub-Signature-256 header against the raw body."""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+def github_document_id(repo_name: str, path: str) -> str:
+    """
+    Stable document ID for a repository file.
+
+    Unlike uploaded context, synced files are identified by path rather than
+    content, so a modified file replaces its previous version.
+    """
+    return hashlib.sha1(f"github:{repo_name}:{path}".encode("utf-8")).hexdigest()
+
+def changes_from_commits(commits: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Net effect of a push's commit list: path -> "modified" or "removed"."""
+    changes: Dict[str, str] = {}
+    for commit in commits:
+        for path in commit.get("added", []) + commit.get("modified", []):
+            changes[path] = "modified"
+        for path in commit.get("removed", []):
+            changes[path] = "removed"
+    return changes
+
+class GitHubSync:
+    """
+    Keep repository files in the context index current from push webhooks.
+
+    Accepted pushes are queued and applied by a single task per process.
+    Across worker processes, pushes to one repository are serialized by a
+    lock in the shared backend, and each is synced from the last commit
+    applied to that repository rather than from its own `before`: a push
+    that arrives after a newer one is skipped, and the changes of a push that
+    was lost are picked up by the next. Each push costs one compare call to
+    find the changed paths plus one call per added or modified file; removed
+    files are deleted from the index without calling GitHub at all.
+    """
+
+    def __init__(self, collection: Optional[str], max_file_bytes: int, max_queue: int):
+        self.collection = collection
+        self.max_file_bytes = max_file_bytes
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.stats: Dict[str, Any] = {"pushes": 0, "indexed": 0, "deleted": 0, "skipped": 0, "failed": 0, "stale": 0, "errors": 0, "repositories": {}}
+
+    async def start(self):
+        """Start the worker; called from the integrations router's startup hook."""
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    def enqueue(self, payload: Dict[str, Any]) -> bool:
+        """
+        Queue a push event for syncing.
+
+        Returns:
+            bool: False if the push does not update a default branch and was ignored.
+
+        Raises:
+            QueueFullError: If the worker is not running or is too far behind.
+        """
+        repository = payload.get("repository") or {}
+        default_ref = f"refs/heads/{repository.get('default_branch')}"
+        if payload.get("ref") != default_ref or payload.get("deleted") or not payload.get("after"):
+            return False
+        if self._queue is None:
+            raise QueueFullError("GitHub sync is not running")
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            raise QueueFullError("GitHub sync queue is full, redeliver later")
+        return True
+
+    async def _run(self):
+        while True:
+            payload = await self._queue.get()
+            try:
+                await self.sync_push(payload)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"GitHub sync of {payload['repository'].get('full_name')} at {payload['after']} failed: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _changed_paths(self, repo_name: str, base: Optional[str], payload: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """
+        path -> "modified" or "removed" for everything changed since `base`,
+        or None if `base` already includes the push.
+        """
+        after = payload["after"]
+        if base == after:
+            return None
+        if base and base != _NULL_SHA:
+            try:
+                comparison = await get_github_integration().compare_commits(repo_name, base, after)
+                if comparison["status"] in ("behind", "identical"):
+                    return None
+                changes: Dict[str, str] = {}
+                for f in comparison["files"]:
+                    if f["status"] == "renamed" and f["previous_path"]:
+                        changes[f["previous_path"]] = "removed"
+                    changes[f["path"]] = "removed" if f["status"] == "removed" else "modified"
+                return changes
+            except Exception as e:
+                logger.warning(f"Compare failed for {repo_name}, using the push's commit list: {str(e)}")
+        return changes_from_commits(payload.get("commits", []))
+
+    async def _submit(self, operations: List[Dict[str, Any]]):
+        """Hand operations to the ingestion queue, waiting while it is full."""
+        deadline = time.monotonic() + config["INGEST_WAIT_TIMEOUT"]
+        while True:
+            try:
+                return await ingestion_queue.submit(operations)
+            except QueueFullError:
+                if time.monotonic() >= deadline:
+                    raise
+                await asyncio.sleep(0.5)
+
+    async def sync_push(self, payload: Dict[str, Any]) -> Dict[str, int]:
+        """Re-index the files changed by one push; returns per-outcome counts."""
+        repo_name = payload["repository"]["full_name"]
+        backend = get_shared_backend()
+        async with backend.lock(f"github_sync:{repo_name}"):
+            last_commit = await backend.get(f"github_sync_commit:{repo_name}")
+            counts = await self._apply_push(repo_name, last_commit or payload.get("before"), payload)
+            if counts is not None and not counts["failed"]:
+                # Only once everything is indexed: a failed push is retried by the next one.
+                await backend.set(f"github_sync_commit:{repo_name}", payload["after"])
+        if counts is None:
+            self.stats["stale"] += 1
+            logger.info(f"Skipped push to {repo_name} at {payload['after'][:12]}: a newer commit is already synced")
+            return {}
+
+        for outcome, count in counts.items():
+            GITHUB_SYNC_FILES.labels(outcome=outcome).inc(count)
+            self.stats[outcome] += count
+        self.stats["pushes"] += 1
+        self.stats["repositories"][repo_name] = {"commit": payload["after"], "synced_at": time.time(), **counts}
+        logger.info(f"Synced {repo_name} at {payload['after'][:12]}: {counts}")
+        return counts
+
+    async def _apply_push(self, repo_name: str, base: Optional[str], payload: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        after = payload["after"]
+        target = resolve_collection(self.collection)
+        changes = await self._changed_paths(repo_name, base, payload)
+        if changes is None:
+            return None
+
+        removed = [path for path, change in changes.items() if change == "removed"]
+        modified = [path for path, change in changes.items() if change == "modified"]
+        texts = await asyncio.gather(*(
+            get_github_integration().read_text(repo_name, path, after, self.max_file_bytes) for path in modified
+        ))
+
+        operations = []
+        for path, text in zip(modified, texts):
+            if text is None:
+                # Binary, too large or gone again: drop any earlier version.
+                removed.append(path)
+                continue
+            document = {"title": f"{repo_name}/{path}", "content": text, "source": f"{GITHUB_SOURCE_PREFIX}{repo_name}"}
+            operations.append({
+                "action": "index",
+                "index": target.index,
+                "routing": target.routing,
+                "id": github_document_id(repo_name, path),
+                "document": {**document, "content_hash": content_hash(document)},
+            })
+
+        # Deletions go in the same job so they are applied in order with the
+        # index operations and count towards the same outcome.
+        operations += [
+            {"action": "delete", "index": target.index, "routing": target.routing, "id": github_document_id(repo_name, path)}
+            for path in removed
+        ]
+
+        counts = {"indexed": 0, "deleted": 0, "skipped": 0, "failed": 0}
+        if operations:
+            job = await self._submit(operations)
+            await job.wait()
+            for operation in operations:
+                if job.outcomes.get(operation["id"]) == "ok":
+                    counts["deleted" if operation["action"] == "delete" else "indexed"] += 1
+            counts["skipped"] = job.skipped
+            counts["failed"] = job.failed
+        return counts
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "queued": self._queue.qsize() if self._queue else 0}
+
+# Create a single instance
+github_sync = GitHubSync(
+    collection=config["GITHUB_SYNC_COLLECTION"],
+    max_file_bytes=config["GITHUB_SYNC_MAX_FILE_BYTES"],
+    max_queue=config["GITHUB_SYNC_QUEUE_SIZE"]
+)
@@ -1,11 +1,24 @@
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from .slack_integration import slack_integration
-from .github_integration import github_integration
+from .slack_integration import get_slack_integration
+from .github_integration import get_github_integration
+from .github_sync import github_sync, verify_signature
+from ..backends import get_shared_backend
+from ..config.config_loader import config
+from ..ingestion.queue import QueueFullError
+from ..utils.responses import FastJSONResponse
 from typing import Optional
 
 router = APIRouter()
 
+@router.on_event("startup")
+async def start_github_sync():
+    await github_sync.start()
+
+@router.on_event("shutdown")
+async def stop_github_sync():
+    await github_sync.stop()
+
 class ChannelRequest(BaseModel):
     channel_id: str
 
@@ -34,7 +47,7 @@ async def read_channel(request: ChannelRequest):
         dict: Contains the messages from the channel
     """
     try:
-        messages = await slack_integration.read_channel_messages(request.channel_id)
+        messages = await get_slack_integration().read_channel_messages(request.channel_id)
         return {"messages": messages}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading Slack channel: {str(e)}")
@@ -42,13 +55,13 @@ async def read_channel(request: ChannelRequest):
 @router.post("/slack/events")
 async def slack_events(request: Request):
     """Handle incoming Slack events."""
-    return await slack_integration.handler.handle(request)
+    return await get_slack_integration().handler.handle(request)
 
 @router.post("/github/repository")
 async def get_repository(request: RepositoryRequest):
     """Get repository information."""
     try:
-        return await github_integration.get_repository(request.repo_name)
+        return await get_github_integration().get_repository(request.repo_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching repository: {str(e)}")
 
@@ -56,7 +69,7 @@ async def get_repository(request: RepositoryRequest):
 async def list_files(request: RepositoryRequest):
     """List files in a repository."""
     try:
-        return await github_integration.list_files(request.repo_name, ref=request.ref)
+        return await get_github_integration().list_files(request.repo_name, ref=request.ref)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing files: {str(e)}")
 
@@ -64,7 +77,7 @@ async def list_files(request: RepositoryRequest):
 async def read_file(request: FileRequest):
     """Read file contents from a repository."""
     try:
-        return await github_integration.read_file(request.repo_name, request.file_path, ref=request.ref)
+        return await get_github_integration().read_file(request.repo_name, request.file_path, ref=request.ref)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
 
@@ -72,6 +85,49 @@ async def read_file(request: FileRequest):
 async def search_code(request: SearchRequest):
     """Search for code in repositories."""
     try:
-        return await github_integration.search_code(request.query, request.repo_name)
+        return FastJSONResponse(await get_github_integration().search_code(request.query, request.repo_name))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error searching code: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error searching code: {str(e)}")
+
+@router.post("/github/webhook", status_code=202)
+async def github_webhook(request: Request):
+    """
+    Receive GitHub webhooks and queue pushes to the default branch for
+    incremental re-indexing.
+
+    Deliveries must be signed with GITHUB_WEBHOOK_SECRET; redeliveries of an
+    already accepted delivery are acknowledged without syncing again.
+    """
+    if not config["GITHUB_WEBHOOK_SECRET"]:
+        raise HTTPException(status_code=503, detail="GitHub webhook secret is not configured")
+    body = await request.body()
+    if not verify_signature(config["GITHUB_WEBHOOK_SECRET"], body, request.headers.get("x-hub-signature-256")):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    event = request.headers.get("x-github-event")
+    if event == "ping":
+        return {"message": "pong"}
+    if event != "push":
+        return {"message": f"Ignored '{event}' event"}
+
+    delivery = request.headers.get("x-github-delivery")
+    backend = get_shared_backend()
+    # Claimed before queueing, so concurrent redeliveries sync only once.
+    claim = f"github_delivery:{delivery}" if delivery else None
+    if claim and not await backend.add(claim, True, ttl=86400):
+        return {"message": "Delivery already accepted"}
+    try:
+        queued = github_sync.enqueue(await request.json())
+    except Exception as e:
+        # Not queued: release the claim so GitHub's redelivery is accepted.
+        if claim:
+            await backend.delete(claim)
+        if isinstance(e, QueueFullError):
+            raise HTTPException(status_code=503, detail=str(e))
+        raise
+    return {"message": "Push queued for sync" if queued else "Ignored push outside the default branch"}
+
+@router.get("/github/sync/stats")
+async def github_sync_stats():
+    """Pushes synced and files indexed or deleted since startup, per worker."""
+    return github_sync.get_stats()
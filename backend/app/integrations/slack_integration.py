@@ -1,7 +1,11 @@
 from ..config.config_loader import config
+from ..telemetry.metrics import track_integration
+from ..telemetry.startup import startup_report
+from ..telemetry.tracing import traced
+import asyncio
 import logging
-from slack_bolt import App
-from slack_bolt.adapter.fastapi import SlackRequestHandler
+from threading import Lock
+from typing import Optional
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
@@ -10,11 +14,15 @@ logger = logging.getLogger(__name__)
 
 class SlackIntegration:
     def __init__(self):
+        # Bolt is only needed once the integration is used.
+        from slack_bolt import App
+        from slack_bolt.adapter.fastapi import SlackRequestHandler
+
+        self.client = WebClient(token=config["SLACK_BOT_TOKEN"], base_url=config["SLACK_API_URL"])
         self.app = App(
-            token=config["SLACK_BOT_TOKEN"],
+            client=self.client,
             signing_secret=config["SLACK_SIGNING_SECRET"]
         )
-        self.client = WebClient(token=config["SLACK_BOT_TOKEN"])
         self.handler = SlackRequestHandler(self.app)
         
         # Set up event handlers
@@ -26,6 +34,8 @@ class SlackIntegration:
             logger.info(body)
             await say("Hello from your app!")
     
+    @traced("slack.read_channel_messages", record_args=("channel_id",))
+    @track_integration("slack", "read_channel_messages")
     async def read_channel_messages(self, channel_id: str):
         """
         Read messages from a specified Slack channel.
@@ -37,12 +47,27 @@ class SlackIntegration:
             list: A list of messages from the channel
         """
         try:
-            response = self.client.conversations_history(channel=channel_id)
+            # WebClient is synchronous; keep its HTTP call off the event loop.
+            response = await asyncio.to_thread(self.client.conversations_history, channel=channel_id)
             messages = response['messages']
             return messages
         except SlackApiError as e:
             logger.error(f"Error fetching conversations: {e.response['error']}")
             raise
 
-# Create a single instance of SlackIntegration
-slack_integration = SlackIntegration()
\ No newline at end of file
+_slack_integration: Optional[SlackIntegration] = None
+_slack_lock = Lock()
+
+def get_slack_integration() -> SlackIntegration:
+    """
+    Return the shared SlackIntegration, creating it on first use.
+
+    Creating the Bolt app verifies the bot token with a network call, so it
+    is deferred until a Slack endpoint is actually called.
+    """
+    global _slack_integration
+    with _slack_lock:
+        if _slack_integration is None:
+            with startup_report.measure("integrations.slack", "lazy_init"):
+                _slack_integration = SlackIntegration()
+    return _slack_integration
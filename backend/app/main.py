@@ -1,20 +1,43 @@
+import time
+_import_start = time.perf_counter()
+
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from .health.router import router as health_router
-from .context.router import router as context_router
-from .search.router import router as search_router
-from .rag.router import router as rag_router
-from .generate.router import router as generate_router
-from .agents.router import router as agent_router
-from .integrations.router import router as integration_router
+from .telemetry.startup import startup_report
+from .telemetry.log_config import setup_logging
+from .telemetry.middleware import PrometheusMiddleware, RequestIdMiddleware
+from .telemetry.tracing import setup_tracing
+from .backends import get_shared_backend, share_index_generations
+from .ingestion.queue import ingestion_queue
+from .ingestion.summaries import document_summarizer
+from .ingestion.uploads import upload_processor
+from .quotas.accounting import usage_accountant
+from .quotas.middleware import QuotaMiddleware, api_clients
+from .retrieval import get_retrieval_backend
+from .config.config_loader import config
+from .utils.body_limit import BodySizeLimitMiddleware
+from .utils.compression import CompressionMiddleware
+from .utils.ollama_utils import close_http_client, preload_models
+from .utils.responses import FastJSONResponse
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI-Enabled Agent Platform")
+app = FastAPI(title="AI-Enabled Agent Platform", default_response_class=FastJSONResponse)
+
+# Added first so CORS, request ID and metrics middleware all wrap it: its
+# 401/429 responses get CORS headers and are logged and counted.
+if config["QUOTAS_ENABLED"]:
+    if config["SHARED_BACKEND"] == "memory":
+        logger.warning(
+            "Quotas are kept per process with SHARED_BACKEND=memory; with several workers "
+            "each enforces its own limits. Use SHARED_BACKEND=postgres to share them."
+        )
+    app.add_middleware(QuotaMiddleware, clients=api_clients, paths=config["QUOTA_PATHS"], accountant=usage_accountant)
 
 # Configure CORS
 app.add_middleware(
@@ -23,20 +46,83 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the frontend read how long to back off after a 429.
+    expose_headers=["Retry-After"],
 )
+if config["COMPRESSION_ENABLED"]:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=config["COMPRESSION_MINIMUM_SIZE"],
+        gzip_level=config["COMPRESSION_GZIP_LEVEL"],
+        brotli_quality=config["COMPRESSION_BROTLI_QUALITY"],
+    )
+# Uploads are read in full before the route runs; cap them before that.
+app.add_middleware(BodySizeLimitMiddleware, limits={"/api/context/upload": config["UPLOAD_MAX_REQUEST_BYTES"]})
+app.add_middleware(PrometheusMiddleware)
+app.add_middleware(RequestIdMiddleware)
+with startup_report.measure("tracing"):
+    setup_tracing(app)
+
+@app.on_event("startup")
+async def start_background_workers():
+    backend = get_shared_backend()
+    with startup_report.measure(f"shared_backend.{backend.name}"):
+        await backend.start()
+        await share_index_generations(backend)
+    retrieval = get_retrieval_backend()
+    with startup_report.measure(f"retrieval_backend.{retrieval.name}"):
+        await retrieval.start()
+    with startup_report.measure("ingestion_queue"):
+        await ingestion_queue.start()
+        await document_summarizer.start()
+    with startup_report.measure("usage_accountant"):
+        await usage_accountant.start()
+    # Load models in the background so startup is not blocked by Ollama;
+    # requests arriving earlier still warm their model alongside retrieval.
+    if config["OLLAMA_PRELOAD_MODELS"]:
+        app.state.preload_task = asyncio.create_task(preload_models(config["OLLAMA_PRELOAD_MODELS"]))
+    startup_report.log()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await upload_processor.stop()
+    await ingestion_queue.stop()
+    await document_summarizer.stop()
+    await get_retrieval_backend().stop()
+    await usage_accountant.stop()
+    await close_http_client()
+    await get_shared_backend().stop()
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to the AI-Enabled Agent Platform"}
 
+# name -> (module, prefix, tags); ENABLED_ROUTERS selects which are mounted,
+# and disabled routers are never imported.
+ROUTERS = {
+    "health": ("app.health.router", "/health", ["health"]),
+    "context": ("app.context.router", "/api/context", ["context"]),
+    "search": ("app.search.router", "/api/search", ["search"]),
+    "rag": ("app.rag.router", "/api/rag", ["rag"]),
+    "generate": ("app.generate.router", "/api/generate", ["generate"]),
+    "agent": ("app.agents.router", "/api/agent", ["agent"]),
+    "integrations": ("app.integrations.router", "/api/integrations", ["integrations"]),
+    "usage": ("app.quotas.router", "/api/usage", ["usage"]),
+    "metrics": ("app.telemetry.router", "", ["metrics"]),
+}
+
 # Include routers
-app.include_router(health_router, prefix="/health", tags=["health"])
-app.include_router(context_router, prefix="/api/context", tags=["context"])
-app.include_router(search_router, prefix="/api/search", tags=["search"])
-app.include_router(rag_router, prefix="/api/rag", tags=["rag"])
-app.include_router(generate_router, prefix="/api/generate", tags=["generate"])
-app.include_router(agent_router, prefix="/api/agent", tags=["agent"])
-app.include_router(integration_router, prefix="/api/integrations", tags=["integrations"])
+for name in config["ENABLED_ROUTERS"] or list(ROUTERS):
+    if name not in ROUTERS:
+        logger.warning(f"Unknown router '{name}' in ENABLED_ROUTERS, skipping")
+        continue
+    module_name, prefix, tags = ROUTERS[name]
+    app.include_router(startup_report.import_module(module_name).router, prefix=prefix, tags=tags)
+
+@app.get("/startup")
+async def startup_report_route():
+    """Import and initialization cost per module, including lazy first-use initialization."""
+    return startup_report.to_dict()
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -46,6 +132,9 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"message": "An unexpected error occurred. Please try again later."},
     )
 
+startup_report.record("app.main", "import", time.perf_counter() - _import_start)
+
 if __name__ == "__main__":
+    # Development server; use `python -m app.server` to run several workers.
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("app.main:app", host=config["HOST"], port=config["PORT"], reload=config["DEBUG"])
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from ..config.config_loader import config
+from ..telemetry.metrics import CLIENT_TOKENS, TokenUsage
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS client_token_usage (
+    client TEXT NOT NULL,
+    day DATE NOT NULL,
+    model TEXT NOT NULL,
+    requests BIGINT NOT NULL DEFAULT 0,
+    prompt_tokens BIGINT NOT NULL DEFAULT 0,
+    completion_tokens BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (client, day, model)
+);
+"""
+
+UPSERT_USAGE = """
+INSERT INTO client_token_usage AS u (client, day, model, requests, prompt_tokens, completion_tokens)
+VALUES ($1, $2, $3, $4, $5, $6)
+ON CONFLICT (client, day, model) DO UPDATE SET
+    requests = u.requests + EXCLUDED.requests,
+    prompt_tokens = u.prompt_tokens + EXCLUDED.prompt_tokens,
+    completion_tokens = u.completion_tokens + EXCLUDED.completion_tokens
+"""
+
+# (client, day, model) -> [requests, prompt tokens, completion tokens]
+UsageCounts = Dict[Tuple[str, date, str], List[int]]
+
+class UsageAccountant:
+    """
+    Per-client LLM token accounting, persisted to Postgres in batches.
+
+    Usage is summed in memory per (client, day, model) and written every
+    `flush_interval` seconds with one multi-row upsert, so accounting adds
+    no database round trip to requests. A failed flush keeps its counts for
+    the next attempt. Without a database (`dsn` None) usage is only kept in
+    memory for the current process.
+    """
+
+    def __init__(self, dsn: Optional[str], flush_interval: float):
+        self.dsn = dsn
+        self.flush_interval = flush_interval
+        self._pending: UsageCounts = {}
+        self._pool = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.dsn is None or self._flusher is not None:
+            return
+        import asyncpg
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=2)
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("SELECT pg_advisory_xact_lock(hashtext('client_token_usage_schema'))")
+                await conn.execute(SCHEMA)
+        self._flusher = asyncio.create_task(self._flush_periodically())
+        logger.info("Token accounting started")
+
+    async def stop(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        if self._pool is not None:
+            await self.flush()
+            await self._pool.close()
+            self._pool = None
+
+    def record(self, client: str, usage: TokenUsage):
+        """Add one request's token usage to the pending counts."""
+        today = datetime.now(timezone.utc).date()
+        for model, (prompt_tokens, completion_tokens) in usage.models.items():
+            counts = self._pending.setdefault((client, today, model), [0, 0, 0])
+            counts[0] += 1
+            counts[1] += prompt_tokens
+            counts[2] += completion_tokens
+            CLIENT_TOKENS.labels(client=client, kind="prompt").inc(prompt_tokens)
+            CLIENT_TOKENS.labels(client=client, kind="completion").inc(completion_tokens)
+
+    async def flush(self):
+        """Write the pending counts in one batch."""
+        if not self._pending or self._pool is None:
+            return
+        batch, self._pending = self._pending, {}
+        rows = [(client, day, model, *counts) for (client, day, model), counts in batch.items()]
+        try:
+            await self._pool.executemany(UPSERT_USAGE, rows)
+        except Exception as e:
+            logger.warning(f"Could not write token usage ({len(rows)} rows), will retry: {str(e)}")
+            for key, counts in batch.items():
+                pending = self._pending.setdefault(key, [0, 0, 0])
+                for i, value in enumerate(counts):
+                    pending[i] += value
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def get_usage(self, client: str, days: int = 30) -> List[Dict[str, Any]]:
+        """Daily usage per model for a client, including counts not yet written."""
+        totals: Dict[Tuple[date, str], List[int]] = {}
+        if self._pool is not None:
+            rows = await self._pool.fetch(
+                "SELECT day, model, requests, prompt_tokens, completion_tokens FROM client_token_usage"
+                " WHERE client = $1 AND day > CURRENT_DATE - $2::int",
+                client, days
+            )
+            for row in rows:
+                totals[(row["day"], row["model"])] = [row["requests"], row["prompt_tokens"], row["completion_tokens"]]
+        for (pending_client, day, model), counts in self._pending.items():
+            if pending_client == client:
+                total = totals.setdefault((day, model), [0, 0, 0])
+                for i, value in enumerate(counts):
+                    total[i] += value
+        return [
+            {"day": day.isoformat(), "model": model, "requests": requests, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+            for (day, model), (requests, prompt_tokens, completion_tokens) in sorted(totals.items(), reverse=True)
+        ]
+
+# Create a single instance
+usage_accountant = UsageAccountant(
+    dsn=config["DATABASE_URL"] if config["TOKEN_ACCOUNTING_PERSIST"] else None,
+    flush_interval=config["TOKEN_ACCOUNTING_FLUSH_INTERVAL"]
+)
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..backends import get_shared_backend
+from ..config.config_loader import config
+from ..telemetry.metrics import QUOTA_DECISIONS, TokenUsage, token_usage_var
+from .accounting import UsageAccountant
+
+logger = logging.getLogger(__name__)
+
+class ClientQuota(NamedTuple):
+    """An API client and its token bucket limits (refill per second, burst capacity)."""
+    name: str
+    requests_per_second: float
+    request_burst: float
+    tokens_per_second: float
+    token_burst: float
+
+def hash_api_key(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def parse_api_keys(spec: List[str], requests_per_minute: float, request_burst: float, tokens_per_minute: float, token_burst: float) -> Dict[str, ClientQuota]:
+    """
+    Build the key hash -> client map from API_KEYS entries.
+
+    Entries are "client:key", or "client:key:tokens_per_minute" to give a
+    client its own token rate (its burst scales with it).
+    """
+    clients = {}
+    for position, entry in enumerate(spec, 1):
+        parts = entry.split(":")
+        if len(parts) not in (2, 3) or not parts[0] or not parts[1]:
+            # Never log the entry itself: it may be nothing but a key.
+            logger.warning("Ignoring malformed API_KEYS entry #%d", position)
+            continue
+        client_tokens_per_minute = float(parts[2]) if len(parts) == 3 else tokens_per_minute
+        scale = client_tokens_per_minute / tokens_per_minute if tokens_per_minute else 1.0
+        clients[hash_api_key(parts[1])] = ClientQuota(
+            parts[0], requests_per_minute / 60, request_burst, client_tokens_per_minute / 60, token_burst * scale
+        )
+    return clients
+
+def identify_client(headers: Headers, clients: Dict[str, ClientQuota]) -> Optional[ClientQuota]:
+    """The client whose key is in X-API-Key or `Authorization: Bearer`, if any."""
+    key = headers.get("x-api-key")
+    if not key:
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        key = credentials.strip() if scheme.lower() == "bearer" else None
+    return clients.get(hash_api_key(key)) if key else None
+
+class QuotaMiddleware:
+    """
+    Identify API clients on LLM endpoints and enforce their quotas.
+
+    POST requests to `paths` (the calls that reach a model; stats and
+    session endpoints are left alone) must carry a configured key in
+    X-API-Key (or `Authorization: Bearer`). Before the request reaches the
+    model, one token is taken from the client's request bucket and an estimate of the
+    prompt's tokens from its LLM-token bucket; either being empty answers
+    429 with Retry-After. Once the response is complete the tokens Ollama
+    reported beyond the estimate are charged too (down to an empty bucket)
+    and recorded for accounting. Buckets live in the shared backend: with
+    SHARED_BACKEND=postgres the limits hold across workers, while the
+    in-process memory backend gives every worker its own buckets.
+    """
+
+    def __init__(self, app: ASGIApp, clients: Dict[str, ClientQuota], paths: List[str], accountant: UsageAccountant):
+        self.app = app
+        self.clients = clients
+        self.paths = tuple(paths)
+        self.accountant = accountant
+
+    @staticmethod
+    async def _reject(send: Send, status: int, detail: str, retry_after: Optional[float] = None):
+        headers = [(b"content-type", b"application/json")]
+        if retry_after is not None:
+            headers.append((b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": json.dumps({"detail": detail}).encode("utf-8")})
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> Tuple[bytes, Receive]:
+        """Read the request body and return a `receive` that replays it."""
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+        return body, replay
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        client = identify_client(Headers(scope=scope), self.clients)
+        if client is None:
+            QUOTA_DECISIONS.labels(client="unknown", result="unauthorized").inc()
+            await self._reject(send, 401, "A valid API key is required (X-API-Key header)")
+            return
+
+        backend = get_shared_backend()
+        allowed, _ = await backend.consume_tokens(f"quota:requests:{client.name}", client.request_burst, client.requests_per_second)
+        if not allowed:
+            QUOTA_DECISIONS.labels(client=client.name, result="request_limited").inc()
+            await self._reject(send, 429, "Request rate limit exceeded", 1 / client.requests_per_second if client.requests_per_second else None)
+            return
+
+        body, receive = await self._read_body(receive)
+        # About four bytes per token; the JSON envelope keeps this on the high side.
+        estimate = min(max(1, len(body) // 4), client.token_burst)
+        token_bucket = f"quota:tokens:{client.name}"
+        allowed, remaining = await backend.consume_tokens(token_bucket, client.token_burst, client.tokens_per_second, estimate)
+        if not allowed:
+            QUOTA_DECISIONS.labels(client=client.name, result="token_limited").inc()
+            retry_after = (estimate - remaining) / client.tokens_per_second if client.tokens_per_second else None
+            await self._reject(send, 429, "LLM token quota exceeded", retry_after)
+            return
+        QUOTA_DECISIONS.labels(client=client.name, result="allowed").inc()
+
+        usage = TokenUsage()
+        token = token_usage_var.set(usage)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            token_usage_var.reset(token)
+            self.accountant.record(client.name, usage)
+            extra = usage.total - estimate
+            if extra > 0:
+                try:
+                    allowed, remaining = await backend.consume_tokens(token_bucket, client.token_burst, client.tokens_per_second, extra)
+                    if not allowed and remaining > 0:
+                        await backend.consume_tokens(token_bucket, client.token_burst, client.tokens_per_second, remaining)
+                except Exception as e:
+                    logger.warning(f"Could not charge {extra} tokens to client '{client.name}': {str(e)}")
+
+# Configured clients by API key hash
+api_clients = parse_api_keys(
+    config["API_KEYS"],
+    requests_per_minute=config["QUOTA_REQUESTS_PER_MINUTE"],
+    request_burst=config["QUOTA_REQUEST_BURST"],
+    tokens_per_minute=config["QUOTA_TOKENS_PER_MINUTE"],
+    token_burst=config["QUOTA_TOKEN_BURST"]
+)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, HTTPException, Request
+from .accounting import usage_accountant
+from .middleware import api_clients, identify_client
+
+router = APIRouter()
+
+@router.get("/")
+async def get_usage(request: Request, days: int = 30):
+    """Daily LLM token usage per model for the calling API client."""
+    client = identify_client(request.headers, api_clients)
+    if client is None:
+        raise HTTPException(status_code=401, detail="A valid API key is required (X-API-Key header)")
+    return {"client": client.name, "usage": await usage_accountant.get_usage(client.name, days)}
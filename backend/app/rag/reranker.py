@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import logging
+from threading import Lock
+from typing import List, Dict, Any
+from ..config.config_loader import config
+from ..utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+class CrossEncoderReranker:
+    """
+    Re-score retrieval candidates with a local cross-encoder.
+
+    The model is loaded lazily on first use. Scores are computed in batches on
+    a worker thread so the event loop is never blocked, and (query, passage)
+    scores are cached so repeated queries only score new candidates.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 16, cache_size: int = 10000):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache = LRUCache(maxsize=cache_size)
+        self._tokenizer = None
+        self._model = None
+        self._load_lock = Lock()
+
+    def _load_model(self):
+        """Load the tokenizer and model once, on the calling (worker) thread."""
+        with self._load_lock:
+            if self._model is None:
+                from transformers import AutoTokenizer, AutoModelForSequenceClassification
+                logger.info(f"Loading re-ranking model '{self.model_name}'")
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                self._model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+                self._model.eval()
+
+    def _score_batches(self, query: str, passages: List[str]) -> List[float]:
+        """Score (query, passage) pairs in fixed-size batches."""
+        import torch
+
+        self._load_model()
+        scores: List[float] = []
+        with torch.no_grad():
+            for start in range(0, len(passages), self.batch_size):
+                batch = passages[start:start + self.batch_size]
+                features = self._tokenizer(
+                    [query] * len(batch),
+                    batch,
+                    padding=True,
+                    truncation=True,
+                    max_length=512,
+                    return_tensors="pt"
+                )
+                logits = self._model(**features).logits
+                # Single-logit models output relevance directly; otherwise use
+                # the "relevant" class.
+                batch_scores = logits[:, 0] if logits.shape[1] == 1 else logits[:, -1]
+                scores.extend(batch_scores.tolist())
+        return scores
+
+    @staticmethod
+    def _cache_key(query: str, passage: str) -> str:
+        return hashlib.sha1(f"{query}\x00{passage}".encode("utf-8")).hexdigest()
+
+    async def rerank(self, query: str, hits: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """
+        Re-rank Elasticsearch hits by cross-encoder relevance.
+
+        Args:
+            query (str): The user query.
+            hits (List[Dict[str, Any]]): Candidate hits as returned by `search_documents`.
+            top_k (int): Number of hits to keep.
+
+        Returns:
+            List[Dict[str, Any]]: The best `top_k` hits, each with a `_rerank_score`.
+        """
+        if not hits:
+            return []
+
+        passages = [hit["_source"].get("content", "") for hit in hits]
+        keys = [self._cache_key(query, passage) for passage in passages]
+        scores = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            new_scores = await asyncio.to_thread(self._score_batches, query, [passages[i] for i in missing])
+            for i, score in zip(missing, new_scores):
+                scores[i] = score
+                self.cache.set(keys[i], score)
+
+        ranked = sorted(zip(scores, range(len(hits))), key=lambda pair: pair[0], reverse=True)
+        results = []
+        for score, i in ranked[:top_k]:
+            hit = dict(hits[i])
+            hit["_rerank_score"] = score
+            results.append(hit)
+        return results
+
+# Create a single instance
+reranker = CrossEncoderReranker(
+    model_name=config["RERANK_MODEL"],
+    batch_size=config["RERANK_BATCH_SIZE"],
+    cache_size=config["RERANK_CACHE_SIZE"]
+)
@@ -0,0 +1,89 @@
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, List
+from ..config.config_loader import config
+from ..utils.cache import LRUCache, index_generations
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Elasticsearch makes writes searchable after its refresh interval; results
+# fetched sooner than this after a write may be stale and are not cached.
+WRITE_SETTLE_SECONDS = 1.0
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so trivially different phrasings share a cache entry.
+
+    Only case and whitespace are folded: punctuation can be significant
+    ("C++", "C#" and "C" are different queries).
+    """
+    return _WHITESPACE.sub(" ", query.lower()).strip()
+
+class RetrievalCache:
+    """
+    Cache of retrieval results keyed by normalized query and index generation.
+
+    Any write to an index bumps its generation (see `index_generations`), which
+    implicitly invalidates every cached result for that index.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, enabled: bool = True):
+        self.enabled = enabled
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    async def get_or_retrieve(
+        self,
+        index_names: List[str],
+        query: str,
+        params: tuple,
+        retrieve: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Return cached results for the query, or run `retrieve` and cache them.
+
+        Args:
+            index_names (List[str]): The indices the results come from.
+            query (str): The raw user query.
+            params (tuple): Other retrieval parameters that affect the results.
+            retrieve (Callable): Coroutine factory performing the actual retrieval.
+
+        Returns:
+            List[Dict[str, Any]]: The retrieval results.
+        """
+        if not self.enabled:
+            return await retrieve()
+
+        generations = tuple((name, index_generations.get(name)) for name in sorted(index_names))
+        key = (generations, normalize_query(query), params)
+        results = self._cache.get(key)
+        if results is not None:
+            return results
+
+        results = await retrieve()
+        if min(index_generations.seconds_since_write(name) for name in index_names) >= WRITE_SETTLE_SECONDS:
+            self._cache.set(key, results)
+        return results
+
+    def clear(self):
+        """Drop all cached results."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit-rate statistics."""
+        return {
+            "enabled": self.enabled,
+            "size": len(self._cache),
+            "max_size": self._cache.maxsize,
+            "hits": self._cache.hits,
+            "misses": self._cache.misses,
+            "hit_rate": self._cache.hit_rate,
+        }
+
+# Create a single instance
+retrieval_cache = RetrievalCache(
+    maxsize=config["RETRIEVAL_CACHE_SIZE"],
+    ttl=config["RETRIEVAL_CACHE_TTL"],
+    enabled=config["RETRIEVAL_CACHE_ENABLED"]
+)
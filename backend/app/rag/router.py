@@ -1,18 +1,29 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from typing import List, Optional
 from fastapi.responses import StreamingResponse
 from .service import rag_generate, rag_generate_stream
+from .retrieval_cache import retrieval_cache
 
 router = APIRouter()
 
 class RAGRequest(BaseModel):
     query: str
-    model: str = "llama2"
+    # A model name, "auto" to route by prompt and load, or None for DEFAULT_MODEL.
+    model: Optional[str] = None
+    top_k: Optional[int] = None
+    rerank: Optional[bool] = None
+    collections: Optional[List[str]] = None
+    session_id: Optional[str] = None
+    # Inline the best match in full and the others by their summaries; None for RAG_USE_SUMMARIES.
+    use_summaries: Optional[bool] = None
 
 @router.post("/")
 async def rag_generate_route(request: RAGRequest):
     try:
         return await rag_generate(request)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in RAG generation: {str(e)}")
 
@@ -20,5 +31,12 @@ async def rag_generate_route(request: RAGRequest):
 async def rag_generate_stream_route(request: RAGRequest):
     try:
         return StreamingResponse(rag_generate_stream(request), media_type="text/event-stream")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in RAG streaming generation: {str(e)}")
+
+@router.get("/cache/stats")
+async def retrieval_cache_stats_route():
+    """Get retrieval cache size and hit-rate statistics."""
+    return retrieval_cache.stats()
@@ -1,36 +1,135 @@
-from app.utils.elasticsearch_utils import search_documents
-from app.utils.ollama_utils import generate_ollama_response, stream_ollama_response
+import asyncio
+from typing import List, Dict, Any, Optional
+from app.config.config_loader import config
+from app.ingestion.summaries import summary_is_current
+from app.utils.collection_router import resolve_collection, search_collections
+from app.utils.model_router import model_router
+from app.utils.ollama_utils import generate_ollama_response, stream_ollama_response, warm_model
+from app.rag.reranker import reranker
+from app.rag.retrieval_cache import normalize_query, retrieval_cache
+from app.telemetry.metrics import stage_timer
+from app.utils.single_flight import SingleFlight
 from fastapi import HTTPException
 
+async def retrieve_context(
+    query: str,
+    top_k: Optional[int] = None,
+    rerank: Optional[bool] = None,
+    collections: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Retrieve the passages to ground a query in.
+
+    With re-ranking enabled a larger candidate set is fetched and re-scored
+    locally, so fewer but more relevant passages reach the prompt. Several
+    collections are searched concurrently and merged by score.
+    """
+    top_k = top_k or config["RAG_TOP_K"]
+    rerank = config["RERANK_ENABLED"] if rerank is None else rerank
+
+    collections = sorted(set(collections or [])) or None
+    index_names = list({resolve_collection(c).index for c in collections or [None]})
+
+    async def retrieve():
+        if rerank:
+            candidates = await search_collections(collections, query, size=max(config["RERANK_CANDIDATES"], top_k))
+            return await reranker.rerank(query, candidates, top_k)
+        results = await search_collections(collections, query, size=top_k)
+        return results[:top_k]
+
+    params = (top_k, rerank, tuple(collections or ()))
+    return await retrieval_cache.get_or_retrieve(index_names, query, params, retrieve)
+
+def _passage(hit: Dict[str, Any], use_summary: bool) -> str:
+    source = hit["_source"]
+    if use_summary and summary_is_current(source) and len(source["summary"]) < len(source["content"]):
+        return source["summary"]
+    return source["content"]
+
+def build_prompt(query: str, context_results: List[Dict[str, Any]], use_summaries: bool = False) -> str:
+    """
+    Build the generation prompt from the query and retrieved passages.
+
+    With `use_summaries` the top hit is still inlined in full, but the other
+    passages are given by their precomputed summaries where those are shorter,
+    which keeps the prompt (and Ollama's prompt evaluation) short.
+    """
+    if not context_results:
+        return query
+    context = "\n".join([_passage(hit, use_summaries and rank > 0) for rank, hit in enumerate(context_results)])
+    return f"Context:\n{context}\n\nQuery: {query}\n\nResponse:"
+
+async def _timed(stage: str, awaitable):
+    with stage_timer(stage):
+        return await awaitable
+
+async def retrieve_with_warmup(request, model: str) -> List[Dict[str, Any]]:
+    """
+    Retrieve context for a RAG request.
+
+    With RAG_SPECULATIVE_WARMUP enabled, the model is loaded in Ollama
+    concurrently with retrieval, so a cold model's load time overlaps the
+    search instead of following it. Retrieval and warm-up are timed as
+    separate "retrieve" and "warmup" stages.
+    """
+    retrieval = _timed("retrieve", retrieve_context(request.query, request.top_k, request.rerank, request.collections))
+    if not config["RAG_SPECULATIVE_WARMUP"]:
+        return await retrieval
+    context_results, _ = await asyncio.gather(retrieval, _timed("warmup", warm_model(model)))
+    return context_results
+
+# Bursts of the same question (e.g. after an announcement) share one run.
+_rag_flights = SingleFlight("rag")
+
+def _flight_key(request) -> tuple:
+    """Requests that would produce the same answer; the query is normalized like the retrieval cache's."""
+    collections = tuple(sorted(set(request.collections or [])))
+    return (normalize_query(request.query), request.model, request.top_k, request.rerank, collections, request.use_summaries)
+
+def _use_summaries(request) -> bool:
+    return config["RAG_USE_SUMMARIES"] if request.use_summaries is None else request.use_summaries
+
 async def rag_generate(request):
+    # Session turns depend on the session's context and are never shared.
+    if request.session_id:
+        return await _rag_generate(request)
+    return await _rag_flights.do(_flight_key(request), lambda: _rag_generate(request))
+
+async def _rag_generate(request):
     try:
-        context_results = await search_documents("context", request.query)
-        
-        if not context_results:
-            response = await generate_ollama_response(request.query, request.model)
-            return {"generated_text": response["response"], "context_used": []}
-        
-        context = "\n".join([hit["_source"]["content"] for hit in context_results[:3]])
-        prompt = f"Context:\n{context}\n\nQuery: {request.query}\n\nResponse:"
-        
-        response = await generate_ollama_response(prompt, request.model)
-        
-        return {"generated_text": response["response"], "context_used": context_results[:3]}
+        model = await model_router.resolve(request.model, "rag", request.query, request.session_id)
+        context_results = await retrieve_with_warmup(request, model)
+        with stage_timer("assemble"):
+            prompt = build_prompt(request.query, context_results, _use_summaries(request))
+        with stage_timer("generate"):
+            response = await generate_ollama_response(prompt, model, request.session_id)
+        return {"generated_text": response["response"], "context_used": context_results, "model": model}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in RAG generation: {str(e)}")
 
 async def rag_generate_stream(request):
+    if request.session_id:
+        source = _rag_generate_stream(request)
+    else:
+        source = _rag_flights.stream(_flight_key(request), lambda: _rag_generate_stream(request))
+    async for chunk in source:
+        yield chunk
+
+async def _rag_generate_stream(request):
     try:
-        context_results = await search_documents("context", request.query)
-        
-        if not context_results:
-            async for chunk in stream_ollama_response(request.query, request.model):
-                yield chunk
-        else:
-            context = "\n".join([hit["_source"]["content"] for hit in context_results[:3]])
-            prompt = f"Context:\n{context}\n\nQuery: {request.query}\n\nResponse:"
-            
-            async for chunk in stream_ollama_response(prompt, request.model):
-                yield chunk
+        model = await model_router.resolve(request.model, "rag", request.query, request.session_id)
+        context_results = await retrieve_with_warmup(request, model)
+        with stage_timer("assemble"):
+            prompt = build_prompt(request.query, context_results, _use_summaries(request))
+        # Time-to-first-token and generation throughput are recorded by
+        # stream_ollama_response itself.
+        async for chunk in stream_ollama_response(prompt, model, request.session_id):
+            yield chunk
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in RAG streaming generation: {str(e)}")
@@ -0,0 +1,24 @@
+from typing import Optional
+from ..config.config_loader import config
+from .base import DocumentNotFoundError, RetrievalBackend
+
+__all__ = ["DocumentNotFoundError", "RetrievalBackend", "get_retrieval_backend"]
+
+_backend: Optional[RetrievalBackend] = None
+
+def get_retrieval_backend() -> RetrievalBackend:
+    """
+    Return the configured retrieval backend.
+
+    RETRIEVAL_BACKEND selects "elasticsearch" or "sqlite" (an embedded
+    full-text index in RETRIEVAL_SQLITE_PATH, for small deployments and tests).
+    """
+    global _backend
+    if _backend is None:
+        if config["RETRIEVAL_BACKEND"] == "sqlite":
+            from .sqlite import SQLiteBackend
+            _backend = SQLiteBackend(config["RETRIEVAL_SQLITE_PATH"], config["RETRIEVAL_SQLITE_MMAP_SIZE"])
+        else:
+            from .elasticsearch import ElasticsearchBackend
+            _backend = ElasticsearchBackend()
+    return _backend
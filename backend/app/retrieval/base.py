@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+import json
+
+class DocumentNotFoundError(LookupError):
+    """Raised when a document to update or delete does not exist."""
+
+class RetrievalBackend(ABC):
+    """
+    Document store behind context management, search and RAG retrieval.
+
+    Hits are returned in Elasticsearch's shape (`_index`, `_id`, `_score`,
+    `_source`) whatever the backend, so callers never depend on which one is
+    configured. Every method takes an optional `routing` key, which restricts
+    it to one collection on an index shared by several collections.
+    """
+
+    name = "base"
+
+    async def start(self):
+        """Open connections; called from the application startup hook."""
+
+    async def stop(self):
+        """Close connections; called from the application shutdown hook."""
+
+    @abstractmethod
+    async def index_document(self, index_name: str, document: dict, routing: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Store a document under its content-derived ID.
+
+        Indexing identical content again returns `result: "noop"`.
+        """
+
+    @abstractmethod
+    async def search_documents(self, index_name: str, query: str, size: int = 10, routing: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Full-text search over title and content, best match first."""
+
+    @abstractmethod
+    async def get_all_documents(self, index_name: str, routing: Optional[str] = None, size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return stored documents as hits (the first 10 unless `size` is given)."""
+
+    async def get_all_documents_raw(self, index_name: str, routing: Optional[str] = None, size: Optional[int] = None) -> bytes:
+        """Return stored documents as a JSON-encoded hits array."""
+        hits = await self.get_all_documents(index_name, routing=routing, size=size)
+        return json.dumps(hits, separators=(",", ":")).encode("utf-8")
+
+    @abstractmethod
+    async def count_documents(self, index_name: str, routing: Optional[str] = None) -> int:
+        """Count the documents in an index, or in one collection."""
+
+    @abstractmethod
+    async def get_document(self, index_name: str, doc_id: str, routing: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return a document's source, or None if it is not stored (in the collection, given `routing`)."""
+
+    @abstractmethod
+    async def document_exists(self, index_name: str, doc_id: str, routing: Optional[str] = None) -> bool:
+        """Whether a document with this ID is stored (in the collection, given `routing`)."""
+
+    @abstractmethod
+    async def delete_document(self, index_name: str, doc_id: str, routing: Optional[str] = None) -> Dict[str, Any]:
+        """Delete a document; raises if it does not exist."""
+
+    @abstractmethod
+    async def update_document(self, index_name: str, doc_id: str, document: dict, routing: Optional[str] = None) -> Dict[str, Any]:
+        """Merge `document` into an existing document; raises if it does not exist."""
+
+    @abstractmethod
+    async def bulk_write(self, operations: List[Dict[str, Any]], refresh: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Apply a batch of index/create/update/delete operations.
+
+        Takes and returns the same structures as
+        `elasticsearch_utils.bulk_write`.
+        """
+
+    @abstractmethod
+    async def create_mock_data(self, index_name: str, routing: Optional[str] = None):
+        """Load the sample documents into an index."""
@@ -0,0 +1,50 @@
+from typing import Any, Dict, List, Optional
+from ..utils import elasticsearch_utils
+from .base import DocumentNotFoundError, RetrievalBackend
+
+class ElasticsearchBackend(RetrievalBackend):
+    """Retrieval through the Elasticsearch helpers in `elasticsearch_utils`."""
+
+    name = "elasticsearch"
+
+    async def stop(self):
+        await elasticsearch_utils.es_client.close()
+
+    async def index_document(self, index_name: str, document: dict, routing: Optional[str] = None) -> Dict[str, Any]:
+        return await elasticsearch_utils.index_document(index_name, document, routing=routing)
+
+    async def search_documents(self, index_name: str, query: str, size: int = 10, routing: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await elasticsearch_utils.search_documents(index_name, query, size=size, routing=routing)
+
+    async def get_all_documents(self, index_name: str, routing: Optional[str] = None, size: Optional[int] = None) -> List[Dict[str, Any]]:
+        return await elasticsearch_utils.get_all_documents(index_name, routing=routing, size=size)
+
+    async def get_all_documents_raw(self, index_name: str, routing: Optional[str] = None, size: Optional[int] = None) -> bytes:
+        return await elasticsearch_utils.get_all_documents_raw(index_name, routing=routing, size=size)
+
+    async def count_documents(self, index_name: str, routing: Optional[str] = None) -> int:
+        return await elasticsearch_utils.count_documents(index_name, routing=routing)
+
+    async def get_document(self, index_name: str, doc_id: str, routing: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return await elasticsearch_utils.get_document(index_name, doc_id, routing=routing)
+
+    async def document_exists(self, index_name: str, doc_id: str, routing: Optional[str] = None) -> bool:
+        return await elasticsearch_utils.document_exists(index_name, doc_id, routing=routing)
+
+    async def delete_document(self, index_name: str, doc_id: str, routing: Optional[str] = None) -> Dict[str, Any]:
+        try:
+            return await elasticsearch_utils.delete_document(index_name, doc_id, routing=routing)
+        except elasticsearch_utils.NotFoundError:
+            raise DocumentNotFoundError(f"Document {doc_id} not found in {index_name}")
+
+    async def update_document(self, index_name: str, doc_id: str, document: dict, routing: Optional[str] = None) -> Dict[str, Any]:
+        try:
+            return await elasticsearch_utils.update_document(index_name, doc_id, document, routing=routing)
+        except elasticsearch_utils.NotFoundError:
+            raise DocumentNotFoundError(f"Document {doc_id} not found in {index_name}")
+
+    async def bulk_write(self, operations: List[Dict[str, Any]], refresh: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await elasticsearch_utils.bulk_write(operations, refresh=refresh)
+
+    async def create_mock_data(self, index_name: str, routing: Optional[str] = None):
+        await elasticsearch_utils.create_mock_data(index_name, routing=routing)
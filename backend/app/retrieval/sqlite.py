@@ -0,0 +1,269 @@
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from ..telemetry.log_config import SAMPLED
+from ..telemetry.metrics import track_local_retrieval
+from ..utils.cache import index_generations
+from ..utils.content_hash import SUMMARY_FIELDS, content_document_id, content_hash
+from ..utils.mock_data import MOCK_DOCUMENTS
+from .base import DocumentNotFoundError, RetrievalBackend
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    rowid INTEGER PRIMARY KEY,
+    index_name TEXT NOT NULL,
+    id TEXT NOT NULL,
+    routing TEXT,
+    source TEXT NOT NULL,
+    UNIQUE (index_name, id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(title, content, tokenize = 'porter unicode61');
+"""
+
+_TERMS = re.compile(r"\w+")
+
+def _match_expression(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query matching any of its terms, like an
+    Elasticsearch `multi_match` with the default `or` operator.
+    """
+    terms = dict.fromkeys(term.lower() for term in _TERMS.findall(query))
+    return " OR ".join(f'"{term}"' for term in terms) or None
+
+def _hit(index_name: str, doc_id: str, routing: Optional[str], source: str, score: float) -> Dict[str, Any]:
+    hit = {"_index": index_name, "_id": doc_id, "_score": score, "_source": json.loads(source)}
+    if routing:
+        hit["_routing"] = routing
+    return hit
+
+class SQLiteBackend(RetrievalBackend):
+    """
+    Embedded retrieval for small deployments and tests: SQLite with an FTS5
+    full-text index ranked by BM25, stored in a single file (or in memory
+    with ":memory:").
+
+    Calls run on a worker thread, one at a time over a single connection,
+    so the event loop keeps serving requests while SQLite works or waits.
+    Writes are visible immediately, so `refresh` is accepted and ignored.
+    Several worker processes may share one database file: WAL mode lets
+    readers proceed during a write, a writer waits up to five seconds for
+    another process's write to finish, and reads are served through a
+    memory-mapped view of the file.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, mmap_size: int = 0):
+        self.path = path
+        self.mmap_size = mmap_size
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Used from worker threads, one call at a time (see _run).
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("PRAGMA synchronous = NORMAL")
+                conn.execute("PRAGMA busy_timeout = 5000")
+                conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            logger.info(f"SQLite retrieval backend opened at {self.path}")
+        return self._conn
+
+    def _locked(self, fn: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            return fn(*args)
+
+    async def _run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run `fn` on a worker thread, never concurrently with another call."""
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def start(self):
+        await self._run(lambda: self.conn)
+
+    async def stop(self):
+        await self._run(self._close)
+
+    def _get(self, index_name: str, doc_id: str, routing: Optional[str] = None) -> Optional[Tuple[int, Optional[str], dict]]:
+        """Look a document up; with `routing`, documents of other routings are not found, as in Elasticsearch."""
+        row = self.conn.execute(
+            "SELECT rowid, routing, source FROM documents WHERE index_name = ? AND id = ?", (index_name, doc_id)
+        ).fetchone()
+        if row is None or (routing and row[1] != routing):
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def _insert(self, index_name: str, doc_id: str, routing: Optional[str], source: dict):
+        cursor = self.conn.execute(
+            "INSERT INTO documents (index_name, id, routing, source) VALUES (?, ?, ?, ?)",
+            (index_name, doc_id, routing, json.dumps(source))
+        )
+        self.conn.execute(
+            "INSERT INTO documents_fts (rowid, title, content) VALUES (?, ?, ?)",
+            (cursor.lastrowid, str(source.get("title") or ""), str(source.get("content") or ""))
+        )
+
+    def _replace(self, rowid: int, source: dict):
+        self.conn.execute("UPDATE documents SET source = ? WHERE rowid = ?", (json.dumps(source), rowid))
+        self.conn.execute(
+            "UPDATE documents_fts SET title = ?, content = ? WHERE rowid = ?",
+            (str(source.get("title") or ""), str(source.get("content") or ""), rowid)
+        )
+
+    def _delete(self, rowid: int):
+        self.conn.execute("DELETE FROM documents WHERE rowid = ?", (rowid,))
+        self.conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (rowid,))
+
+    def _write(self, action: str, index_name: str, doc_id: str, document: Optional[dict], routing: Optional[str]) -> Dict[str, Any]:
+        """Apply one write inside the caller's transaction; returns a bulk_write result."""
+        if action in ("delete", "update"):
+            existing = self._get(index_name, doc_id, routing)
+        else:
+            existing = self._get(index_name, doc_id)
+        if action == "delete":
+            if existing is None:
+                error = {"type": "not_found", "reason": f"[{doc_id}]: document missing"}
+                return {"id": doc_id, "status": 404, "result": "not_found", "error": error}
+            self._delete(existing[0])
+            return {"id": doc_id, "status": 200, "result": "deleted", "error": None}
+        if action == "update":
+            if existing is None:
+                error = {"type": "document_missing_exception", "reason": f"[{doc_id}]: document missing"}
+                return {"id": doc_id, "status": 404, "result": None, "error": error}
+            rowid, _, source = existing
+            merged = {**source, **document}
+            if merged == source:
+                return {"id": doc_id, "status": 200, "result": "noop", "error": None}
+            self._replace(rowid, merged)
+            return {"id": doc_id, "status": 200, "result": "updated", "error": None}
+
+        if routing:
+            document = {**document, "collection": routing}
+        if existing is None:
+            self._insert(index_name, doc_id, routing, document)
+            return {"id": doc_id, "status": 201, "result": "created", "error": None}
+        if action == "create":
+            return {"id": doc_id, "status": 409, "result": "noop", "error": None}
+        self._replace(existing[0], document)
+        return {"id": doc_id, "status": 200, "result": "updated", "error": None}
+
+    def _transaction(self, writes: List[Tuple[str, str, str, Optional[dict], Optional[str]]]) -> List[Dict[str, Any]]:
+        """Apply (action, index, id, document, routing) writes in one transaction."""
+        with self.conn:
+            return [self._write(*write) for write in writes]
+
+    def _fetchall(self, sql: str, params: Sequence[Any]) -> List[tuple]:
+        return self.conn.execute(sql, params).fetchall()
+
+    @track_local_retrieval("index")
+    async def index_document(self, index_name: str, document: dict, routing: Optional[str] = None) -> Dict[str, Any]:
+        doc_id = content_document_id(document, routing)
+        [result] = await self._run(self._transaction, [("create", index_name, doc_id, {**document, "content_hash": content_hash(document)}, routing)])
+        if result["result"] == "noop":
+            logger.info("Document already exists in %s, skipping", index_name, extra={**SAMPLED, "index": index_name, "doc_id": doc_id})
+        else:
+            index_generations.bump(index_name)
+            logger.info("Document indexed in %s", index_name, extra={**SAMPLED, "index": index_name, "doc_id": doc_id})
+        return {"_index": index_name, "_id": doc_id, "result": result["result"]}
+
+    @track_local_retrieval("search")
+    async def search_documents(self, index_name: str, query: str, size: int = 10, routing: Optional[str] = None) -> List[Dict[str, Any]]:
+        match = _match_expression(query)
+        if match is None:
+            return []
+        sql = (
+            "SELECT d.id, d.routing, d.source, bm25(documents_fts) AS rank"
+            " FROM documents_fts JOIN documents d ON d.rowid = documents_fts.rowid"
+            " WHERE documents_fts MATCH ? AND d.index_name = ?"
+        )
+        params: List[Any] = [match, index_name]
+        if routing:
+            sql += " AND d.routing = ?"
+            params.append(routing)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(size)
+        # bm25() is lower for better matches; negate it into an Elasticsearch-style score.
+        rows = await self._run(self._fetchall, sql, params)
+        hits = [_hit(index_name, doc_id, hit_routing, source, -rank) for doc_id, hit_routing, source, rank in rows]
+        logger.info("Search in %s found %d documents", index_name, len(hits), extra={**SAMPLED, "index": index_name, "hits": len(hits)})
+        return hits
+
+    @track_local_retrieval("get_all")
+    async def get_all_documents(self, index_name: str, routing: Optional[str] = None, size: Optional[int] = None) -> List[Dict[str, Any]]:
+        sql = "SELECT id, routing, source FROM documents WHERE index_name = ?"
+        params: List[Any] = [index_name]
+        if routing:
+            sql += " AND routing = ?"
+            params.append(routing)
+        sql += " ORDER BY rowid LIMIT ?"
+        params.append(10 if size is None else size)
+        rows = await self._run(self._fetchall, sql, params)
+        return [_hit(index_name, doc_id, hit_routing, source, 1.0) for doc_id, hit_routing, source in rows]
+
+    @track_local_retrieval("count")
+    async def count_documents(self, index_name: str, routing: Optional[str] = None) -> int:
+        if routing:
+            rows = await self._run(self._fetchall, "SELECT COUNT(*) FROM documents WHERE index_name = ? AND routing = ?", (index_name, routing))
+        else:
+            rows = await self._run(self._fetchall, "SELECT COUNT(*) FROM documents WHERE index_name = ?", (index_name,))
+        return rows[0][0]
+
+    @track_local_retrieval("get")
+    async def get_document(self, index_name: str, doc_id: str, routing: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        existing = await self._run(self._get, index_name, doc_id, routing)
+        return existing[2] if existing else None
+
+    @track_local_retrieval("exists")
+    async def document_exists(self, index_name: str, doc_id: str, routing: Optional[str] = None) -> bool:
+        return await self._run(self._get, index_name, doc_id, routing) is not None
+
+    @track_local_retrieval("delete")
+    async def delete_document(self, index_name: str, doc_id: str, routing: Optional[str] = None) -> Dict[str, Any]:
+        [result] = await self._run(self._transaction, [("delete", index_name, doc_id, None, routing)])
+        if result["status"] == 404:
+            raise DocumentNotFoundError(f"Document {doc_id} not found in {index_name}")
+        index_generations.bump(index_name)
+        logger.info("Document deleted from %s", index_name, extra={**SAMPLED, "index": index_name, "doc_id": doc_id})
+        return {"_index": index_name, "_id": doc_id, "result": "deleted"}
+
+    @track_local_retrieval("update")
+    async def update_document(self, index_name: str, doc_id: str, document: dict, routing: Optional[str] = None) -> Dict[str, Any]:
+        [result] = await self._run(self._transaction, [("update", index_name, doc_id, document, routing)])
+        if result["status"] == 404:
+            raise DocumentNotFoundError(f"Document {doc_id} not found in {index_name}")
+        # Summary fields are not searchable; see elasticsearch_utils.update_document.
+        if result["result"] != "noop" and not document.keys() <= SUMMARY_FIELDS:
+            index_generations.bump(index_name)
+        logger.info("Document updated in %s", index_name, extra={**SAMPLED, "index": index_name, "doc_id": doc_id})
+        return {"_index": index_name, "_id": doc_id, "result": result["result"]}
+
+    @track_local_retrieval("bulk")
+    async def bulk_write(self, operations: List[Dict[str, Any]], refresh: Optional[str] = None) -> List[Dict[str, Any]]:
+        results = await self._run(self._transaction, [
+            (op["action"], op["index"], op["id"], op.get("document"), op.get("routing")) for op in operations
+        ])
+        for index_name in {op["index"] for op, result in zip(operations, results) if result["result"] not in ("noop", "not_found", None)}:
+            index_generations.bump(index_name)
+        errors = any(result["error"] for result in results)
+        logger.info("Bulk write of %d operations completed", len(operations), extra={**SAMPLED, "operations": len(operations), "errors": errors})
+        return results
+
+    async def create_mock_data(self, index_name: str, routing: Optional[str] = None):
+        for doc in MOCK_DOCUMENTS:
+            await self.index_document(index_name, doc, routing=routing)
+        logger.info(f"Mock data created successfully in index '{index_name}'")
@@ -1,12 +1,20 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from .service import search_context
+from typing import List, Optional
+from .service import search_context, collection_stats
 
 router = APIRouter()
 
 class SearchQuery(BaseModel):
     query: str
+    collection: Optional[str] = None
+    collections: Optional[List[str]] = None
+    size: int = 10
 
 @router.post("/")
 async def search_context_route(search_query: SearchQuery):
     return await search_context(search_query)
+
+@router.get("/collections/stats")
+async def collection_stats_route():
+    return await collection_stats()
@@ -1,9 +1,22 @@
-from app.utils.elasticsearch_utils import search_documents
+from app.utils.collection_router import search_collections, get_collection_stats
+from app.utils.responses import FastJSONResponse
 from fastapi import HTTPException
 
 async def search_context(search_query):
     try:
-        results = await search_documents("context", search_query.query)
-        return {"results": results}
+        collections = search_query.collections or ([search_query.collection] if search_query.collection else None)
+        results = await search_collections(collections, search_query.query, size=search_query.size)
+        # Returned directly so the raw hits skip FastAPI's jsonable_encoder pass.
+        return FastJSONResponse({"results": results})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching context: {str(e)}")
+
+async def collection_stats():
+    try:
+        return await get_collection_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving collection stats: {str(e)}")
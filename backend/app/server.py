@@ -0,0 +1,82 @@
+"""
+Production server: runs the API in several worker processes.
+
+Uses gunicorn with uvicorn workers when gunicorn is installed, and uvicorn's
+own process manager otherwise. Workers share state through the backend
+selected by SHARED_BACKEND; more than one worker requires "postgres", since
+"memory" keeps caches, sessions, quotas and job status per process.
+
+Usage:
+    python -m app.server [--workers 4] [--host 0.0.0.0] [--port 8000]
+"""
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+from app.config.config_loader import config
+from app.telemetry.log_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+APP = "app.main:app"
+
+def prepare_metrics_dir(workers: int):
+    """Give prometheus_client a fresh directory so /metrics aggregates every worker."""
+    if workers < 2:
+        return
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.path.join(tempfile.gettempdir(), "prometheus-multiproc")
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+def run_gunicorn(host: str, port: int, workers: int, timeout: int):
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "uvicorn.workers.UvicornWorker")
+            # Streaming generations can legitimately run for minutes.
+            self.cfg.set("timeout", timeout)
+            self.cfg.set("graceful_timeout", 30)
+            self.cfg.set("keepalive", 5)
+            self.cfg.set("child_exit", child_exit)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    Server().run()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with several worker processes.")
+    parser.add_argument("--host", default=config["HOST"])
+    parser.add_argument("--port", type=int, default=config["PORT"])
+    parser.add_argument("--workers", type=int, default=config["WORKERS"])
+    parser.add_argument("--timeout", type=int, default=300, help="Seconds before a silent worker is restarted")
+    args = parser.parse_args()
+
+    if args.workers > 1 and config["SHARED_BACKEND"] == "memory":
+        # Jobs polled on another worker would 404 and cached results go stale.
+        parser.error("several workers need SHARED_BACKEND=postgres; with SHARED_BACKEND=memory use --workers 1")
+    prepare_metrics_dir(args.workers)
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        import uvicorn
+        logger.info(f"gunicorn not installed, starting {args.workers} uvicorn workers")
+        uvicorn.run(APP, host=args.host, port=args.port, workers=args.workers)
+        return
+    run_gunicorn(args.host, args.port, args.workers, args.timeout)
+
+if __name__ == "__main__":
+    main()
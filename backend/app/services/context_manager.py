@@ -1,67 +1,84 @@
-from app.utils.elasticsearch_utils import index_document, search_documents, es_client
-from typing import List, Dict, Any
+from app.context.service import update_operations
+from app.retrieval import DocumentNotFoundError, get_retrieval_backend
+from app.utils.content_hash import content_fields
+from app.utils.collection_router import resolve_collection
+from typing import List, Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ContextManager:
-    def __init__(self, index_name: str = "context"):
-        self.index_name = index_name
+    def __init__(self, collection: Optional[str] = None):
+        # Resolved even for the default collection, which has a routing key
+        # in "routing" mode like any other.
+        target = resolve_collection(collection)
+        self.index_name, self.routing = target.index, target.routing
 
     async def add_context(self, title: str, content: str) -> Dict[str, Any]:
-        """Add a new context document to Elasticsearch."""
+        """Add a new context document."""
         document = {
             "title": title,
             "content": content
         }
         try:
-            result = await index_document(self.index_name, document)
-            return {"id": result["_id"], "result": "created"}
+            result = await get_retrieval_backend().index_document(self.index_name, document, routing=self.routing)
+            # "noop" when identical content is already stored.
+            return {"id": result["_id"], "result": result["result"]}
         except Exception as e:
             logger.error(f"Error adding context: {str(e)}")
             raise
 
     async def search_context(self, query: str, size: int = 5) -> List[Dict[str, Any]]:
-        """Search for context documents in Elasticsearch."""
+        """Search for context documents."""
         try:
-            results = await search_documents(self.index_name, query)
+            results = await get_retrieval_backend().search_documents(self.index_name, query, size=size, routing=self.routing)
             return [{"id": hit["_id"], "title": hit["_source"]["title"], "content": hit["_source"]["content"]} for hit in results[:size]]
         except Exception as e:
             logger.error(f"Error searching context: {str(e)}")
             raise
 
     async def get_all_contexts(self, size: int = 100) -> List[Dict[str, Any]]:
-        """Retrieve all context documents from Elasticsearch."""
+        """Retrieve all context documents."""
         try:
-            body = {
-                "query": {"match_all": {}},
-                "size": size
-            }
-            result = await es_client.search(index=self.index_name, body=body)
-            return [{"id": hit["_id"], "title": hit["_source"]["title"], "content": hit["_source"]["content"]} for hit in result["hits"]["hits"]]
+            hits = await get_retrieval_backend().get_all_documents(self.index_name, routing=self.routing, size=size)
+            return [{"id": hit["_id"], "title": hit["_source"]["title"], "content": hit["_source"]["content"]} for hit in hits]
         except Exception as e:
             logger.error(f"Error retrieving all contexts: {str(e)}")
             raise
 
     async def delete_context(self, context_id: str) -> Dict[str, Any]:
-        """Delete a context document from Elasticsearch."""
+        """Delete a context document."""
         try:
-            result = await es_client.delete(index=self.index_name, id=context_id)
+            result = await get_retrieval_backend().delete_document(self.index_name, context_id, routing=self.routing)
             return {"id": result["_id"], "result": "deleted"}
         except Exception as e:
             logger.error(f"Error deleting context: {str(e)}")
             raise
 
     async def update_context(self, context_id: str, title: str = None, content: str = None) -> Dict[str, Any]:
-        """Update a context document in Elasticsearch."""
+        """
+        Update a context document.
+
+        Changed content moves the document to its new content-derived ID, as
+        in the context API; the returned `id` is the one to use from now on.
+        """
         try:
-            doc = {}
+            backend = get_retrieval_backend()
+            existing = await backend.get_document(self.index_name, context_id, routing=self.routing)
+            if existing is None:
+                raise DocumentNotFoundError(f"Document {context_id} not found in {self.index_name}")
+            source = content_fields(existing)
             if title:
-                doc["title"] = title
+                source["title"] = title
             if content:
-                doc["content"] = content
-            result = await es_client.update(index=self.index_name, id=context_id, body={"doc": doc})
-            return {"id": result["_id"], "result": "updated"}
+                source["content"] = content
+            new_id, operations = update_operations(self.index_name, self.routing, context_id, source)
+            results = await backend.bulk_write(operations)
+            errors = [result["error"] for result in results if result["error"]]
+            if errors:
+                raise RuntimeError(f"Could not update context {context_id}: {errors}")
+            result = "noop" if all(result["result"] == "noop" for result in results) else "updated"
+            return {"id": new_id, "previous_id": context_id, "result": result}
         except Exception as e:
             logger.error(f"Error updating context: {str(e)}")
             raise
@@ -0,0 +1,91 @@
+import json
+import logging
+import random
+import sys
+import time
+from contextvars import ContextVar
+from typing import Optional
+from ..config.config_loader import config
+
+# ID of the HTTP request being served, set by RequestIdMiddleware. Context
+# variables follow awaits and tasks created while serving the request.
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Pass as `extra=SAMPLED` on per-request info logs in hot paths; only a
+# LOG_SAMPLE_RATE fraction of them is emitted.
+SAMPLED = {"sampled": True}
+
+# Client libraries that log every request at INFO.
+_CHATTY_LOGGERS = ("elasticsearch", "httpx")
+
+# Attributes every LogRecord has; anything else was passed through `extra`.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "sampled"}
+
+class RequestIdFilter(logging.Filter):
+    """Stamp each record with the current request ID."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of records marked as sampled; warnings and errors always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False) or record.levelno >= logging.WARNING:
+            return True
+        return self.rate >= 1.0 or random.random() < self.rate
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    """The plain text format, with the request ID ("-" outside requests) after the logger name."""
+
+    def __init__(self):
+        super().__init__("%(levelname)s:%(name)s:%(request_id)s:%(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        record = logging.makeLogRecord({**vars(record), "request_id": getattr(record, "request_id", None) or "-"})
+        return super().format(record)
+
+def setup_logging():
+    """
+    Configure the root logger from LOG_LEVEL, LOG_FORMAT ("text" or "json")
+    and LOG_SAMPLE_RATE. Per-request logs of client libraries are only kept
+    at DEBUG level.
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(SamplingFilter(config["LOG_SAMPLE_RATE"]))
+    if config["LOG_FORMAT"] == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(TextFormatter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(config["LOG_LEVEL"])
+    if config["LOG_LEVEL"] != "DEBUG":
+        for name in _CHATTY_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
@@ -0,0 +1,254 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+
+# Buckets tuned for an API whose calls range from sub-millisecond cache hits
+# to multi-second LLM generations.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method", "route"],
+)
+RAG_STAGE_LATENCY = Histogram(
+    "rag_stage_duration_seconds",
+    "Latency of each RAG pipeline stage",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+OLLAMA_TIME_TO_FIRST_TOKEN = Histogram(
+    "ollama_time_to_first_token_seconds",
+    "Time from request to the first streamed token",
+    ["model"],
+    buckets=LATENCY_BUCKETS,
+)
+OLLAMA_GENERATION_LATENCY = Histogram(
+    "ollama_generation_duration_seconds",
+    "Total Ollama generation latency",
+    ["model", "mode"],
+    buckets=LATENCY_BUCKETS,
+)
+OLLAMA_TOKENS_PER_SECOND = Histogram(
+    "ollama_tokens_per_second",
+    "Ollama generation throughput",
+    ["model"],
+    buckets=(1, 2, 5, 10, 20, 40, 80, 160, 320),
+)
+OLLAMA_TOKENS = Counter(
+    "ollama_tokens_total",
+    "Tokens processed by Ollama",
+    ["model", "kind"],
+)
+OLLAMA_IN_FLIGHT = Gauge(
+    "ollama_requests_in_flight",
+    "Ollama generations currently running (the model queue depth)",
+    ["model"],
+)
+OLLAMA_WARMUPS = Counter(
+    "ollama_warmups_total",
+    "Model keep-alive/preload requests sent to Ollama",
+    ["model", "result"],
+)
+AGENT_STEPS = Histogram(
+    "agent_steps",
+    "LLM round trips per agent run",
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15, 20),
+)
+AGENT_TOOL_CALLS = Counter(
+    "agent_tool_calls_total",
+    "Agent tool calls by outcome (ok, error, cached)",
+    ["tool", "result"],
+)
+AGENT_RUNS = Counter(
+    "agent_runs_total",
+    "Agent runs by how they ended (answer, final_answer once out of steps, or the budget that stopped them)",
+    ["stop_reason"],
+)
+MODEL_ROUTING_DECISIONS = Counter(
+    "model_routing_decisions_total",
+    "Models chosen for model=auto requests, by task and deciding factor",
+    ["task", "model", "reason"],
+)
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total",
+    "Coalesced calls by group; followers shared a leader's in-flight work",
+    ["group", "role"],
+)
+LOCAL_RETRIEVAL_LATENCY = Histogram(
+    "local_retrieval_call_duration_seconds",
+    "Embedded retrieval backend call latency by operation",
+    ["operation", "status"],
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+ELASTICSEARCH_LATENCY = Histogram(
+    "elasticsearch_call_duration_seconds",
+    "Elasticsearch call latency by operation",
+    ["operation", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+INTEGRATION_LATENCY = Histogram(
+    "integration_call_duration_seconds",
+    "GitHub/Slack API call latency",
+    ["service", "operation", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+INGEST_QUEUE_DEPTH = Gauge(
+    "ingest_queue_depth",
+    "Context writes waiting in the write-behind queue",
+)
+INGEST_BATCH_SIZE = Histogram(
+    "ingest_batch_size",
+    "Operations per bulk request issued by the ingestion workers",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+INGEST_OPERATIONS = Counter(
+    "ingest_operations_total",
+    "Context write operations processed by the ingestion workers",
+    ["status"],
+)
+GITHUB_SYNC_FILES = Counter(
+    "github_sync_files_total",
+    "Repository files handled by webhook-driven GitHub sync",
+    ["outcome"],
+)
+QUOTA_DECISIONS = Counter(
+    "quota_decisions_total",
+    "Quota checks on LLM endpoints by client and outcome",
+    ["client", "result"],
+)
+CLIENT_TOKENS = Counter(
+    "client_llm_tokens_total",
+    "LLM tokens used on behalf of each API client",
+    ["client", "kind"],
+)
+DOCUMENT_SUMMARIES = Counter(
+    "document_summaries_total",
+    "Context documents handled by the background summarizer",
+    ["outcome"],
+)
+UPLOAD_FILES = Counter(
+    "upload_files_total",
+    "Uploaded files processed by the parser pool",
+    ["status"],
+)
+
+@contextmanager
+def stage_timer(stage: str):
+    """Record the duration of a RAG pipeline stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        RAG_STAGE_LATENCY.labels(stage=stage).observe(time.perf_counter() - start)
+
+class TokenUsage:
+    """Tokens used by the generations of one request, per model."""
+
+    def __init__(self):
+        self.models: Dict[str, List[int]] = {}
+
+    def add(self, model: str, prompt_tokens: int, completion_tokens: int):
+        counts = self.models.setdefault(model, [0, 0])
+        counts[0] += prompt_tokens
+        counts[1] += completion_tokens
+
+    @property
+    def total(self) -> int:
+        return sum(prompt + completion for prompt, completion in self.models.values())
+
+# Set by the quota middleware; generations add their eval counts to it.
+token_usage_var: ContextVar[Optional[TokenUsage]] = ContextVar("token_usage", default=None)
+
+def record_ollama_generation(model: str, duration: float, eval_count: int = 0, prompt_eval_count: int = 0, eval_duration_ns: int = 0):
+    """
+    Record a completed Ollama generation, also adding its tokens to the
+    current request's `TokenUsage` when one is being tracked.
+
+    Args:
+        model (str): The model used.
+        duration (float): Wall-clock duration in seconds.
+        eval_count (int): Completion tokens reported by Ollama.
+        prompt_eval_count (int): Prompt tokens reported by Ollama.
+        eval_duration_ns (int): Ollama's own generation time in nanoseconds.
+    """
+    usage = token_usage_var.get()
+    if usage is not None:
+        usage.add(model, prompt_eval_count, eval_count)
+    if prompt_eval_count:
+        OLLAMA_TOKENS.labels(model=model, kind="prompt").inc(prompt_eval_count)
+    if eval_count:
+        OLLAMA_TOKENS.labels(model=model, kind="completion").inc(eval_count)
+        generation_seconds = eval_duration_ns / 1e9 if eval_duration_ns else duration
+        if generation_seconds > 0:
+            OLLAMA_TOKENS_PER_SECOND.labels(model=model).observe(eval_count / generation_seconds)
+
+def _timed(histogram: Histogram, **labels) -> Callable:
+    """Decorate an async function to observe its latency with an ok/error status."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            status = "ok"
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                histogram.labels(status=status, **labels).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def track_elasticsearch(operation: str) -> Callable:
+    """Decorator recording count and latency of an Elasticsearch operation."""
+    return _timed(ELASTICSEARCH_LATENCY, operation=operation)
+
+def track_local_retrieval(operation: str) -> Callable:
+    """Decorator recording count and latency of an embedded retrieval backend call."""
+    return _timed(LOCAL_RETRIEVAL_LATENCY, operation=operation)
+
+def track_integration(service: str, operation: str) -> Callable:
+    """Decorator recording count and latency of a GitHub/Slack API call."""
+    return _timed(INTEGRATION_LATENCY, service=service, operation=operation)
+
+class CacheCollector:
+    """Expose in-process cache statistics as gauges at scrape time."""
+
+    def describe(self):
+        # Nothing to describe up front; avoids running collect() at registration.
+        return []
+
+    def collect(self):
+        from ..rag.retrieval_cache import retrieval_cache
+        from ..rag.reranker import reranker
+
+        size = GaugeMetricFamily("cache_entries", "Entries currently cached", labels=["cache"])
+        hits = GaugeMetricFamily("cache_hits", "Cache hits since start", labels=["cache"])
+        misses = GaugeMetricFamily("cache_misses", "Cache misses since start", labels=["cache"])
+        hit_rate = GaugeMetricFamily("cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+
+        retrieval = retrieval_cache.stats()
+        caches = {
+            "retrieval": (retrieval["size"], retrieval["hits"], retrieval["misses"], retrieval["hit_rate"]),
+            "rerank": (len(reranker.cache), reranker.cache.hits, reranker.cache.misses, reranker.cache.hit_rate),
+        }
+        for name, (entries, hit_count, miss_count, ratio) in caches.items():
+            size.add_metric([name], entries)
+            hits.add_metric([name], hit_count)
+            misses.add_metric([name], miss_count)
+            hit_rate.add_metric([name], ratio)
+        yield from (size, hits, misses, hit_rate)
+
+REGISTRY.register(CacheCollector())
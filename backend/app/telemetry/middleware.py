@@ -0,0 +1,88 @@
+import re
+import time
+import uuid
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+from .log_config import request_id_var
+from .metrics import REQUEST_LATENCY, REQUESTS_IN_PROGRESS
+
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+class PrometheusMiddleware:
+    """
+    Record per-route request latency and in-progress gauges.
+
+    Implemented as plain ASGI middleware so streaming responses are measured
+    until their last chunk is sent and are never buffered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _route_template(self, scope: Scope) -> str:
+        """Resolve the route template (e.g. /api/context/{doc_id}) to keep label cardinality bounded."""
+        app = scope.get("app")
+        for route in getattr(app, "routes", []):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return "unmatched"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_template(scope)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method=method, route=route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            REQUEST_LATENCY.labels(method=method, route=route, status=str(status["code"])).observe(
+                time.perf_counter() - start
+            )
+
+class RequestIdMiddleware:
+    """
+    Assign each request an ID, taken from a valid X-Request-ID header or
+    generated, expose it to logs and downstream calls through
+    `request_id_var`, and echo it in the response headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not _VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
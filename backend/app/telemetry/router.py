@@ -0,0 +1,19 @@
+import os
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+router = APIRouter()
+
+def _registry():
+    # Under app.server with several workers, aggregate every worker's samples.
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    from prometheus_client import multiprocess
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+@router.get("/metrics")
+def metrics():
+    """Expose Prometheus metrics."""
+    return Response(content=generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,55 @@
+import importlib
+import logging
+import time
+from contextlib import contextmanager
+from threading import Lock
+from types import ModuleType
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+class StartupReport:
+    """
+    Wall-clock cost of importing and initializing each part of the app.
+
+    Imports and startup work are recorded as the app boots; components that
+    are initialized lazily record their cost on first use, so the report also
+    shows what the first request paid for.
+    """
+
+    def __init__(self):
+        self._entries: List[Dict[str, Any]] = []
+        self._lock = Lock()
+
+    def record(self, name: str, kind: str, seconds: float):
+        """Record one measurement (`kind` is "import", "init" or "lazy_init")."""
+        with self._lock:
+            self._entries.append({"name": name, "kind": kind, "seconds": seconds})
+
+    @contextmanager
+    def measure(self, name: str, kind: str = "init"):
+        """Time the enclosed block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, kind, time.perf_counter() - start)
+
+    def import_module(self, name: str) -> ModuleType:
+        """Import a module, recording how long the import took."""
+        with self.measure(name, "import"):
+            return importlib.import_module(name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Measurements, slowest first. Nested measurements are included in their parent's time."""
+        with self._lock:
+            entries = sorted(self._entries, key=lambda entry: entry["seconds"], reverse=True)
+        return {"entries": entries}
+
+    def log(self):
+        """Log the measurements, slowest first."""
+        lines = [f"  {entry['seconds'] * 1000:8.1f} ms  {entry['kind']:<9} {entry['name']}" for entry in self.to_dict()["entries"]]
+        logger.info("Startup cost by component:\n" + "\n".join(lines))
+
+# Create a single instance
+startup_report = StartupReport()
@@ -0,0 +1,94 @@
+import functools
+import inspect
+import logging
+from threading import Lock
+from typing import Callable, Optional, Sequence
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SpanExporter, SpanExportResult
+from ..config.config_loader import config
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("ai-agent-platform")
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans as JSON lines to a file for offline analysis."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = Lock()
+
+    def export(self, spans) -> SpanExportResult:
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                for span in spans:
+                    f.write(span.to_json(indent=None) + "\n")
+            return SpanExportResult.SUCCESS
+        except OSError as e:
+            logger.error(f"Error writing spans to {self.path}: {str(e)}")
+            return SpanExportResult.FAILURE
+
+    def shutdown(self):
+        pass
+
+def _create_exporter(name: str) -> Optional[SpanExporter]:
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=config["OTEL_EXPORTER_OTLP_ENDPOINT"])
+    if name == "file":
+        return FileSpanExporter(config["OTEL_TRACES_FILE"])
+    if name == "console":
+        return ConsoleSpanExporter()
+    return None
+
+def setup_tracing(app) -> bool:
+    """
+    Configure the tracer provider and instrument the FastAPI app.
+
+    The exporter is chosen by OTEL_TRACES_EXPORTER: "otlp" (a local
+    collector), "file" (JSON lines), "console", or "none" (the default, in
+    which case spans are no-ops and cost next to nothing).
+
+    Args:
+        app: The FastAPI application to instrument.
+
+    Returns:
+        bool: True if tracing was enabled.
+    """
+    exporter = _create_exporter(config["OTEL_TRACES_EXPORTER"])
+    if exporter is None:
+        return False
+
+    provider = TracerProvider(resource=Resource.create({"service.name": config["OTEL_SERVICE_NAME"]}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="/metrics")
+    logger.info(f"Tracing enabled with '{config['OTEL_TRACES_EXPORTER']}' exporter")
+    return True
+
+def traced(span_name: str, record_args: Sequence[str] = ()) -> Callable:
+    """
+    Decorate an async function to run inside a span.
+
+    Args:
+        span_name (str): Name of the span.
+        record_args (Sequence[str]): Argument names recorded as span attributes.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name) as span:
+                if record_args and span.is_recording():
+                    bound = signature.bind_partial(*args, **kwargs).arguments
+                    for name in record_args:
+                        if bound.get(name) is not None:
+                            span.set_attribute(name, str(bound[name]))
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
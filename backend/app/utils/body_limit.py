@@ -0,0 +1,63 @@
+from typing import Dict
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+class _BodyTooLarge(Exception):
+    pass
+
+class BodySizeLimitMiddleware:
+    """
+    Reject request bodies larger than a per-path limit with a 413.
+
+    Form data is read in full before a route handler runs, so limits checked
+    in the handler only apply after the whole upload has been received and
+    spooled to disk. This middleware refuses an oversized Content-Length up
+    front and stops reading a body without one (chunked) once it passes the
+    limit.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, limit: int):
+        response = JSONResponse({"detail": f"Request body exceeds the {limit} byte limit"}, status_code=413)
+        await response(scope, receive, send)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            await self._reject(scope, receive, send, limit)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def limited_send(message: Message):
+            # The route turns any error while parsing the body into a 400;
+            # replace that response with the 413.
+            if not exceeded:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                await self._reject(scope, receive, send, limit)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except _BodyTooLarge:
+            await self._reject(scope, receive, send, limit)
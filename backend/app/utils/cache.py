@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, List, Optional
+import time
+
+class LRUCache:
+    """
+    A small thread-safe LRU cache with optional per-entry TTL.
+
+    Used for in-process caches of derived results (e.g. re-ranking scores)
+    where recomputation is expensive but staleness is bounded.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default` if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store `value` under `key`, evicting the least recently used entry if full."""
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """Remove `key` from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+class IndexGenerations:
+    """
+    Per-index write counters used to invalidate cached reads.
+
+    Every write bumps the index's generation; caches include the generation in
+    their keys, so entries computed before the write are never served again.
+    """
+
+    def __init__(self):
+        self._generations = {}
+        self._last_write = {}
+        self._listeners: List[Callable[[str], None]] = []
+        self._lock = Lock()
+
+    def get(self, index_name: str) -> int:
+        """Return the current generation of `index_name`."""
+        return self._generations.get(index_name, 0)
+
+    def bump(self, index_name: str, notify: bool = True) -> int:
+        """
+        Advance the generation of `index_name` and return the new value.
+
+        Listeners are told about the write unless `notify` is False (used for
+        writes reported by other worker processes).
+        """
+        with self._lock:
+            self._generations[index_name] = self._generations.get(index_name, 0) + 1
+            self._last_write[index_name] = time.monotonic()
+            generation = self._generations[index_name]
+        if notify:
+            for listener in self._listeners:
+                listener(index_name)
+        return generation
+
+    def add_listener(self, listener: Callable[[str], None]):
+        """Call `listener(index_name)` after every local write."""
+        self._listeners.append(listener)
+
+    def seconds_since_write(self, index_name: str) -> float:
+        """Seconds since the last write to `index_name` (infinite if never written)."""
+        last_write = self._last_write.get(index_name)
+        return time.monotonic() - last_write if last_write is not None else float("inf")
+
+# Create a single instance
+index_generations = IndexGenerations()
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import re
+import time
+from threading import Lock
+from typing import Any, Dict, List, NamedTuple, Optional
+from ..config.config_loader import config
+from ..retrieval import get_retrieval_backend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX = "context"
+DEFAULT_COLLECTION = "default"
+_COLLECTION_NAME = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+# Collection indices are aliases over "<alias>-v<version>" concrete indices,
+# so a name ending like a version could address another collection's data.
+_VERSION_SUFFIX = re.compile(r"(^|-)v\d+$")
+
+class CollectionTarget(NamedTuple):
+    """Where a collection's documents live: an index and an optional routing key."""
+    collection: str
+    index: str
+    routing: Optional[str]
+
+def resolve_collection(collection: Optional[str] = None) -> CollectionTarget:
+    """
+    Map a collection (tenant) name to its index and routing key.
+
+    In "index" mode every collection gets its own index ("context-c-<name>"),
+    so searches only touch that tenant's data; the "c-" namespace keeps
+    collection indices apart from the versioned indices behind the default
+    alias ("context-v3"). In "routing" mode collections, the default one
+    included, share the "context" index and are separated by routing key and
+    a filter on `collection`, which keeps the number of indices small for
+    many tiny tenants.
+
+    Args:
+        collection (Optional[str]): Collection name; None means the shared default.
+
+    Returns:
+        CollectionTarget: The resolved index and routing key.
+
+    Raises:
+        ValueError: If the collection name is not a valid index/routing name.
+    """
+    collection = collection or DEFAULT_COLLECTION
+    if not _COLLECTION_NAME.match(collection) or _VERSION_SUFFIX.search(collection):
+        raise ValueError(f"Invalid collection name '{collection}'")
+    if config["COLLECTION_MODE"] == "routing":
+        return CollectionTarget(collection, DEFAULT_INDEX, collection)
+    if collection == DEFAULT_COLLECTION:
+        return CollectionTarget(DEFAULT_COLLECTION, DEFAULT_INDEX, None)
+    return CollectionTarget(collection, f"{DEFAULT_INDEX}-c-{collection}", None)
+
+class CollectionStats:
+    """In-process per-collection search counters."""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = Lock()
+
+    def record_search(self, collection: str, duration: float, hits: int):
+        """Record one search against `collection`."""
+        with self._lock:
+            stats = self._stats.setdefault(collection, {"searches": 0, "total_seconds": 0.0, "hits_returned": 0})
+            stats["searches"] += 1
+            stats["total_seconds"] += duration
+            stats["hits_returned"] += hits
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Copy of the counters with average latency per collection."""
+        with self._lock:
+            return {
+                name: {**stats, "avg_seconds": stats["total_seconds"] / stats["searches"]}
+                for name, stats in self._stats.items()
+            }
+
+# Create a single instance
+collection_stats = CollectionStats()
+
+async def search_collection(collection: Optional[str], query: str, size: int = 10) -> List[Dict[str, Any]]:
+    """
+    Search a single collection, tagging each hit with its collection name.
+
+    Args:
+        collection (Optional[str]): The collection to search.
+        query (str): The search query.
+        size (int): Maximum number of hits.
+
+    Returns:
+        List[Dict[str, Any]]: Elasticsearch hits with an extra `_collection` key.
+    """
+    target = resolve_collection(collection)
+    start = time.perf_counter()
+    hits = await get_retrieval_backend().search_documents(target.index, query, size=size, routing=target.routing)
+    collection_stats.record_search(target.collection, time.perf_counter() - start, len(hits))
+    return [{**hit, "_collection": target.collection} for hit in hits]
+
+async def search_collections(collections: Optional[List[str]], query: str, size: int = 10) -> List[Dict[str, Any]]:
+    """
+    Fan a search out to several collections concurrently and merge by score.
+
+    Args:
+        collections (Optional[List[str]]): Collections to search; None or empty
+            searches the default collection only.
+        query (str): The search query.
+        size (int): Maximum number of merged hits to return.
+
+    Returns:
+        List[Dict[str, Any]]: The best `size` hits across all collections.
+    """
+    collections = list(dict.fromkeys(collections or [DEFAULT_COLLECTION]))
+    if len(collections) == 1:
+        return await search_collection(collections[0], query, size)
+
+    results = await asyncio.gather(*(search_collection(c, query, size) for c in collections))
+    merged = [hit for hits in results for hit in hits]
+    merged.sort(key=lambda hit: hit.get("_score") or 0.0, reverse=True)
+    return merged[:size]
+
+async def get_collection_stats() -> Dict[str, Any]:
+    """
+    Per-collection search counters plus current document counts.
+
+    Returns:
+        Dict[str, Any]: Stats keyed by collection name.
+    """
+    stats = collection_stats.snapshot()
+    for name in stats:
+        target = resolve_collection(name)
+        try:
+            stats[name]["documents"] = await get_retrieval_backend().count_documents(target.index, routing=target.routing)
+        except Exception as e:
+            logger.warning(f"Could not count documents for collection '{name}': {str(e)}")
+            stats[name]["documents"] = None
+    return {"mode": config["COLLECTION_MODE"], "collections": stats}
@@ -0,0 +1,59 @@
+import hashlib
+import json
+import re
+from typing import Any, Dict, Optional
+
+_WHITESPACE = re.compile(r"\s+")
+# Source prefix of documents identified by location rather than content
+# (repository files, see app/integrations/github_sync.py).
+GITHUB_SOURCE_PREFIX = "github:"
+# Precomputed summaries (see app/ingestion/summaries.py); stored, not searchable.
+SUMMARY_FIELDS = frozenset({"summary", "chunk_summaries", "summary_hash"})
+# Fields added at write time; they never count as content.
+_DERIVED_FIELDS = {"collection", "content_hash"} | SUMMARY_FIELDS
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+def content_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+    """A stored document without the fields derived from it at write time."""
+    return {key: value for key, value in document.items() if key not in _DERIVED_FIELDS}
+
+def content_hash(document: Dict[str, Any]) -> str:
+    """
+    Hash the content-bearing fields of a document.
+
+    Title and content are whitespace-normalized so trivially reformatted
+    copies hash identically. Documents without title/content are hashed over
+    their canonical JSON form.
+
+    Args:
+        document (Dict[str, Any]): The document to hash.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    if "title" in document or "content" in document:
+        payload = f"{_normalize(document.get('title', ''))}\x00{_normalize(document.get('content', ''))}"
+    else:
+        payload = json.dumps(content_fields(document), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def content_document_id(document: Dict[str, Any], routing: Optional[str] = None) -> str:
+    """
+    Derive a stable document ID from content, so re-ingestion is idempotent.
+
+    The routing key is part of the ID because collections sharing an index
+    must not collapse each other's documents.
+
+    Args:
+        document (Dict[str, Any]): The document to identify.
+        routing (Optional[str]): Collection routing key, if any.
+
+    Returns:
+        str: A 40-character hex document ID.
+    """
+    digest = content_hash(document)
+    if routing:
+        digest = hashlib.sha256(f"{routing}\x00{digest}".encode("utf-8")).hexdigest()
+    return digest[:40]
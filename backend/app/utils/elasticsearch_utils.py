@@ -1,89 +1,349 @@
-from elasticsearch import AsyncElasticsearch, NotFoundError
+from elasticsearch import AsyncElasticsearch, ConflictError, NotFoundError
+from elasticsearch.helpers import async_scan
+from elasticsearch.serializer import Deserializer
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+import json
 import os
 import logging
+from .cache import index_generations
+from .content_hash import GITHUB_SOURCE_PREFIX, SUMMARY_FIELDS, content_document_id, content_hash
+from .mock_data import MOCK_DOCUMENTS
+from .single_flight import SingleFlight
+from ..telemetry.log_config import SAMPLED, request_id_var
+from ..telemetry.metrics import track_elasticsearch
+from ..telemetry.tracing import traced
+from .index_templates import (
+    CONTEXT_TEMPLATE_NAME,
+    get_context_index_template,
+    versioned_index_name,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+
+# Set while a request's response body should be returned undecoded.
+_raw_response = ContextVar("raw_response", default=False)
+
+class _PassthroughDeserializer(Deserializer):
+    """Deserializer that leaves response bodies as strings while `_raw_response` is set."""
+
+    def loads(self, s, mimetype=None):
+        if _raw_response.get():
+            return s
+        return super().loads(s, mimetype)
 
 # Create Elasticsearch client
 es_url = os.getenv("ELASTICSEARCH_URL", "http://elasticsearch:9200")
 es_client = AsyncElasticsearch([es_url])
+es_client.transport.deserializer = _PassthroughDeserializer(es_client.transport.deserializer.serializers)
 logger.info(f"Elasticsearch client initialized with URL: {es_url}")
 
+def _request_options() -> dict:
+    """Tag calls with the current request ID (X-Opaque-Id) so ES slow logs and tasks can be correlated."""
+    request_id = request_id_var.get()
+    return {"opaque_id": request_id} if request_id else {}
+
+# Indices/aliases known to exist, so hot paths skip the existence round trip.
+_known_indices = set()
+
+def _is_index_not_found(error: Any) -> bool:
+    if isinstance(error, NotFoundError):
+        return error.error == "index_not_found_exception"
+    return isinstance(error, dict) and error.get("type") == "index_not_found_exception"
+
+def _forget_if_missing(index_name: str, error: Any):
+    """Drop an index from the known set after Elasticsearch reported it missing (e.g. deleted externally)."""
+    if _is_index_not_found(error):
+        _known_indices.discard(index_name)
+_template_installed = False
+
+async def ensure_index_template():
+    """Install (or upgrade) the versioned index template for context indices."""
+    global _template_installed
+    if _template_installed:
+        return
+    try:
+        await es_client.indices.put_index_template(name=CONTEXT_TEMPLATE_NAME, body=get_context_index_template())
+        _template_installed = True
+        logger.info(f"Index template '{CONTEXT_TEMPLATE_NAME}' installed.")
+    except Exception as e:
+        logger.error(f"Error installing index template '{CONTEXT_TEMPLATE_NAME}': {str(e)}")
+        raise
+
 async def create_index_if_not_exists(index_name: str):
-    """Create the index if it doesn't exist."""
+    """
+    Create the index if it doesn't exist.
+
+    New indices are created as a versioned concrete index ("context-v1") with
+    `index_name` as an alias, so they can later be migrated without downtime.
+    """
+    if index_name in _known_indices:
+        return
     try:
+        await ensure_index_template()
         if not await es_client.indices.exists(index=index_name):
-            await es_client.indices.create(index=index_name)
-            logger.info(f"Index '{index_name}' created successfully.")
+            await es_client.indices.create(
+                index=versioned_index_name(index_name),
+                body={"aliases": {index_name: {"is_write_index": True}}}
+            )
+            logger.info(f"Index '{versioned_index_name(index_name)}' created with alias '{index_name}'.")
+        _known_indices.add(index_name)
     except Exception as e:
         logger.error(f"Error creating index '{index_name}': {str(e)}")
         raise
 
-async def index_document(index_name: str, document: dict):
-    """Index a document in Elasticsearch."""
+@asynccontextmanager
+async def bulk_load_settings(index_name: str):
+    """
+    Disable refreshes on an index for the duration of a bulk load.
+
+    The previous refresh interval of each index behind `index_name` is
+    restored and the index refreshed on exit, so the loaded documents become
+    searchable exactly once.
+    """
+    settings = await es_client.indices.get_settings(
+        index=index_name, name="index.refresh_interval", flat_settings=True
+    )
+    # None for an interval that was never set; restoring None resets it to
+    # the cluster default.
+    previous = {index: body["settings"].get("index.refresh_interval") for index, body in settings.items()}
+    await es_client.indices.put_settings(index=index_name, body={"index": {"refresh_interval": "-1"}})
+    try:
+        yield
+    finally:
+        for index, interval in previous.items():
+            await es_client.indices.put_settings(index=index, body={"index": {"refresh_interval": interval}})
+        await es_client.indices.refresh(index=index_name)
+
+async def reindex_to_current_version(alias: str, delete_old: bool = False) -> dict:
+    """
+    Migrate an index to the current template version with zero downtime.
+
+    Documents are copied into a fresh versioned index and the alias is then
+    switched over in a single atomic `update_aliases` call. Indices created
+    before aliases were introduced (a concrete index named `alias`) are
+    replaced in the same call.
+
+    Writes keep going to the old indices while they are copied. Copies keep
+    their source versions, so a second pass after the switch picks up
+    documents created or updated in the meantime without overwriting newer
+    writes to the new index (a legacy index is write-blocked for its second
+    pass instead, as the switch deletes it). Deletions made during the copy
+    are not carried over; pause ingestion for the migration if that matters.
+
+    Args:
+        alias (str): The alias (or legacy concrete index) to migrate.
+        delete_old (bool): Delete the previous concrete indices afterwards.
+
+    Returns:
+        dict: Summary of the migration.
+    """
+    target = versioned_index_name(alias)
+    await ensure_index_template()
+
+    if not await es_client.indices.exists(index=alias):
+        await create_index_if_not_exists(alias)
+        return {"alias": alias, "target": target, "copied": 0, "previous": []}
+
+    is_alias = await es_client.indices.exists_alias(name=alias)
+    previous = list((await es_client.indices.get_alias(name=alias)).keys()) if is_alias else [alias]
+    if previous == [target]:
+        logger.info(f"Alias '{alias}' already points to '{target}', nothing to migrate.")
+        return {"alias": alias, "target": target, "copied": 0, "previous": previous}
+
+    if not await es_client.indices.exists(index=target):
+        await es_client.indices.create(index=target)
+
+    async def copy(source) -> int:
+        result = await es_client.reindex(
+            body={
+                "source": {"index": source},
+                "dest": {"index": target, "version_type": "external"},
+                # A version conflict means the target already has this copy or a newer one.
+                "conflicts": "proceed",
+            },
+            wait_for_completion=True,
+            request_timeout=3600
+        )
+        return result["created"] + result["updated"]
+
+    async with bulk_load_settings(target):
+        copied = await copy(alias)
+
+    if not is_alias:
+        # The swap below deletes the legacy index, so stop writes to it and
+        # copy what arrived during the first pass beforehand.
+        await es_client.indices.put_settings(index=alias, body={"index": {"blocks.write": True}})
+        copied += await copy(alias)
+
+    actions = [{"add": {"index": target, "alias": alias, "is_write_index": True}}]
+    if is_alias:
+        actions += [{"remove": {"index": index, "alias": alias}} for index in previous]
+    else:
+        # Legacy concrete index: drop it atomically as the alias takes its name.
+        actions.append({"remove_index": {"index": alias}})
+    await es_client.indices.update_aliases(body={"actions": actions})
+    _known_indices.add(alias)
+    index_generations.bump(alias)
+
+    if is_alias:
+        # Writes go to the new index from here on; pick up the ones that
+        # reached the previous indices during the first pass.
+        copied += await copy(",".join(previous))
+    logger.info(f"Alias '{alias}' switched to '{target}' ({copied} documents copied).")
+
+    if delete_old and is_alias:
+        for index in previous:
+            await es_client.indices.delete(index=index)
+            _known_indices.discard(index)
+            logger.info(f"Deleted previous index '{index}'.")
+
+    return {"alias": alias, "target": target, "copied": copied, "previous": previous}
+
+async def collapse_duplicates(index_name: str, routing: Optional[str] = None, dry_run: bool = False) -> dict:
+    """
+    Collapse documents with identical content into one copy per collection.
+
+    Documents are grouped by content hash. Each group keeps a single document
+    stored under its content-derived ID (rewriting it if it still has an
+    auto-generated ID); every other copy is deleted. Running this once after
+    upgrading makes later re-ingestion of the same content a no-op.
+
+    Synced repository files are left alone: they are stored under
+    path-derived IDs that later pushes and deletions rely on.
+
+    Args:
+        index_name (str): Index or alias to clean up.
+        routing (Optional[str]): Restrict to one routed collection.
+        dry_run (bool): Only report what would change.
+
+    Returns:
+        dict: Counts of scanned documents, duplicate groups, deletions and rewrites.
+    """
+    groups: Dict[tuple, List[dict]] = {}
+    query = _collection_query({"bool": {"must_not": {"prefix": {"source": GITHUB_SOURCE_PREFIX}}}}, routing)
+    async for hit in async_scan(es_client, index=index_name, query={"query": query}, routing=routing):
+        hit_routing = hit.get("_routing")
+        key = (hit_routing, content_hash(hit["_source"]))
+        groups.setdefault(key, []).append(hit)
+
+    # Bulk actions, each a list of lines so chunks never split an action from its source.
+    actions: List[List[dict]] = []
+    summary = {"index": index_name, "scanned": 0, "duplicate_groups": 0, "deleted": 0, "rewritten": 0, "dry_run": dry_run}
+    for (hit_routing, digest), hits in groups.items():
+        summary["scanned"] += len(hits)
+        if len(hits) > 1:
+            summary["duplicate_groups"] += 1
+        source = {key: value for key, value in hits[0]["_source"].items() if key != "content_hash"}
+        canonical_id = content_document_id(source, hit_routing)
+        routing_meta = {"routing": hit_routing} if hit_routing else {}
+
+        keeper = next((hit for hit in hits if hit["_id"] == canonical_id), None)
+        if keeper is None or "content_hash" not in keeper["_source"]:
+            meta = {"_index": hits[0]["_index"], "_id": canonical_id, **routing_meta}
+            actions.append([{"index": meta}, {**source, "content_hash": digest}])
+            summary["rewritten"] += 1
+        for hit in hits:
+            if hit["_id"] != canonical_id:
+                actions.append([{"delete": {"_index": hit["_index"], "_id": hit["_id"], **routing_meta}}])
+                summary["deleted"] += 1
+
+    if not dry_run and actions:
+        for start in range(0, len(actions), 500):
+            body = [line for action in actions[start:start + 500] for line in action]
+            response = await es_client.bulk(body=body, refresh=True)
+            if response["errors"]:
+                logger.warning(f"Some duplicate cleanup operations failed in {index_name}")
+        index_generations.bump(index_name)
+
+    logger.info(f"Duplicate collapse for {index_name}: {summary}")
+    return summary
+
+@traced("elasticsearch.index", record_args=("index_name", "routing"))
+@track_elasticsearch("index")
+async def index_document(index_name: str, document: dict, routing: Optional[str] = None):
+    """
+    Index a document in Elasticsearch.
+
+    The document ID is derived from its content, so indexing the same content
+    twice is a no-op: the second call skips the write and returns
+    `result: "noop"` with the existing ID.
+
+    When `routing` is given the document is stored on that routing key's shard
+    and tagged with it in the `collection` field.
+    """
+    doc_id = content_document_id(document, routing)
     try:
         await create_index_if_not_exists(index_name)
-        result = await es_client.index(index=index_name, body=document)
-        logger.info(f"Document indexed successfully in {index_name}. Document ID: {result['_id']}")
+        document = {**document, "content_hash": content_hash(document)}
+        if routing:
+            document["collection"] = routing
+        result = await es_client.create(index=index_name, id=doc_id, body=document, routing=routing, **_request_options())
+        index_generations.bump(index_name)
+        logger.info("Document indexed in %s", index_name, extra={**SAMPLED, "index": index_name, "doc_id": result["_id"]})
         return result
+    except ConflictError:
+        logger.info("Document already exists in %s, skipping", index_name, extra={**SAMPLED, "index": index_name, "doc_id": doc_id})
+        return {"_index": index_name, "_id": doc_id, "result": "noop"}
     except Exception as e:
+        _forget_if_missing(index_name, e)
         logger.error(f"Error indexing document in {index_name}: {str(e)}")
         raise
 
-async def search_documents(index_name: str, query: str):
-    """Search for documents in Elasticsearch."""
+def _collection_query(query: dict, routing: Optional[str]) -> dict:
+    """Restrict a query to one routing key's documents on a shared index."""
+    if not routing:
+        return query
+    return {"bool": {"must": query, "filter": {"term": {"collection": routing}}}}
+
+_search_flights = SingleFlight("elasticsearch.search")
+
+async def search_documents(index_name: str, query: str, size: int = 10, routing: Optional[str] = None):
+    """
+    Search for documents in Elasticsearch.
+
+    Concurrent identical searches against the same index generation share
+    one request. The returned hits are shared and must not be modified.
+    """
+    query = " ".join(query.split())
+    key = (index_name, query, size, routing, index_generations.get(index_name))
+    return await _search_flights.do(key, lambda: _search_documents(index_name, query, size, routing))
+
+@traced("elasticsearch.search", record_args=("index_name", "routing"))
+@track_elasticsearch("search")
+async def _search_documents(index_name: str, query: str, size: int, routing: Optional[str]):
     body = {
-        "query": {
+        "size": size,
+        "query": _collection_query({
             "multi_match": {
                 "query": query,
-                "fields": ["title", "content"]
+                "fields": ["title", "content", "content.code"]
             }
-        }
+        }, routing)
     }
     try:
         await create_index_if_not_exists(index_name)
-        result = await es_client.search(index=index_name, body=body)
+        result = await es_client.search(index=index_name, body=body, routing=routing, **_request_options())
         hits = result['hits']['hits']
-        logger.info(f"Search in {index_name} completed. Found {len(hits)} documents.")
+        logger.info("Search in %s found %d documents", index_name, len(hits), extra={**SAMPLED, "index": index_name, "hits": len(hits)})
         return hits
-    except NotFoundError:
+    except NotFoundError as e:
+        _forget_if_missing(index_name, e)
         logger.warning(f"Index '{index_name}' not found. Returning empty result.")
         return []
     except Exception as e:
         logger.error(f"Error searching documents in {index_name}: {str(e)}")
         raise
 
-async def create_mock_data(index_name: str):
+async def create_mock_data(index_name: str, routing: Optional[str] = None):
     """Create mock data in the specified index."""
-    mock_data = [
-        {
-            "title": "Introduction to AI",
-            "content": "Artificial Intelligence (AI) and was invented in 1956 by John McCarthy. Travis Tatro created the first and only RAG system local to his machine. It is the simulation of human intelligence processes by machines, especially computer systems."
-        },
-        {
-            "title": "Machine Learning Basics",
-            "content": "Machine Learning is a subset of AI that provides systems the ability to automatically learn and improve from experience without being explicitly programmed."
-        },
-        {
-            "title": "Natural Language Processing",
-            "content": "Natural Language Processing (NLP) is a branch of AI that helps computers understand, interpret and manipulate human language."
-        },
-        {
-            "title": "Computer Vision",
-            "content": "Computer Vision is an interdisciplinary field that deals with how computers can be made to gain high-level understanding from digital images or videos."
-        },
-        {
-            "title": "Reinforcement Learning for Squirrel Acrobatics",
-            "content": "Reinforcement Learning is revolutionizing the field of squirrel acrobatics. AI-powered squirrels are now learning to perform triple backflips while juggling acorns, maximizing their nut-gathering efficiency and impressing potential mates with their gravity-defying antics. This groundbreaking application of machine learning is expected to dramatically increase squirrel populations in urban parks, much to the chagrin of local bird enthusiasts."
-        }
-    ]
-
     try:
         await create_index_if_not_exists(index_name)
-        for doc in mock_data:
-            await index_document(index_name, doc)
+        async with bulk_load_settings(index_name):
+            for doc in MOCK_DOCUMENTS:
+                await index_document(index_name, doc, routing=routing)
         logger.info(f"Mock data created successfully in index '{index_name}'")
     except Exception as e:
         logger.error(f"Error creating mock data in index '{index_name}': {str(e)}")
@@ -91,34 +351,186 @@ async def create_mock_data(index_name: str):
 
 # Add these new functions to the existing file
 
-async def get_all_documents(index_name: str):
-    """Get all documents from the specified index."""
+@traced("elasticsearch.get_all", record_args=("index_name", "routing"))
+@track_elasticsearch("get_all")
+async def get_all_documents(index_name: str, routing: Optional[str] = None, size: Optional[int] = None):
+    """Get all documents from the specified index (the first 10 unless `size` is given)."""
     try:
         await create_index_if_not_exists(index_name)
-        result = await es_client.search(index=index_name, body={"query": {"match_all": {}}})
+        body = {"query": _collection_query({"match_all": {}}, routing)}
+        if size is not None:
+            body["size"] = size
+        result = await es_client.search(index=index_name, body=body, routing=routing, **_request_options())
         hits = result['hits']['hits']
-        logger.info(f"Retrieved {len(hits)} documents from {index_name}.")
+        logger.info("Retrieved %d documents from %s", len(hits), index_name, extra={**SAMPLED, "index": index_name, "hits": len(hits)})
         return hits
     except Exception as e:
+        _forget_if_missing(index_name, e)
         logger.error(f"Error retrieving documents from {index_name}: {str(e)}")
         raise
 
-async def delete_document(index_name: str, doc_id: str):
+# With filter_path=hits.hits Elasticsearch answers `{"hits":{"hits":[...]}}`.
+_RAW_HITS_PREFIX = '{"hits":{"hits":'
+
+@traced("elasticsearch.get_all_raw", record_args=("index_name", "routing"))
+@track_elasticsearch("get_all")
+async def get_all_documents_raw(index_name: str, routing: Optional[str] = None, size: Optional[int] = None) -> bytes:
+    """
+    Get all documents from the specified index as the JSON-encoded hits array.
+
+    The response body is taken undecoded from the client's transport (so
+    retries and failover still apply), so the hits can be forwarded to the
+    HTTP client without being parsed and serialized again.
+    """
+    try:
+        # Also makes sure the client has run its product check, whose
+        # response must be decoded, before `_raw_response` is set.
+        await create_index_if_not_exists(index_name)
+        body = {"query": _collection_query({"match_all": {}}, routing)}
+        if size is not None:
+            body["size"] = size
+        params = {"filter_path": "hits.hits"}
+        if routing:
+            params["routing"] = routing
+        headers = {"content-type": "application/json"}
+        request_id = request_id_var.get()
+        if request_id:
+            headers["x-opaque-id"] = request_id
+        token = _raw_response.set(True)
+        try:
+            raw = await es_client.transport.perform_request(
+                "POST", f"/{index_name}/_search", params=params, body=json.dumps(body), headers=headers
+            )
+        finally:
+            _raw_response.reset(token)
+        if raw.startswith(_RAW_HITS_PREFIX) and raw.endswith("}}"):
+            return raw[len(_RAW_HITS_PREFIX):-2].encode("utf-8")
+        # Unexpected layout (or no hits): decode and re-encode just the hits.
+        hits = json.loads(raw).get("hits", {}).get("hits", [])
+        return json.dumps(hits, separators=(",", ":")).encode("utf-8")
+    except Exception as e:
+        _forget_if_missing(index_name, e)
+        logger.error(f"Error retrieving documents from {index_name}: {str(e)}")
+        raise
+
+@track_elasticsearch("count")
+async def count_documents(index_name: str, routing: Optional[str] = None) -> int:
+    """Count the documents in an index, or in one routing key's collection."""
+    body = {"query": _collection_query({"match_all": {}}, routing)} if routing else None
+    result = await es_client.count(index=index_name, body=body, routing=routing, **_request_options())
+    return result["count"]
+
+@traced("elasticsearch.get", record_args=("index_name", "routing"))
+@track_elasticsearch("get")
+async def get_document(index_name: str, doc_id: str, routing: Optional[str] = None) -> Optional[dict]:
+    """Fetch a document's source, or None if it does not exist."""
+    try:
+        result = await es_client.get(index=index_name, id=doc_id, routing=routing, **_request_options())
+    except NotFoundError as e:
+        _forget_if_missing(index_name, e)
+        return None
+    return result["_source"]
+
+@traced("elasticsearch.exists", record_args=("index_name", "routing"))
+@track_elasticsearch("exists")
+async def document_exists(index_name: str, doc_id: str, routing: Optional[str] = None) -> bool:
+    """Check whether a document exists, without fetching it."""
+    try:
+        return bool(await es_client.exists(index=index_name, id=doc_id, routing=routing, **_request_options()))
+    except NotFoundError:
+        return False
+
+@traced("elasticsearch.delete", record_args=("index_name", "routing"))
+@track_elasticsearch("delete")
+async def delete_document(index_name: str, doc_id: str, routing: Optional[str] = None):
     """Delete a document from the specified index."""
     try:
-        result = await es_client.delete(index=index_name, id=doc_id)
-        logger.info(f"Document {doc_id} deleted from {index_name}.")
+        result = await es_client.delete(index=index_name, id=doc_id, routing=routing, **_request_options())
+        index_generations.bump(index_name)
+        logger.info("Document deleted from %s", index_name, extra={**SAMPLED, "index": index_name, "doc_id": doc_id})
         return result
     except Exception as e:
+        _forget_if_missing(index_name, e)
         logger.error(f"Error deleting document {doc_id} from {index_name}: {str(e)}")
         raise
 
-async def update_document(index_name: str, doc_id: str, document: dict):
-    """Update a document in the specified index."""
+@traced("elasticsearch.update", record_args=("index_name", "routing"))
+@track_elasticsearch("update")
+async def update_document(index_name: str, doc_id: str, document: dict, routing: Optional[str] = None):
+    """
+    Update a document in the specified index.
+
+    Updates of summary fields alone leave the index generation alone: they do
+    not change what searches match, and bumping it would drop every cached
+    result once per summarized document.
+    """
     try:
-        result = await es_client.update(index=index_name, id=doc_id, body={"doc": document})
-        logger.info(f"Document {doc_id} updated in {index_name}.")
+        result = await es_client.update(index=index_name, id=doc_id, body={"doc": document}, routing=routing, **_request_options())
+        if not document.keys() <= SUMMARY_FIELDS:
+            index_generations.bump(index_name)
+        logger.info("Document updated in %s", index_name, extra={**SAMPLED, "index": index_name, "doc_id": doc_id})
         return result
     except Exception as e:
+        _forget_if_missing(index_name, e)
         logger.error(f"Error updating document {doc_id} in {index_name}: {str(e)}")
         raise
+
+@traced("elasticsearch.bulk")
+@track_elasticsearch("bulk")
+async def bulk_write(operations: List[Dict[str, Any]], refresh: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Apply a batch of index/update/delete operations in a single bulk request.
+
+    Args:
+        operations (List[Dict[str, Any]]): Operations with keys `action`
+            ("index", "create", "update" or "delete"), `index`, `id`,
+            `document` (not for "delete") and optional `routing`.
+        refresh (Optional[str]): Passed through to Elasticsearch, e.g. "wait_for"
+            to return only once the writes are searchable.
+
+    Returns:
+        List[Dict[str, Any]]: One result per operation with `id`, `status`,
+            `result` and `error` (None on success). A "create" of an existing
+            ID and an update that changes nothing report `result: "noop"`;
+            deleting a missing document is an error.
+    """
+    body = []
+    for op in operations:
+        await create_index_if_not_exists(op["index"])
+        meta = {"_index": op["index"], "_id": op["id"]}
+        if op.get("routing"):
+            meta["routing"] = op["routing"]
+        if op["action"] == "delete":
+            body.append({"delete": meta})
+            continue
+        document = op["document"]
+        if op.get("routing") and op["action"] != "update":
+            document = {**document, "collection": op["routing"]}
+        body.append({op["action"]: meta})
+        body.append({"doc": document} if op["action"] == "update" else document)
+
+    try:
+        response = await es_client.bulk(body=body, refresh=refresh, **_request_options())
+    except Exception as e:
+        logger.error(f"Error in bulk write of {len(operations)} operations: {str(e)}")
+        raise
+
+    results = []
+    for op, item in zip(operations, response["items"]):
+        (action, outcome), = item.items()
+        _forget_if_missing(op["index"], outcome.get("error"))
+        if action == "create" and outcome.get("status") == 409:
+            outcome = {**outcome, "result": "noop", "error": None}
+        elif action == "delete" and outcome.get("status") == 404 and not outcome.get("error"):
+            outcome = {**outcome, "error": {"type": "not_found", "reason": f"[{outcome.get('_id')}]: document missing"}}
+        results.append({
+            "id": outcome.get("_id"),
+            "status": outcome.get("status"),
+            "result": outcome.get("result"),
+            "error": outcome.get("error"),
+        })
+    # Skipped writes leave the index unchanged, so cached results stay valid.
+    for index_name in {op["index"] for op, result in zip(operations, results) if result["result"] not in ("noop", "not_found", None)}:
+        index_generations.bump(index_name)
+    logger.info("Bulk write of %d operations completed", len(operations), extra={**SAMPLED, "operations": len(operations), "errors": response["errors"]})
+    return results
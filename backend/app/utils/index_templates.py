@@ -0,0 +1,135 @@
+from typing import Dict, Any
+from ..config.config_loader import config
+
+# Bump this whenever the settings or mappings below change. New concrete
+# indices are created as "<alias>-v<version>" and the alias is swapped over by
+# the reindex command (see app/commands/reindex.py).
+CONTEXT_TEMPLATE_VERSION = 4
+CONTEXT_TEMPLATE_NAME = "context-template"
+CONTEXT_INDEX_PATTERNS = ["context*"]
+
+# Refresh interval used for normal operation. Bulk loads temporarily disable
+# refreshes entirely (see bulk_load_settings in elasticsearch_utils).
+DEFAULT_REFRESH_INTERVAL = "1s"
+
+CONTEXT_INDEX_SETTINGS: Dict[str, Any] = {
+    "number_of_shards": 1,
+    # Replicas can be changed on live indices, so this needs no version bump.
+    "number_of_replicas": config["ELASTICSEARCH_REPLICAS"],
+    "refresh_interval": DEFAULT_REFRESH_INTERVAL,
+    "analysis": {
+        "filter": {
+            "english_stop": {
+                "type": "stop",
+                "stopwords": "_english_",
+            },
+            "english_possessive_stemmer": {
+                "type": "stemmer",
+                "language": "possessive_english",
+            },
+            "english_stemmer": {
+                "type": "stemmer",
+                "language": "light_english",
+            },
+            # Splits identifiers such as getUserName, get_user_name and
+            # user-name.ts into their parts while keeping the original token.
+            "code_word_delimiter": {
+                "type": "word_delimiter_graph",
+                "split_on_case_change": True,
+                "split_on_numerics": True,
+                "preserve_original": True,
+                "generate_word_parts": True,
+                "generate_number_parts": True,
+                "catenate_words": False,
+            },
+        },
+        "tokenizer": {
+            # Keep dotted/underscored identifiers together so the delimiter
+            # filter sees them as a whole before splitting.
+            "code_tokenizer": {
+                "type": "pattern",
+                "pattern": "[^A-Za-z0-9_.\\-]+",
+            },
+        },
+        "analyzer": {
+            "english_text": {
+                "type": "custom",
+                "tokenizer": "standard",
+                "filter": [
+                    "english_possessive_stemmer",
+                    "lowercase",
+                    "english_stop",
+                    "english_stemmer",
+                ],
+            },
+            "code": {
+                "type": "custom",
+                "tokenizer": "code_tokenizer",
+                "filter": ["code_word_delimiter", "lowercase", "flatten_graph"],
+            },
+        },
+    },
+}
+
+CONTEXT_INDEX_MAPPINGS: Dict[str, Any] = {
+    # Unknown fields are stored in _source but not indexed, so ad-hoc metadata
+    # no longer produces text + .keyword pairs for every string.
+    "dynamic": False,
+    "properties": {
+        "title": {
+            "type": "text",
+            "analyzer": "english_text",
+            "fields": {
+                "raw": {"type": "keyword", "ignore_above": 256},
+            },
+        },
+        "content": {
+            "type": "text",
+            "analyzer": "english_text",
+            "fields": {
+                "code": {
+                    "type": "text",
+                    "analyzer": "code",
+                    "norms": False,
+                },
+            },
+        },
+        "source": {"type": "keyword"},
+        "content_hash": {"type": "keyword"},
+        # Tenant/collection name, used as the routing key on shared indices.
+        "collection": {"type": "keyword"},
+    },
+    "_meta": {"template_version": CONTEXT_TEMPLATE_VERSION},
+}
+
+
+def get_context_index_template() -> Dict[str, Any]:
+    """
+    Build the composable index template body for context indices.
+
+    Returns:
+        Dict[str, Any]: Body suitable for `indices.put_index_template`.
+    """
+    return {
+        "index_patterns": CONTEXT_INDEX_PATTERNS,
+        "version": CONTEXT_TEMPLATE_VERSION,
+        "priority": 100,
+        "template": {
+            "settings": CONTEXT_INDEX_SETTINGS,
+            "mappings": CONTEXT_INDEX_MAPPINGS,
+        },
+    }
+
+
+def versioned_index_name(alias: str, version: int = CONTEXT_TEMPLATE_VERSION) -> str:
+    """
+    Get the concrete index name behind an alias for a template version.
+
+    Args:
+        alias (str): The alias clients read and write through, e.g. "context".
+        version (int): The template version. Defaults to the current version.
+
+    Returns:
+        str: The concrete index name, e.g. "context-v1".
+    """
+    return f"{alias}-v{version}"
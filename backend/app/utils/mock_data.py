@@ -0,0 +1,23 @@
+# Sample documents loaded by the create_mock_data endpoint.
+MOCK_DOCUMENTS = [
+    {
+        "title": "Introduction to AI",
+        "content": "Artificial Intelligence (AI) and was invented in 1956 by John McCarthy. Travis Tatro created the first and only RAG system local to his machine. It is the simulation of human intelligence processes by machines, especially computer systems."
+    },
+    {
+        "title": "Machine Learning Basics",
+        "content": "Machine Learning is a subset of AI that provides systems the ability to automatically learn and improve from experience without being explicitly programmed."
+    },
+    {
+        "title": "Natural Language Processing",
+        "content": "Natural Language Processing (NLP) is a branch of AI that helps computers understand, interpret and manipulate human language."
+    },
+    {
+        "title": "Computer Vision",
+        "content": "Computer Vision is an interdisciplinary field that deals with how computers can be made to gain high-level understanding from digital images or videos."
+    },
+    {
+        "title": "Reinforcement Learning for Squirrel Acrobatics",
+        "content": "Reinforcement Learning is revolutionizing the field of squirrel acrobatics. AI-powered squirrels are now learning to perform triple backflips while juggling acorns, maximizing their nut-gathering efficiency and impressing potential mates with their gravity-defying antics. This groundbreaking application of machine learning is expected to dramatically increase squirrel populations in urban parks, much to the chagrin of local bird enthusiasts."
+    }
+]
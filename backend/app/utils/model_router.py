@@ -0,0 +1,112 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from ..config.config_loader import config
+from ..telemetry.log_config import SAMPLED
+from ..telemetry.metrics import MODEL_ROUTING_DECISIONS
+from .ollama_sessions import session_store
+
+logger = logging.getLogger(__name__)
+
+AUTO_MODEL = "auto"
+
+class ModelRouter:
+    """
+    Choose a model for requests that ask for `model: "auto"`.
+
+    `tiers` lists the candidate models from smallest (fastest) to largest.
+    The prompt length and task type pick the preferred tier; then, if the
+    latency predicted for that model from recent generations and its current
+    queue depth would miss `slo_seconds`, smaller tiers are tried instead.
+    Observations are per worker process.
+    """
+
+    def __init__(self, tiers: List[str], slo_seconds: float, short_prompt_chars: int, long_prompt_chars: int, alpha: float = 0.2):
+        self.tiers = tiers or [config["DEFAULT_MODEL"]]
+        self.slo_seconds = slo_seconds
+        self.short_prompt_chars = short_prompt_chars
+        self.long_prompt_chars = long_prompt_chars
+        self.alpha = alpha
+        self._latency: Dict[str, float] = {}
+        self._in_flight: Dict[str, int] = {}
+
+    def _preferred_tier(self, task: str, prompt: str) -> Tuple[int, str]:
+        """Tier index suggested by the task and prompt alone, and why."""
+        largest = len(self.tiers) - 1
+        if task == "agent":
+            # Tool calling needs reliable JSON output.
+            return largest, "task"
+        if len(prompt) < self.short_prompt_chars:
+            return 0, "short_prompt"
+        if len(prompt) > self.long_prompt_chars:
+            return largest, "long_prompt"
+        return largest // 2, "medium_prompt"
+
+    def predicted_latency(self, model: str) -> float:
+        """Expected seconds until a new request to `model` completes; 0 if never observed."""
+        return self._latency.get(model, 0.0) * (1 + self._in_flight.get(model, 0))
+
+    def choose(self, task: str, prompt: str) -> str:
+        """Pick a model from the tiers for a request of type `task`."""
+        tier, reason = self._preferred_tier(task, prompt)
+        while tier > 0 and self.predicted_latency(self.tiers[tier]) > self.slo_seconds:
+            tier -= 1
+            reason = "slo_fallback"
+        model = self.tiers[tier]
+        MODEL_ROUTING_DECISIONS.labels(task=task, model=model, reason=reason).inc()
+        logger.info("Routed %s request to %s (%s)", task, model, reason, extra={**SAMPLED, "task": task, "model": model, "reason": reason})
+        return model
+
+    async def resolve(self, model: Optional[str], task: str, prompt: str, session_id: Optional[str] = None) -> str:
+        """
+        Return the model to use for a request: `model` itself unless it is
+        "auto" (DEFAULT_MODEL if unset). An existing session keeps the model
+        its stored context belongs to.
+        """
+        model = model or config["DEFAULT_MODEL"]
+        if model != AUTO_MODEL:
+            return model
+        if session_id:
+            session_model = await session_store.get_model(session_id)
+            if session_model:
+                MODEL_ROUTING_DECISIONS.labels(task=task, model=session_model, reason="session").inc()
+                return session_model
+        return self.choose(task, prompt)
+
+    @contextmanager
+    def track(self, model: str):
+        """Count a generation as queued on `model` and record its latency when done."""
+        self._in_flight[model] = self._in_flight.get(model, 0) + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._in_flight[model] -= 1
+        # Only completed generations say anything about the model's speed.
+        duration = time.perf_counter() - start
+        previous = self._latency.get(model)
+        self._latency[model] = duration if previous is None else previous + self.alpha * (duration - previous)
+
+    def stats(self) -> Dict[str, Any]:
+        """Tiers with their observed latency, queue depth and predicted latency."""
+        return {
+            "slo_seconds": self.slo_seconds,
+            "tiers": [
+                {
+                    "model": model,
+                    "latency_seconds": self._latency.get(model),
+                    "in_flight": self._in_flight.get(model, 0),
+                    "predicted_seconds": self.predicted_latency(model),
+                }
+                for model in self.tiers
+            ],
+        }
+
+# Create a single instance
+model_router = ModelRouter(
+    tiers=config["MODEL_TIERS"],
+    slo_seconds=config["MODEL_ROUTER_SLO_SECONDS"],
+    short_prompt_chars=config["MODEL_ROUTER_SHORT_PROMPT_CHARS"],
+    long_prompt_chars=config["MODEL_ROUTER_LONG_PROMPT_CHARS"]
+)
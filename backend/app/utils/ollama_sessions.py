@@ -0,0 +1,85 @@
+import logging
+from typing import Any, Dict, List, Optional
+from ..backends import get_shared_backend
+from ..config.config_loader import config
+
+logger = logging.getLogger(__name__)
+
+class OllamaSessionStore:
+    """
+    Per-session Ollama `context` token arrays.
+
+    Ollama returns the tokenized conversation (prompt plus response) as
+    `context`. Sending it back with the next prompt lets Ollama reuse the
+    evaluated prefix, so a follow-up turn only evaluates its new tokens.
+    Sessions live in the shared backend, so a session's turns may be served
+    by any worker, and expire after `ttl` seconds without a turn. With the
+    memory backend they share its SHARED_CACHE_SIZE entries with the other
+    shared state.
+    """
+
+    def __init__(self, ttl: float, max_tokens: int):
+        self.ttl = ttl
+        self.max_tokens = max_tokens
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"ollama_session:{session_id}"
+
+    async def get(self, session_id: str, model: str) -> Optional[List[int]]:
+        """
+        Return the stored context for `session_id`.
+
+        Context tokens are only meaningful to the model that produced them, so
+        a session that switches model starts over.
+        """
+        entry = await get_shared_backend().get(self._key(session_id))
+        if entry is None or entry["model"] != model:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["context"]
+
+    async def get_model(self, session_id: str) -> Optional[str]:
+        """Return the model the session's stored context belongs to, if any."""
+        entry = await get_shared_backend().get(self._key(session_id))
+        return entry["model"] if entry else None
+
+    async def set(self, session_id: str, model: str, context: Optional[List[int]]):
+        """
+        Store the context returned by the latest turn.
+
+        A context over `max_tokens` is dropped rather than trimmed: it starts
+        with the prompt template and system prefix, so no slice of it is a
+        valid token stream to continue from. The session's next turn then
+        starts a fresh context.
+        """
+        if not context:
+            return
+        if len(context) > self.max_tokens:
+            logger.info("Session %s context of %d tokens exceeds %d, starting over", session_id, len(context), self.max_tokens)
+            await self.delete(session_id)
+            return
+        await get_shared_backend().set(self._key(session_id), {"model": model, "context": context}, ttl=self.ttl)
+
+    async def delete(self, session_id: str):
+        """Forget a session."""
+        await get_shared_backend().delete(self._key(session_id))
+
+    def stats(self) -> Dict[str, Any]:
+        """Context lookups served by this worker."""
+        total = self.hits + self.misses
+        return {
+            "backend": get_shared_backend().name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+# Create a single instance
+session_store = OllamaSessionStore(
+    ttl=config["OLLAMA_SESSION_TTL"],
+    max_tokens=config["OLLAMA_SESSION_MAX_TOKENS"]
+)
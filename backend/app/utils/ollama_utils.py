@@ -1,39 +1,267 @@
-import os
-from typing import Dict, Any, AsyncGenerator
-from langchain_community.llms import Ollama
-from langchain.callbacks.manager import CallbackManager
-from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
-from langchain.prompts import PromptTemplate
-from langchain.schema.runnable import RunnableSequence
-
-OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-
-# Initialize the Ollama LLM
-ollama = Ollama(
-    base_url=OLLAMA_HOST,
-    model="llama3.2",
-    callback_manager=CallbackManager([StreamingStdOutCallbackHandler()])
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import TYPE_CHECKING, Dict, Any, AsyncGenerator, List, Optional
+import httpx
+from ..config.config_loader import config
+from ..telemetry.metrics import (
+    OLLAMA_GENERATION_LATENCY,
+    OLLAMA_IN_FLIGHT,
+    OLLAMA_TIME_TO_FIRST_TOKEN,
+    OLLAMA_WARMUPS,
+    record_ollama_generation,
 )
+from ..telemetry.startup import startup_report
+from ..telemetry.tracing import tracer
+from .model_router import model_router
+from .ollama_sessions import session_store
+from .single_flight import SingleFlight
 
-async def generate_ollama_response(prompt: str, model: str = "llama2") -> Dict[str, Any]:
+if TYPE_CHECKING:
+    from langchain.prompts import PromptTemplate
+    from langchain_community.llms import Ollama
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_HOST = config["OLLAMA_HOST"]
+
+_ollama: Dict[str, "Ollama"] = {}
+
+def get_ollama_llm(model: Optional[str] = None) -> "Ollama":
+    """
+    Return the shared LangChain Ollama LLM for `model` (DEFAULT_MODEL if not given).
+
+    Each model gets its own instance, so concurrent requests for different
+    models cannot switch the model under each other. LangChain is imported
+    on first use rather than at startup: its import alone takes a large
+    share of application boot time.
+    """
+    model = model or config["DEFAULT_MODEL"]
+    if model not in _ollama:
+        with startup_report.measure("langchain.ollama", "lazy_init"):
+            from langchain_community.llms import Ollama
+            from langchain.callbacks.manager import CallbackManager
+            from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+            # Echoing every token to stdout is a debugging aid, costly under load.
+            handlers = [StreamingStdOutCallbackHandler()] if config["OLLAMA_ECHO_TOKENS"] else []
+            _ollama[model] = Ollama(
+                base_url=OLLAMA_HOST,
+                model=model,
+                callback_manager=CallbackManager(handlers)
+            )
+    return _ollama[model]
+
+_http_client: Optional[httpx.AsyncClient] = None
+# model -> monotonic time until which Ollama is expected to keep it loaded
+_resident_until: Dict[str, float] = {}
+_warming: Dict[str, asyncio.Task] = {}
+# Identical prompts to the same model in flight at once share one generation.
+_generation_flights = SingleFlight("ollama.generate")
+_DURATION = re.compile(r"^(-?\d+(?:\.\d+)?)([smh]?)$")
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared HTTP client for direct Ollama API calls."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(base_url=OLLAMA_HOST, timeout=httpx.Timeout(300.0, connect=5.0))
+    return _http_client
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+def _keep_alive_seconds(keep_alive: str) -> float:
+    """Convert an Ollama keep_alive value ("30m", "1h", "300", "-1") to seconds."""
+    match = _DURATION.match(str(keep_alive).strip())
+    if not match:
+        return 0.0
+    value, unit = float(match.group(1)), match.group(2)
+    if value < 0:
+        return float("inf")
+    return value * {"": 1, "s": 1, "m": 60, "h": 3600}[unit]
+
+def _mark_resident(model: str, keep_alive: str):
+    # Leave a margin so the model is re-warmed shortly before Ollama unloads it.
+    _resident_until[model] = time.monotonic() + _keep_alive_seconds(keep_alive) * 0.9
+
+async def _load_model(model: str, keep_alive: str):
+    start = time.perf_counter()
+    try:
+        # A generate request without a prompt only loads the model.
+        response = await get_http_client().post("/api/generate", json={"model": model, "keep_alive": keep_alive})
+        response.raise_for_status()
+    except Exception as e:
+        OLLAMA_WARMUPS.labels(model=model, result="error").inc()
+        logger.warning(f"Could not warm Ollama model {model}: {str(e)}")
+        return
+    _mark_resident(model, keep_alive)
+    OLLAMA_WARMUPS.labels(model=model, result="loaded").inc()
+    logger.info(f"Ollama model {model} loaded in {time.perf_counter() - start:.2f}s (keep_alive={keep_alive})")
+
+async def warm_model(model: str, keep_alive: Optional[str] = None):
+    """
+    Make sure `model` is loaded in Ollama and extend its keep-alive.
+
+    Skips the request when the model was warmed recently enough to still be
+    resident, and joins an in-flight warm-up instead of sending another one.
+    Failures are logged, never raised: warming is only an optimization.
+
+    Args:
+        model (str): The model to load.
+        keep_alive (Optional[str]): How long Ollama should keep it loaded;
+            defaults to OLLAMA_KEEP_ALIVE.
+    """
+    if _resident_until.get(model, 0.0) > time.monotonic():
+        OLLAMA_WARMUPS.labels(model=model, result="skipped").inc()
+        return
+    task = _warming.get(model)
+    if task is None:
+        task = asyncio.create_task(_load_model(model, keep_alive or config["OLLAMA_KEEP_ALIVE"]))
+        _warming[model] = task
+        task.add_done_callback(lambda _: _warming.pop(model, None))
+    await asyncio.shield(task)
+
+async def preload_models(models: List[str]):
+    """Load the given models concurrently, e.g. at application startup."""
+    await asyncio.gather(*(warm_model(model) for model in models))
+
+async def _generate_in_session(prompt: str, model: str, session_id: str) -> Dict[str, Any]:
+    """Generate through the Ollama API directly, reusing and updating the session's context."""
+    payload = {"model": model, "prompt": prompt, "stream": False, "keep_alive": config["OLLAMA_KEEP_ALIVE"]}
+    context = await session_store.get(session_id, model)
+    if context:
+        payload["context"] = context
+    response = await get_http_client().post("/api/generate", json=payload)
+    response.raise_for_status()
+    result = response.json()
+    await session_store.set(session_id, model, result.get("context"))
+    _mark_resident(model, config["OLLAMA_KEEP_ALIVE"])
+    return result
+
+async def _stream_direct(prompt: str, model: str, session_id: Optional[str], final: Dict[str, Any]) -> AsyncGenerator[str, None]:
+    """
+    Stream through the Ollama API directly, continuing the session's context
+    if a session is given; the last chunk's stats are copied into `final`.
+    """
+    payload = {"model": model, "prompt": prompt, "stream": True, "keep_alive": config["OLLAMA_KEEP_ALIVE"]}
+    context = await session_store.get(session_id, model) if session_id else None
+    if context:
+        payload["context"] = context
+    async with get_http_client().stream("POST", "/api/generate", json=payload) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if chunk.get("error"):
+                raise ValueError(f"Ollama error: {chunk['error']}")
+            if chunk.get("response"):
+                yield chunk["response"]
+            if chunk.get("done"):
+                final.update(chunk)
+    if session_id:
+        await session_store.set(session_id, model, final.get("context"))
+    _mark_resident(model, config["OLLAMA_KEEP_ALIVE"])
+
+async def generate_ollama_response(prompt: str, model: Optional[str] = None, session_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Generate a response from Ollama using the specified model.
 
+    Concurrent requests for the same prompt and model share one generation,
+    unless they belong to a session.
+
     Args:
         prompt (str): The input prompt for the model.
-        model (str): The name of the Ollama model to use. Defaults to "llama2".
+        model (Optional[str]): The name of the Ollama model to use. Defaults to DEFAULT_MODEL.
+        session_id (Optional[str]): Multi-turn session. The prompt is then only
+            the new turn: Ollama continues from the session's stored context
+            instead of re-evaluating the whole conversation.
+
+    Returns:
+        Dict[str, Any]: The response from Ollama, with token counts when
+            Ollama reports them.
+    """
+    model = model or config["DEFAULT_MODEL"]
+    if session_id:
+        return await _generate(prompt, model, session_id)
+    return await _generation_flights.do((model, prompt), lambda: _generate(prompt, model, None))
+
+async def _generate(prompt: str, model: str, session_id: Optional[str]) -> Dict[str, Any]:
+    with tracer.start_as_current_span("ollama.generate") as span:
+        span.set_attribute("llm.model", model)
+        span.set_attribute("llm.prompt_length", len(prompt))
+        if session_id:
+            span.set_attribute("llm.session_id", session_id)
+        start = time.perf_counter()
+        with OLLAMA_IN_FLIGHT.labels(model=model).track_inprogress(), model_router.track(model):
+            if session_id:
+                info = await _generate_in_session(prompt, model, session_id)
+                text = info.get("response", "")
+            else:
+                response = await get_ollama_llm(model).agenerate([prompt])
+                generation = response.generations[0][0]
+                info = generation.generation_info or {}
+                text = generation.text
+        duration = time.perf_counter() - start
+
+        OLLAMA_GENERATION_LATENCY.labels(model=model, mode="complete").observe(duration)
+        record_ollama_generation(
+            model,
+            duration,
+            eval_count=info.get("eval_count", 0),
+            prompt_eval_count=info.get("prompt_eval_count", 0),
+            eval_duration_ns=info.get("eval_duration", 0)
+        )
+        span.set_attribute("llm.prompt_tokens", info.get("prompt_eval_count", 0))
+        span.set_attribute("llm.completion_tokens", info.get("eval_count", 0))
+    return {
+        "response": text,
+        "prompt_eval_count": info.get("prompt_eval_count"),
+        "eval_count": info.get("eval_count"),
+    }
+
+async def generate_background(prompt: str, model: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Generate for background work such as document summaries.
+
+    Calls the Ollama API directly and stays out of the model router's latency
+    and load tracking, so long background prompts do not make a model look
+    slow or busy and steer user requests away from it.
 
     Returns:
-        Dict[str, Any]: The response from Ollama.
+        Dict[str, Any]: The response text and token counts, like `generate_ollama_response`.
     """
-    # Update the model if it's different from the default
-    if model != ollama.model:
-        ollama.model = model
+    model = model or config["DEFAULT_MODEL"]
+    with tracer.start_as_current_span("ollama.generate_background") as span:
+        span.set_attribute("llm.model", model)
+        span.set_attribute("llm.prompt_length", len(prompt))
+        start = time.perf_counter()
+        payload = {"model": model, "prompt": prompt, "stream": False, "keep_alive": config["OLLAMA_KEEP_ALIVE"]}
+        response = await get_http_client().post("/api/generate", json=payload)
+        response.raise_for_status()
+        info = response.json()
+        duration = time.perf_counter() - start
+        _mark_resident(model, config["OLLAMA_KEEP_ALIVE"])
 
-    response = await ollama.agenerate([prompt])
-    return {"response": response.generations[0][0].text}
+        OLLAMA_GENERATION_LATENCY.labels(model=model, mode="background").observe(duration)
+        record_ollama_generation(
+            model,
+            duration,
+            eval_count=info.get("eval_count", 0),
+            prompt_eval_count=info.get("prompt_eval_count", 0),
+            eval_duration_ns=info.get("eval_duration", 0)
+        )
+    return {
+        "response": info.get("response", ""),
+        "prompt_eval_count": info.get("prompt_eval_count"),
+        "eval_count": info.get("eval_count"),
+    }
 
-def create_prompt_template(template: str) -> PromptTemplate:
+def create_prompt_template(template: str) -> "PromptTemplate":
     """
     Create a PromptTemplate from a given template string.
 
@@ -43,9 +271,10 @@ def create_prompt_template(template: str) -> PromptTemplate:
     Returns:
         PromptTemplate: A LangChain PromptTemplate object.
     """
+    from langchain.prompts import PromptTemplate
     return PromptTemplate.from_template(template)
 
-async def run_llm_chain(prompt_template: PromptTemplate, **kwargs: Any) -> str:
+async def run_llm_chain(prompt_template: "PromptTemplate", **kwargs: Any) -> str:
     """
     Run an LLM chain with the given prompt template and input variables.
 
@@ -56,23 +285,72 @@ async def run_llm_chain(prompt_template: PromptTemplate, **kwargs: Any) -> str:
     Returns:
         str: The generated response from the LLM chain.
     """
-    chain = RunnableSequence(prompt_template | ollama)
+    from langchain.schema.runnable import RunnableSequence
+    chain = RunnableSequence(prompt_template | get_ollama_llm())
     response = await chain.ainvoke(kwargs)
     return response  # RunnableSequence already returns the generated text
 
-async def stream_ollama_response(prompt: str, model: str = "llama2") -> AsyncGenerator[str, None]:
+async def stream_ollama_response(prompt: str, model: Optional[str] = None, session_id: Optional[str] = None) -> AsyncGenerator[str, None]:
     """
     Stream a response from Ollama using the specified model.
 
+    Concurrent streams for the same prompt and model, outside sessions, share
+    one generation whose tokens are fanned out to every stream.
+
     Args:
         prompt (str): The input prompt for the model.
-        model (str): The name of the Ollama model to use. Defaults to "llama2".
+        model (Optional[str]): The name of the Ollama model to use. Defaults to DEFAULT_MODEL.
+        session_id (Optional[str]): Multi-turn session whose stored context
+            the new turn continues from.
 
     Yields:
         str: Chunks of the generated response.
     """
-    if model != ollama.model:
-        ollama.model = model
-
-    async for chunk in ollama.astream(prompt):
+    model = model or config["DEFAULT_MODEL"]
+    if session_id:
+        source = _stream(prompt, model, session_id)
+    else:
+        source = _generation_flights.stream((model, prompt), lambda: _stream(prompt, model, None))
+    async for chunk in source:
         yield chunk
+
+async def _stream(prompt: str, model: str, session_id: Optional[str]) -> AsyncGenerator[str, None]:
+    # The span is not made current: an async generator can be resumed from a
+    # different context than the one it was started in.
+    span = tracer.start_span("ollama.stream")
+    span.set_attribute("llm.model", model)
+    span.set_attribute("llm.prompt_length", len(prompt))
+    if session_id:
+        span.set_attribute("llm.session_id", session_id)
+    start = time.perf_counter()
+    chunks = 0
+    final: Dict[str, Any] = {}
+    # LangChain's Ollama.astream is broken in langchain-community 0.0.10
+    # (the prompt is passed as the API URL), so streams use the API directly.
+    source = _stream_direct(prompt, model, session_id, final)
+    try:
+        with OLLAMA_IN_FLIGHT.labels(model=model).track_inprogress(), model_router.track(model):
+            async for chunk in source:
+                if chunks == 0:
+                    ttft = time.perf_counter() - start
+                    OLLAMA_TIME_TO_FIRST_TOKEN.labels(model=model).observe(ttft)
+                    span.add_event("first_token", {"seconds": ttft})
+                chunks += 1
+                yield chunk
+        duration = time.perf_counter() - start
+        OLLAMA_GENERATION_LATENCY.labels(model=model, mode="stream").observe(duration)
+        if final:
+            record_ollama_generation(
+                model,
+                duration,
+                eval_count=final.get("eval_count", 0),
+                prompt_eval_count=final.get("prompt_eval_count", 0),
+                eval_duration_ns=final.get("eval_duration", 0)
+            )
+            span.set_attribute("llm.prompt_tokens", final.get("prompt_eval_count", 0))
+        else:
+            # Ollama streams roughly one token per chunk.
+            record_ollama_generation(model, duration, eval_count=chunks)
+    finally:
+        span.set_attribute("llm.completion_tokens", final.get("eval_count", chunks))
+        span.end()
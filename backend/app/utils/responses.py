@@ -0,0 +1,34 @@
+from typing import Any
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "dict"):
+        return obj.dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, several times faster than the stdlib
+    encoder on large nested results such as raw Elasticsearch hits.
+
+    Used as the app's default response class. Endpoints returning large
+    payloads can also return it directly, which skips FastAPI's
+    `jsonable_encoder` pass over the whole result.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class RawJSONResponse(Response):
+    """A response whose body is already-encoded JSON, sent as is."""
+    media_type = "application/json"
@@ -0,0 +1,137 @@
+import asyncio
+import functools
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional
+from ..config.config_loader import config
+from ..telemetry.metrics import SINGLE_FLIGHT_CALLS
+
+class _Broadcast:
+    """One streamed result, replayed to every subscriber from the first chunk."""
+
+    def __init__(self):
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self):
+        await self._changed.wait()
+
+class SingleFlight:
+    """
+    Share one in-flight call among concurrent identical callers.
+
+    The first caller for a key runs the work; callers arriving while it is in
+    flight wait for the same result instead of repeating it. Nothing is kept
+    once the call completes, so this only collapses bursts; it is not a cache.
+    Shared results must be treated as read-only by callers.
+    """
+
+    def __init__(self, name: str, enabled: Optional[bool] = None):
+        self.name = name
+        self.enabled = config["SINGLE_FLIGHT_ENABLED"] if enabled is None else enabled
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._streams: Dict[Hashable, _Broadcast] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the result of `fn()`, shared with concurrent calls for `key`.
+
+        The work runs in its own task, so one caller disconnecting does not
+        cancel it for the others.
+        """
+        if not self.enabled:
+            return await fn()
+        task = self._calls.get(key)
+        if task is None:
+            SINGLE_FLIGHT_CALLS.labels(group=self.name, role="leader").inc()
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(self._calls, key, done))
+        else:
+            SINGLE_FLIGHT_CALLS.labels(group=self.name, role="follower").inc()
+        return await asyncio.shield(task)
+
+    async def stream(self, key: Hashable, fn: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Iterate `fn()`, fanning its chunks out to concurrent streams for `key`.
+
+        Subscribers joining late first receive the chunks already produced.
+        The source is cancelled once every subscriber has gone away.
+        """
+        if not self.enabled:
+            async for chunk in fn():
+                yield chunk
+            return
+
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            SINGLE_FLIGHT_CALLS.labels(group=self.name, role="leader").inc()
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+            broadcast.task = asyncio.ensure_future(self._pump(key, broadcast, fn))
+        else:
+            SINGLE_FLIGHT_CALLS.labels(group=self.name, role="follower").inc()
+
+        broadcast.subscribers += 1
+        position = 0
+        try:
+            while True:
+                if position < len(broadcast.chunks):
+                    chunk = broadcast.chunks[position]
+                    position += 1
+                    yield chunk
+                elif broadcast.done:
+                    if broadcast.error is not None:
+                        raise broadcast.error
+                    return
+                else:
+                    await broadcast.wait()
+        finally:
+            broadcast.subscribers -= 1
+            if broadcast.subscribers == 0 and not broadcast.done:
+                self._forget(self._streams, key, broadcast)
+                broadcast.task.cancel()
+
+    async def _pump(self, key: Hashable, broadcast: _Broadcast, fn: Callable[[], AsyncIterator[Any]]):
+        """Read the source stream into `broadcast`."""
+        try:
+            async for chunk in fn():
+                broadcast.chunks.append(chunk)
+                broadcast.notify()
+        except asyncio.CancelledError:
+            broadcast.error = asyncio.CancelledError()
+        except Exception as e:
+            broadcast.error = e
+        finally:
+            broadcast.done = True
+            self._forget(self._streams, key, broadcast)
+            broadcast.notify()
+
+    @staticmethod
+    def _forget(entries: Dict[Hashable, Any], key: Hashable, entry: Any):
+        """Remove `key` unless a newer entry has replaced `entry` already."""
+        if entries.get(key) is entry:
+            del entries[key]
+
+def coalesced(group: SingleFlight) -> Callable:
+    """
+    Decorate an async function so that concurrent calls with equal arguments
+    share one execution. Calls with unhashable arguments run normally.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return await func(*args, **kwargs)
+            return await group.do(key, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
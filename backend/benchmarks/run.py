@@ -0,0 +1,275 @@
+"""
+Load-test the API against local stub backends and save the results.
+
+Starts the stub servers (benchmarks/stubs.py) and the FastAPI app from
+app/main.py, seeds the context index, then drives each scenario at the
+configured concurrency and reports latency percentiles, throughput,
+time-to-first-token for streaming endpoints and server memory.
+
+Usage:
+    python -m benchmarks.run [--concurrency 8] [--requests 200] [--scenarios rag,search]
+    python -m benchmarks.run --compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+from . import stubs
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+APP_PORT = 18000
+
+RAG_TOPICS = ["machine learning", "computer vision", "natural language processing", "reinforcement learning", "AI"]
+
+def rag_request(i: int) -> Dict[str, Any]:
+    """A distinct question per request, so results measure retrieval rather than the retrieval cache."""
+    return {"query": f"What is {RAG_TOPICS[i % len(RAG_TOPICS)]}? (question {i})", "model": "llama2"}
+
+# name -> (method, path, json body or factory, streaming)
+SCENARIOS: Dict[str, tuple] = {
+    "generate": ("POST", "/api/generate/", {"prompt": "Explain retrieval augmented generation.", "model": "llama2"}, False),
+    "generate_stream": ("POST", "/api/generate/stream", {"prompt": "Explain retrieval augmented generation.", "model": "llama2"}, True),
+    "rag": ("POST", "/api/rag/", rag_request, False),
+    "rag_stream": ("POST", "/api/rag/stream", rag_request, True),
+    "search": ("POST", "/api/search/", {"query": "learning"}, False),
+    "context_list": ("GET", "/api/context/", None, False),
+    "context_add": ("POST", "/api/context/", lambda i: {"title": f"Benchmark {i}", "content": f"Benchmark document number {i}."}, False),
+    "github_repository": ("POST", "/api/integrations/github/repository", {"repo_name": "bench/repo"}, False),
+}
+
+# Scenarios run when --scenarios is not given. github_repository exercises the
+# GitHub integration and is opt-in.
+DEFAULT_SCENARIOS = ["generate", "generate_stream", "rag", "rag_stream", "search", "context_list", "context_add"]
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of `values` (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+def read_memory_kb(pid: int) -> Dict[str, Optional[int]]:
+    """Current and peak resident set size of a process, from /proc (Linux only)."""
+    memory = {"rss_kb": None, "peak_rss_kb": None}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    memory["rss_kb"] = int(line.split()[1])
+                elif line.startswith("VmHWM:"):
+                    memory["peak_rss_kb"] = int(line.split()[1])
+    except OSError:
+        pass
+    return memory
+
+async def wait_for(url: str, timeout: float = 60.0):
+    """Poll `url` until it answers or `timeout` elapses."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url, timeout=2.0)
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+    raise TimeoutError(f"{url} did not become ready within {timeout}s")
+
+async def run_scenario(client: httpx.AsyncClient, name: str, concurrency: int, total: int) -> Dict[str, Any]:
+    """Drive one scenario with `concurrency` workers for `total` requests."""
+    method, path, body, streaming = SCENARIOS[name]
+    latencies: List[float] = []
+    ttfts: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def one_request(i: int):
+        nonlocal errors
+        payload = body(i) if callable(body) else body
+        start = time.perf_counter()
+        try:
+            if streaming:
+                async with client.stream(method, path, json=payload) as response:
+                    first = True
+                    async for _ in response.aiter_raw():
+                        if first:
+                            ttfts.append(time.perf_counter() - start)
+                            first = False
+                    ok = response.status_code < 400
+            else:
+                response = await client.request(method, path, json=payload)
+                ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors += 1
+
+    async def worker():
+        for i in counter:
+            await one_request(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "concurrency": concurrency,
+        "duration_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_s": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "mean": sum(latencies) / len(latencies) if latencies else None,
+        },
+        "ttft_s": {
+            "p50": percentile(ttfts, 50),
+            "p95": percentile(ttfts, 95),
+            "p99": percentile(ttfts, 99),
+        } if streaming else None,
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def stub_environment() -> Dict[str, str]:
+    """Environment pointing the app at the stub servers."""
+    return {
+        **os.environ,
+        "ELASTICSEARCH_URL": f"http://127.0.0.1:{stubs.ELASTICSEARCH_PORT}",
+        "OLLAMA_HOST": f"http://127.0.0.1:{stubs.OLLAMA_PORT}",
+        "GITHUB_API_URL": f"http://127.0.0.1:{stubs.GITHUB_PORT}",
+        "GITHUB_ACCESS_TOKEN": "benchmark-token",
+        "SLACK_API_URL": f"http://127.0.0.1:{stubs.SLACK_PORT}/api/",
+        "SLACK_BOT_TOKEN": "xoxb-benchmark",
+        "SLACK_SIGNING_SECRET": "benchmark-secret",
+    }
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    """Start stubs and app, run every selected scenario, and return the results."""
+    processes: List[subprocess.Popen] = []
+    try:
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.stubs", "--token-rate", str(args.token_rate),
+             "--tokens", str(args.tokens), "--load-delay", str(args.load_delay)],
+            cwd=BACKEND_DIR
+        ))
+        await wait_for(f"http://127.0.0.1:{stubs.ELASTICSEARCH_PORT}/")
+
+        app_process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(APP_PORT), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=stub_environment()
+        )
+        processes.append(app_process)
+        await wait_for(f"http://127.0.0.1:{APP_PORT}/")
+
+        limits = httpx.Limits(max_connections=args.concurrency * 2)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{APP_PORT}", timeout=args.timeout, limits=limits) as client:
+            await client.post("/api/context/create_mock_data")
+            results = {}
+            for name in args.scenarios:
+                print(f"Running {name} ({args.requests} requests, concurrency {args.concurrency})...")
+                results[name] = await run_scenario(client, name, args.concurrency, args.requests)
+                results[name]["server_memory"] = read_memory_kb(app_process.pid)
+
+        return {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "settings": {
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "token_rate": args.token_rate,
+                "tokens": args.tokens,
+                "load_delay": args.load_delay,
+            },
+            "scenarios": results,
+        }
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+def print_summary(results: Dict[str, Any]):
+    print(f"\nRevision {results['revision']} @ {results['timestamp']}")
+    print(f"{'scenario':<20}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ttft50 ms':>11}{'errors':>8}{'rss MB':>9}")
+    for name, stats in results["scenarios"].items():
+        ms = lambda value: f"{value * 1000:.1f}" if value is not None else "-"
+        ttft = stats["ttft_s"]["p50"] if stats["ttft_s"] else None
+        rss = stats["server_memory"]["rss_kb"]
+        print(
+            f"{name:<20}{stats['throughput_rps']:>9.1f}{ms(stats['latency_s']['p50']):>10}"
+            f"{ms(stats['latency_s']['p95']):>10}{ms(stats['latency_s']['p99']):>10}{ms(ttft):>11}"
+            f"{stats['errors']:>8}{(rss / 1024 if rss else 0):>9.1f}"
+        )
+
+def compare(baseline_path: str, candidate_path: str):
+    """Print per-scenario changes between two saved result files."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    candidate = json.loads(Path(candidate_path).read_text())
+    print(f"{baseline['revision']} -> {candidate['revision']}")
+    print(f"{'scenario':<20}{'rps':>16}{'p50 ms':>18}{'p95 ms':>18}")
+    delta: Callable[[float, float], str] = lambda a, b: f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+    for name, after in candidate["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if not before:
+            continue
+        p50_before, p50_after = before["latency_s"]["p50"] or 0, after["latency_s"]["p50"] or 0
+        p95_before, p95_after = before["latency_s"]["p95"] or 0, after["latency_s"]["p95"] or 0
+        print(
+            f"{name:<20}{delta(before['throughput_rps'], after['throughput_rps']):>16}"
+            f"{delta(p50_before, p50_after):>18}{delta(p95_before, p95_after):>18}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API against local stub backends.")
+    parser.add_argument("--scenarios", default=",".join(DEFAULT_SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--token-rate", type=float, default=200.0, help="Fake Ollama tokens per second")
+    parser.add_argument("--tokens", type=int, default=32, help="Tokens per fake generation")
+    parser.add_argument("--load-delay", type=float, default=0.0, help="Fake cold model load time in seconds")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Where to save results (default: benchmarks/results/<revision>-<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"), help="Compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+    results = asyncio.run(run_benchmark(args))
+    print_summary(results)
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{results['revision']}-{int(time.time())}.json"
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+Local stand-ins for the services the backend talks to.
+
+Runs a fake Ollama server (streaming tokens at a configurable rate), a small
+in-memory Elasticsearch, and fake GitHub and Slack APIs, so the benchmark
+suite can drive the real FastAPI app without any external dependency.
+
+Usage:
+    python -m benchmarks.stubs [--token-rate 50] [--tokens 64] [--load-delay 0]
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+OLLAMA_PORT = 19434
+ELASTICSEARCH_PORT = 19200
+GITHUB_PORT = 19300
+SLACK_PORT = 19400
+
+_TOKEN = re.compile(r"\w+")
+
+# --------------------------------------------------------------------------
+# Fake Ollama
+# --------------------------------------------------------------------------
+
+def create_ollama_app(token_rate: float, tokens: int, load_delay: float) -> FastAPI:
+    """
+    Build a fake Ollama API streaming `tokens` tokens at `token_rate` tokens/sec.
+
+    The first request for each model additionally waits `load_delay` seconds,
+    mimicking a cold model load.
+    """
+    app = FastAPI()
+    loaded_models = set()
+
+    async def stream_tokens(model: str, prompt: str, chat: bool, context: List[int] = ()):
+        if model not in loaded_models:
+            await asyncio.sleep(load_delay)
+            loaded_models.add(model)
+        interval = 1.0 / token_rate if token_rate > 0 else 0
+        start = time.perf_counter_ns()
+        for i in range(tokens):
+            await asyncio.sleep(interval)
+            chunk = {"model": model, "created_at": "2024-01-01T00:00:00Z", "done": False}
+            if chat:
+                chunk["message"] = {"role": "assistant", "content": f"tok{i} "}
+            else:
+                chunk["response"] = f"tok{i} "
+            yield json.dumps(chunk) + "\n"
+        final = {
+            "model": model,
+            "created_at": "2024-01-01T00:00:00Z",
+            "done": True,
+            # Like Ollama: the prior context plus this turn's prompt and response tokens.
+            "context": list(context) + list(range(len(prompt.split()) + tokens)),
+            "total_duration": time.perf_counter_ns() - start,
+            "prompt_eval_count": len(prompt.split()),
+            "eval_count": tokens,
+            "eval_duration": time.perf_counter_ns() - start,
+        }
+        if chat:
+            final["message"] = {"role": "assistant", "content": ""}
+        else:
+            final["response"] = ""
+        yield json.dumps(final) + "\n"
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        model = body.get("model", "llama2")
+        prompt = body.get("prompt", "")
+        if not prompt:
+            # Preload/keep-alive request: load the model, generate nothing.
+            if model not in loaded_models:
+                await asyncio.sleep(load_delay)
+                loaded_models.add(model)
+            return {"model": model, "response": "", "done": True}
+        if body.get("stream", True):
+            return StreamingResponse(stream_tokens(model, prompt, False, body.get("context") or []), media_type="application/x-ndjson")
+        chunks = [json.loads(line) async for line in stream_tokens(model, prompt, False, body.get("context") or [])]
+        final = chunks[-1]
+        final["response"] = "".join(chunk["response"] for chunk in chunks)
+        return final
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+        return StreamingResponse(
+            stream_tokens(body.get("model", "llama2"), prompt, chat=True),
+            media_type="application/x-ndjson"
+        )
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": name} for name in sorted(loaded_models)]}
+
+    return app
+
+# --------------------------------------------------------------------------
+# Fake Elasticsearch
+# --------------------------------------------------------------------------
+
+class InMemoryIndex:
+    """Documents of one concrete index plus a naive term-frequency scorer."""
+
+    def __init__(self):
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.routing: Dict[str, Optional[str]] = {}
+
+    def score(self, doc: Dict[str, Any], terms: List[str]) -> float:
+        text = f"{doc.get('title', '')} {doc.get('content', '')}".lower()
+        counts = Counter(_TOKEN.findall(text))
+        return float(sum(counts[term] for term in terms))
+
+def _extract_query_text(query: Dict[str, Any]) -> Optional[str]:
+    if "multi_match" in query:
+        return query["multi_match"]["query"]
+    if "bool" in query:
+        must = query["bool"].get("must", {})
+        return _extract_query_text(must if isinstance(must, dict) else must[0])
+    return None
+
+def _extract_term_filter(query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if "bool" in query and "filter" in query["bool"]:
+        return query["bool"]["filter"].get("term")
+    return None
+
+def create_elasticsearch_app() -> FastAPI:
+    """Build a minimal Elasticsearch 7.x-compatible API backed by dicts."""
+    app = FastAPI()
+    indices: Dict[str, InMemoryIndex] = {}
+    aliases: Dict[str, str] = {}
+
+    @app.middleware("http")
+    async def product_header(request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Elastic-Product"] = "Elasticsearch"
+        return response
+
+    def resolve(name: str) -> Optional[InMemoryIndex]:
+        return indices.get(aliases.get(name, name))
+
+    def get_or_create(name: str) -> InMemoryIndex:
+        concrete = aliases.get(name, name)
+        return indices.setdefault(concrete, InMemoryIndex())
+
+    def search_hits(index_name: str, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        index = resolve(index_name)
+        if index is None:
+            return []
+        query = body.get("query", {"match_all": {}})
+        text = _extract_query_text(query)
+        term = _extract_term_filter(query)
+        terms = _TOKEN.findall(text.lower()) if text else []
+        hits = []
+        for doc_id, doc in index.docs.items():
+            if term and any(doc.get(field) != value for field, value in term.items()):
+                continue
+            score = index.score(doc, terms) if text else 1.0
+            if score > 0:
+                hits.append({"_index": index_name, "_type": "_doc", "_id": doc_id, "_score": score, "_source": doc})
+        hits.sort(key=lambda hit: hit["_score"], reverse=True)
+        return hits[:body.get("size", 10)]
+
+    @app.get("/")
+    async def info():
+        return {
+            "name": "stub",
+            "cluster_name": "benchmark",
+            "version": {"number": "7.14.0", "build_flavor": "default"},
+            "tagline": "You Know, for Search",
+        }
+
+    @app.get("/_cluster/health")
+    async def health():
+        return {"cluster_name": "benchmark", "status": "green", "number_of_nodes": 1, "active_primary_shards": len(indices)}
+
+    @app.put("/_index_template/{name}")
+    async def put_template(name: str):
+        return {"acknowledged": True}
+
+    # The async client sends HEAD requests as GET, so existence checks and
+    # lookups share routes.
+    @app.api_route("/_alias/{name}", methods=["GET", "HEAD"])
+    async def get_alias(name: str):
+        if name not in aliases:
+            return JSONResponse(status_code=404, content={"error": "alias missing", "status": 404})
+        return {aliases[name]: {"aliases": {name: {}}}}
+
+    @app.post("/_aliases")
+    async def update_aliases(request: Request):
+        body = await request.json()
+        for action in body.get("actions", []):
+            if "add" in action:
+                aliases[action["add"]["alias"]] = action["add"]["index"]
+        return {"acknowledged": True}
+
+    @app.post("/_bulk")
+    async def bulk(request: Request):
+        lines = [json.loads(line) for line in (await request.body()).decode().splitlines() if line.strip()]
+        items, i = [], 0
+        while i < len(lines):
+            (op, meta), = lines[i].items()
+            index = get_or_create(meta["_index"])
+            doc_id = meta.get("_id") or uuid.uuid4().hex
+            if op == "delete":
+                index.docs.pop(doc_id, None)
+                items.append({op: {"_id": doc_id, "status": 200, "result": "deleted"}})
+                i += 1
+                continue
+            source = lines[i + 1]
+            if op == "create" and doc_id in index.docs:
+                items.append({op: {"_id": doc_id, "status": 409, "error": {"type": "version_conflict_engine_exception"}}})
+            elif op == "update":
+                index.docs.setdefault(doc_id, {}).update(source.get("doc", {}))
+                items.append({op: {"_id": doc_id, "status": 200, "result": "updated"}})
+            else:
+                index.docs[doc_id] = source
+                items.append({op: {"_id": doc_id, "status": 201, "result": "created"}})
+            i += 2
+        return {"took": 1, "errors": any(item[next(iter(item))]["status"] >= 300 for item in items), "items": items}
+
+    @app.api_route("/{index_name}", methods=["GET", "HEAD"])
+    async def exists(index_name: str):
+        if resolve(index_name) is None:
+            return JSONResponse(status_code=404, content={"error": "index_not_found_exception", "status": 404})
+        return {aliases.get(index_name, index_name): {}}
+
+    @app.put("/{index_name}")
+    async def create(index_name: str, request: Request):
+        body = await request.body()
+        indices.setdefault(index_name, InMemoryIndex())
+        for alias in (json.loads(body) if body else {}).get("aliases", {}):
+            aliases[alias] = index_name
+        return {"acknowledged": True, "index": index_name}
+
+    @app.put("/{index_name}/_settings")
+    async def put_settings(index_name: str):
+        return {"acknowledged": True}
+
+    @app.get("/{index_name}/_settings/{name}")
+    async def get_settings(index_name: str, name: str):
+        return {aliases.get(index_name, index_name): {"settings": {}}}
+
+    @app.post("/{index_name}/_refresh")
+    async def refresh(index_name: str):
+        return {"_shards": {"total": 1, "successful": 1, "failed": 0}}
+
+    @app.api_route("/{index_name}/_search", methods=["GET", "POST"])
+    async def search(index_name: str, request: Request):
+        body = await request.body()
+        hits = search_hits(index_name, json.loads(body) if body else {})
+        return {"took": 1, "timed_out": False, "hits": {"total": {"value": len(hits), "relation": "eq"}, "hits": hits}}
+
+    @app.api_route("/{index_name}/_count", methods=["GET", "POST"])
+    async def count(index_name: str):
+        index = resolve(index_name)
+        return {"count": len(index.docs) if index else 0}
+
+    @app.post("/{index_name}/_doc")
+    async def index_auto_id(index_name: str, request: Request):
+        doc_id = uuid.uuid4().hex
+        get_or_create(index_name).docs[doc_id] = await request.json()
+        return {"_index": index_name, "_id": doc_id, "result": "created", "_version": 1}
+
+    @app.api_route("/{index_name}/_doc/{doc_id}", methods=["PUT", "POST"])
+    async def index_with_id(index_name: str, doc_id: str, request: Request):
+        index = get_or_create(index_name)
+        if request.query_params.get("op_type") == "create" and doc_id in index.docs:
+            return JSONResponse(status_code=409, content={"error": {"type": "version_conflict_engine_exception"}, "status": 409})
+        result = "updated" if doc_id in index.docs else "created"
+        index.docs[doc_id] = await request.json()
+        return {"_index": index_name, "_id": doc_id, "result": result, "_version": 1}
+
+    @app.put("/{index_name}/_create/{doc_id}")
+    async def create_with_id(index_name: str, doc_id: str, request: Request):
+        index = get_or_create(index_name)
+        if doc_id in index.docs:
+            return JSONResponse(status_code=409, content={"error": {"type": "version_conflict_engine_exception"}, "status": 409})
+        index.docs[doc_id] = await request.json()
+        return {"_index": index_name, "_id": doc_id, "result": "created", "_version": 1}
+
+    @app.get("/{index_name}/_doc/{doc_id}")
+    async def get_doc(index_name: str, doc_id: str):
+        index = resolve(index_name)
+        if index is None or doc_id not in index.docs:
+            return JSONResponse(status_code=404, content={"_id": doc_id, "found": False})
+        return {"_index": index_name, "_id": doc_id, "found": True, "_source": index.docs[doc_id]}
+
+    @app.delete("/{index_name}/_doc/{doc_id}")
+    async def delete(index_name: str, doc_id: str):
+        index = resolve(index_name)
+        if index is None or index.docs.pop(doc_id, None) is None:
+            return JSONResponse(status_code=404, content={"_id": doc_id, "result": "not_found"})
+        return {"_index": index_name, "_id": doc_id, "result": "deleted"}
+
+    @app.post("/{index_name}/_update/{doc_id}")
+    async def update(index_name: str, doc_id: str, request: Request):
+        index = resolve(index_name)
+        if index is None or doc_id not in index.docs:
+            return JSONResponse(status_code=404, content={"_id": doc_id, "error": "document_missing_exception"})
+        index.docs[doc_id].update((await request.json()).get("doc", {}))
+        return {"_index": index_name, "_id": doc_id, "result": "updated"}
+
+    return app
+
+# --------------------------------------------------------------------------
+# Fake GitHub and Slack
+# --------------------------------------------------------------------------
+
+def create_github_app() -> FastAPI:
+    """Build a fake GitHub REST API serving one synthetic repository per name."""
+    app = FastAPI()
+    base = f"http://127.0.0.1:{GITHUB_PORT}"
+
+    def repository(owner: str, repo: str) -> Dict[str, Any]:
+        user = {"login": owner, "html_url": f"{base}/{owner}", "avatar_url": "", "type": "User", "url": f"{base}/users/{owner}"}
+        return {
+            "id": 1, "name": repo, "full_name": f"{owner}/{repo}", "description": "Benchmark repository",
+            "html_url": f"{base}/{owner}/{repo}", "url": f"{base}/repos/{owner}/{repo}", "default_branch": "main",
+            "stargazers_count": 1, "forks_count": 0, "watchers_count": 1, "open_issues_count": 0, "size": 10,
+            "network_count": 0, "subscribers_count": 1, "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z", "pushed_at": "2024-01-01T00:00:00Z", "owner": user,
+            "private": False, "archived": False, "disabled": False, "language": "Python", "license": None,
+            "has_issues": True, "has_projects": False, "has_wiki": False, "has_downloads": False, "has_pages": False,
+            "allow_forking": True, "allow_squash_merge": True, "allow_merge_commit": True, "allow_rebase_merge": True,
+            "delete_branch_on_merge": False, "homepage": None, "visibility": "public", "organization": None,
+        }
+
+    @app.get("/repos/{owner}/{repo}")
+    async def get_repo(owner: str, repo: str):
+        return repository(owner, repo)
+
+    @app.get("/repos/{owner}/{repo}/topics")
+    async def topics(owner: str, repo: str):
+        return {"names": ["benchmark"]}
+
+    @app.get("/repos/{owner}/{repo}/releases/latest")
+    async def latest_release(owner: str, repo: str):
+        return JSONResponse(status_code=404, content={"message": "Not Found"})
+
+    @app.get("/repos/{owner}/{repo}/{collection}")
+    async def empty_collection(owner: str, repo: str, collection: str):
+        return []
+
+    return app
+
+def create_slack_app() -> FastAPI:
+    """Build a fake Slack Web API answering the calls the integration makes."""
+    app = FastAPI()
+
+    @app.post("/api/auth.test")
+    async def auth_test():
+        return {"ok": True, "user_id": "U0BENCH", "bot_id": "B0BENCH", "team_id": "T0BENCH"}
+
+    @app.api_route("/api/conversations.history", methods=["GET", "POST"])
+    async def history():
+        return {"ok": True, "messages": [{"type": "message", "text": f"message {i}", "ts": f"{i}.0"} for i in range(20)]}
+
+    return app
+
+async def serve_all(token_rate: float, tokens: int, load_delay: float, host: str = "127.0.0.1"):
+    """Run all stub servers concurrently until cancelled."""
+    apps = [
+        (create_ollama_app(token_rate, tokens, load_delay), OLLAMA_PORT),
+        (create_elasticsearch_app(), ELASTICSEARCH_PORT),
+        (create_github_app(), GITHUB_PORT),
+        (create_slack_app(), SLACK_PORT),
+    ]
+    servers = [uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning")) for app, port in apps]
+    # Each server would otherwise install its own signal handlers.
+    for server in servers:
+        server.install_signal_handlers = lambda: None
+    await asyncio.gather(*(server.serve() for server in servers))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run fake Ollama/Elasticsearch/GitHub/Slack servers.")
+    parser.add_argument("--token-rate", type=float, default=50.0, help="Tokens per second streamed by fake Ollama")
+    parser.add_argument("--tokens", type=int, default=64, help="Tokens per fake generation")
+    parser.add_argument("--load-delay", type=float, default=0.0, help="Seconds to 'load' a model on first use")
+    args = parser.parse_args()
+    asyncio.run(serve_all(args.token_rate, args.tokens, args.load_delay))
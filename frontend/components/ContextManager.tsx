@@ -37,7 +37,7 @@ const ContextManager: React.FC = () => {
 
   const addContext = async () => {
     try {
-      await axios.post(`${process.env.NEXT_PUBLIC_API_URL}/api/context`, newContext);
+      await axios.post(`${process.env.NEXT_PUBLIC_API_URL}/api/context?wait_for=refresh`, newContext);
       setNewContext({ title: '', content: '' });
       fetchContexts();
     } catch (error) {
@@ -59,7 +59,7 @@ const ContextManager: React.FC = () => {
   const updateContext = async () => {
     if (!editingContext) return;
     try {
-      await axios.put(`${process.env.NEXT_PUBLIC_API_URL}/api/context/${editingContext._id}`, editingContext._source);
+      await axios.put(`${process.env.NEXT_PUBLIC_API_URL}/api/context/${editingContext._id}?wait_for=refresh`, editingContext._source);
       setEditingContext(null);
       fetchContexts();
     } catch (error) {